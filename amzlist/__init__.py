@@ -4,58 +4,356 @@
 # License: http://jkeyes.mit-license.org/
 #
 
+import operator
+import pickle
+import struct
+from collections import deque
+from itertools import islice
+from math import sqrt
+
+from amzlist.skiplist import SkipIndex
+
+# The distance between the order labels of neighbouring Nodes in a strict
+# LinkedList. Leaving gaps means a Node can usually be labelled without
+# relabelling any of its neighbours.
+_GAP = 1 << 32
+
+
 class Node(object):
     """ A Node is a simple object with two attributes, `next` and `data`.
 
     `data` stores a value, and `next` holds a reference to another Node.
+
+    Nodes use `__slots__` so they don't carry a `__dict__`. `_list` and
+    `_label` are only set while the Node belongs to a strict, indexed or
+    doubly linked LinkedList.
     """
-    strict = False
+    __slots__ = ("data", "next", "_list", "_label")
 
     def __init__(self, data):
         """ Initialize a new Node with the specified data. """
-
-        self.next = None
-        """ Next text """
-
-        self.data = data
-        """ Data text """
+        # The slots are set directly, as a new Node can't be part of
+        # a cycle, so there is no need to go through `__setattr__`.
+        _set_data(self, data)
+        _set_next(self, None)
+        _set_list(self, None)
 
     def __setattr__(self, key, value):
         """ Override `__setattr__` to ensure that next is a Node. """
-        if key == "next" and value:
+        if key == "next":
             if value is not None:
                 if not isinstance(value, Node):
                     raise TypeError
 
-            if Node.strict and value.next:
-                # If we are in strict mode we check to make sure this
-                # modification to `next` will not create a cycle.
-                node = value.next
-                while node:
-                    if node == self:
-                        raise ValueError("Cannot insert %s cycle detected" \
-                                % (value.data))
-                    node = node.next
+            if self._list is not None and self._list.__class__ is not _Pool:
+                # If the Node belongs to a strict, indexed or doubly linked
+                # LinkedList, the list checks this modification to `next`
+                # will not create a cycle and updates its bookkeeping.
+                self._list._relink(self, value)
+                return
 
-        super(Node, self).__setattr__(key, value)
+        object.__setattr__(self, key, value)
 
     def __str__(self):
         """ Returns the string representation e.g. A->None, or A->B. """
         next = self.next.data if self.next else "None"
         return "%s->%s" % (self.data, next)
 
+# The slot descriptors of Node. Setting a slot through its descriptor
+# skips `Node.__setattr__`; the LinkedList methods link Nodes this way as
+# they only create links that cannot introduce a cycle.
+_set_data = Node.data.__set__
+_set_next = Node.next.__set__
+_set_list = Node._list.__set__
+_set_label = Node._label.__set__
+
+
+class DoublyNode(Node):
+    """ A Node with a `prev` attribute that refers to the previous Node.
+
+    DoublyNodes are used by a doubly linked LinkedList, which keeps `prev`
+    up to date as the list is modified.
+    """
+    __slots__ = ("prev",)
+
+    def __init__(self, data):
+        """ Initialize a new DoublyNode with the specified data. """
+        super(DoublyNode, self).__init__(data)
+        _set_prev(self, None)
+
+_set_prev = DoublyNode.prev.__set__
+
+
+class _PooledNode(Node):
+    """ A Node allocated by a LinkedList with a pool, which can be reused
+    once it is removed from the list.
+    """
+    __slots__ = ()
+
+
+class _PooledDoublyNode(DoublyNode):
+    """ A DoublyNode allocated by a LinkedList with a pool. """
+    __slots__ = ()
+
+
+class _Pool(object):
+    """ The Nodes a LinkedList keeps to reuse for new values.
+
+    A Node in the pool has the pool as its `_list` and its position in
+    `nodes` as its `_label`, so one that is linked into a list again can be
+    taken out in constant time.
+    """
+    __slots__ = ("nodes", "size")
+
+    def __init__(self, size):
+        self.nodes = []
+        self.size = size
+
+    def put(self, node):
+        """ Adds `node` to the pool, and returns `True`, unless it is full.
+        """
+        nodes = self.nodes
+        if len(nodes) >= self.size:
+            return False
+        _set_next(node, None)
+        if isinstance(node, DoublyNode):
+            _set_prev(node, None)
+        _set_list(node, self)
+        _set_label(node, len(nodes))
+        nodes.append(node)
+        return True
+
+    def get(self):
+        """ Removes a Node from the pool and returns it. """
+        node = self.nodes.pop()
+        _set_list(node, None)
+        return node
+
+    def take(self, node):
+        """ Removes `node` from the pool, replacing it with the last Node.
+        """
+        nodes = self.nodes
+        last = nodes.pop()
+        if last is not node:
+            pos = node._label
+            nodes[pos] = last
+            _set_label(last, pos)
+        _set_list(node, None)
+
+
+# The alternative storage for a LinkedList, by the name passed as the
+# `backend` argument, and the module and class that implement it.
+_BACKENDS = {
+    "array": ("amzlist.arraylist", "ArrayLinkedList"),
+    "unrolled": ("amzlist.unrolled", "UnrolledLinkedList"),
+    "mapped": ("amzlist.mapped", "MappedLinkedList"),
+    "numeric": ("amzlist.numeric", "NumericLinkedList"),
+}
+
+
+# The format written by `dump`. The header is a magic string, the version
+# of the format and the number of values. The values follow in chunks,
+# each one a length and a pickled `list`, and a length of 0 ends them.
+_MAGIC = b"AMZL"
+_VERSION = 1
+_HEADER = struct.Struct(">4sBQ")
+_CHUNK = struct.Struct(">Q")
+
+# The number of values shown by `repr` before the rest are left out.
+_REPR_COUNT = 10
+
+
+def _dump(values, count, fp, chunk_size, protocol):
+    """ Writes `count` values from the iterable `values` to `fp`. """
+    fp.write(_HEADER.pack(_MAGIC, _VERSION, count))
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            break
+        data = pickle.dumps(chunk, protocol)
+        fp.write(_CHUNK.pack(len(data)))
+        fp.write(data)
+    fp.write(_CHUNK.pack(0))
+
+
+def _load(fp):
+    """ Returns an iterator over the chunks of values written by `_dump`.
+
+    A `ValueError` is raised if `fp` isn't in the format, or if it ends
+    before all of the values have been read.
+    """
+    header = fp.read(_HEADER.size)
+    if len(header) != _HEADER.size:
+        raise ValueError("The file is not a dumped LinkedList.")
+    magic, version, count = _HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("The file is not a dumped LinkedList.")
+    if version != _VERSION:
+        raise ValueError("Unsupported format version %s" % (version))
+
+    while True:
+        length = fp.read(_CHUNK.size)
+        if len(length) != _CHUNK.size:
+            raise ValueError("The file ended before the last chunk.")
+        length, = _CHUNK.unpack(length)
+        if not length:
+            break
+        data = fp.read(length)
+        if len(data) != length:
+            raise ValueError("The file ended before the last chunk.")
+        chunk = pickle.loads(data)
+        count -= len(chunk)
+        yield chunk
+    if count:
+        raise ValueError("The file has the wrong number of values.")
+
+
+def _texts(values, sep, chunk_size):
+    """ Returns an iterator over the `str` of the values from the iterable
+    `values` joined by `sep`, `chunk_size` values at a time.
+    """
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield sep.join(map(str, chunk))
+
+
+def _write(values, fp, sep, chunk_size):
+    """ Writes the values from the iterable `values` to the text file `fp`,
+    separated by `sep`.
+    """
+    first = True
+    for text in _texts(values, sep, chunk_size):
+        if not first:
+            fp.write(sep)
+        fp.write(text)
+        first = False
+
+
+def _read(fp, parse):
+    """ Returns an iterator over the lines of the text file `fp`, without
+    their line endings, passed through `parse` if it is given.
+    """
+    for line in fp:
+        if line.endswith("\n"):
+            line = line[:-1]
+        yield line if parse is None else parse(line)
+
+
+def _repr(name, values, count):
+    """ Returns the `repr` of a list called `name` of `count` values, which
+    shows no more than `_REPR_COUNT` of them.
+    """
+    shown = [repr(value) for value in islice(values, _REPR_COUNT)]
+    if count > _REPR_COUNT:
+        shown.append("...")
+    return "%s([%s])" % (name, ", ".join(shown))
+
+
+def _position(i, message):
+    """ Returns the position `i` as an `int`, which can be any integer
+    type, such as a NumPy integer, but not a `bool`.
+    """
+    if isinstance(i, bool):
+        raise TypeError(message)
+    try:
+        return operator.index(i)
+    except TypeError:
+        raise TypeError(message)
+
+
 class LinkedList(object):
     """ A LinkedList implementation. """
 
-    def __init__(self, strict=None):
-        """ Initialize a new LinkedList. """
+    def __new__(cls, *args, **kwargs):
+        """ Create a new LinkedList, or a list with a different `backend`.
+
+        By default the list is made of Nodes. `backend="array"` creates an
+        ArrayLinkedList instead, which stores the elements in arrays,
+        `backend="unrolled"` an UnrolledLinkedList, which stores them in
+        blocks, `backend="mapped"` a MappedLinkedList, which stores them
+        in memory mapped files, and `backend="numeric"` a
+        NumericLinkedList, which stores numbers in a NumPy array.
+        """
+        backend = kwargs.pop("backend", None)
+        if len(args) > 1:
+            # `backend` was passed by position, after `strict`.
+            if backend is not None:
+                raise TypeError("Got multiple values for backend")
+            backend = args[1]
+            args = args[:1] + args[2:]
+        if backend is None or backend == "node":
+            return super(LinkedList, cls).__new__(cls)
+        if backend not in _BACKENDS:
+            raise ValueError("Unknown backend %s" % (backend))
+        module, name = _BACKENDS[backend]
+        module = __import__(module, fromlist=[name])
+        return getattr(module, name)(*args, **kwargs)
+
+    def __init__(self, strict=None, backend=None, index=None, doubly=None,
+            skiplist=None, pool=None):
+        """ Initialize a new LinkedList.
+
+        If `strict` is `True` the LinkedList prevents cycles from being
+        introduced, including by assigning `next` on its Nodes directly.
+
+        If `index` is `True` the Nodes are indexed by their `data`, so that
+        `find`, `remove` and `in` do not have to scan the list. The `data`
+        must be hashable, once an unhashable value is added the index is
+        dropped and the list is scanned instead. The `data` of the Nodes
+        should not be changed directly while they are in an indexed list.
+
+        If `doubly` is `True` the list is made of DoublyNodes, so it can be
+        modified at either end, or around a given Node, in constant time.
+
+        If `skiplist` is `True` the list keeps an indexable skip list over
+        its Nodes, so access by position takes `O(log n)` expected time.
+
+        If `pool` is given, up to that many Nodes that are popped or
+        removed are kept in a pool and reused for new values, rather than
+        being left for the garbage collector.
+        """
         if strict is None:
             strict = False
-        Node.strict = strict
+        self.strict = strict
 
         super(LinkedList, self).__init__()
         self.first_node = None
 
+        # The tail and the size are tracked as the list is modified so
+        # that `append`, `last_node` and `len` do not traverse the list.
+        self._last_node = None
+        self._size = 0
+
+        # The index maps each value to the Nodes with that `data` in the
+        # order they appear in the list, and each Node to the one before
+        # it so it can be removed without a scan.
+        self._index = {} if index else None
+        self._prev = {} if index else None
+
+        self._doubly = bool(doubly)
+        if pool:
+            # Only the Nodes the list allocates itself are recycled.
+            self._node_type = _PooledDoublyNode if doubly else _PooledNode
+        else:
+            self._node_type = DoublyNode if doubly else Node
+
+        self._skip = SkipIndex() if skiplist else None
+
+        # The Nodes that can be reused, and the most that are kept.
+        self._pool = _Pool(pool) if pool else None
+        self._pool_size = pool or 0
+
+        # The Nodes are labelled with their order when the list is strict,
+        # so links can be checked for cycles, and when it is indexed, so
+        # Nodes with the same `data` are kept in order. The Nodes of
+        # a doubly linked list are labelled so membership is known, and
+        # the skip list finds Nodes by their labels.
+        self._ordered = bool(strict or index or doubly or skiplist)
+
     @property
     def next(self):
         """ Returns the `next` Node. """
@@ -69,62 +367,325 @@ class LinkedList(object):
     @property
     def last_node(self):
         """ Returns the last Node. """
-        nodes = self.as_list()
-
-        if nodes:
-            # If there are nodes return the last one.
-            return nodes[-1]
-        # No nodes, return None
-        return None
+        return self._last_node
 
     def prepend(self, node):
         """ Inserts `node` at the head of the LinkedList. """
         if not isinstance(node, Node):
             # If the node parameter is not a Node then update it
             # to refer to one.
-            node = Node(node)
+            node = self._new_node(node) if self._pool is not None \
+                    else self._node_type(node)
+        elif self._ordered or node._list is not None:
+            self._claim(node)
 
         # The new node will store the current first_node in it's next attribute.
-        node.next = self.first_node
+        _set_next(node, self.first_node)
+        if self.first_node is None:
+            # The list was empty so the new node is also the tail.
+            self._last_node = node
+        elif self._doubly:
+            _set_prev(self.first_node, node)
+        if self._doubly:
+            _set_prev(node, None)
+        if self._ordered:
+            # Label the new head before the current one.
+            if self.first_node is None:
+                _set_label(node, 0)
+            else:
+                _set_label(node, self.first_node._label - _GAP)
+            _set_list(node, self)
+            if self._index is not None:
+                self._index_add(node, None)
         # Update the first_node reference to the new node.
         self.first_node = node
+        self._size += 1
+        if self._skip is not None and self._skip.valid:
+            self._skip.insert(self.first_node, node)
 
     def append(self, node):
         """ Inserts `node` at the tail of the LinkedList. """
         if not isinstance(node, Node):
             # If the node parameter is not a Node then update it
             # to refer to one.
-            node = Node(node)
+            node = self._new_node(node) if self._pool is not None \
+                    else self._node_type(node)
+        elif self._ordered or node._list is not None:
+            self._claim(node)
 
+        # The appended node is the new tail, so it does not refer to
+        # any other node.
+        _set_next(node, None)
         if self.first_node is None:
             # The first_node is None therefore we just set it.
             self.first_node = node
         else:
-            # Find the last_node in the list and update it's next attribute.
-            self.last_node.next = node
+            # Update the next attribute of the current tail.
+            _set_next(self._last_node, node)
+        if self._doubly:
+            _set_prev(node, self._last_node)
+        if self._ordered:
+            # Label the new tail after the current one.
+            if self._last_node is None:
+                _set_label(node, 0)
+            else:
+                _set_label(node, self._last_node._label + _GAP)
+            _set_list(node, self)
+            if self._index is not None:
+                self._index_add(node, self._last_node)
+        self._last_node = node
+        self._size += 1
+        if self._skip is not None and self._skip.valid:
+            self._skip.insert(self.first_node, node)
 
     def insert(self, node, after):
         """ Inserts `node` and makes `after.next` refer to it. """
         if not isinstance(after, Node):
             # If the after parameter is not a Node raise an error.
             raise TypeError("After must be a Node not a %s" % (type(after)))
+        if self._ordered and after._list is not self:
+            raise ValueError("Node %s could not be found." % (after.data,))
 
         if not isinstance(node, Node):
             # If the node parameter is not a Node then update it
             # to refer to one.
-            node = Node(node)
+            node = self._new_node(node) if self._pool is not None \
+                    else self._node_type(node)
+        elif self._ordered or node._list is not None:
+            self._claim(node)
+
+        _set_next(node, after.next)
+        _set_next(after, node)
+        if self._doubly:
+            _set_prev(node, after)
+            if node.next is not None:
+                _set_prev(node.next, node)
+        if self._ordered:
+            self._label_run(after, [node], node.next)
+            if self._index is not None:
+                self._index_add(node, after)
+        if after is self._last_node:
+            # Inserting after the tail makes the new node the tail.
+            self._last_node = node
+        self._size += 1
+        if self._skip is not None and self._skip.valid:
+            self._skip.insert(self.first_node, node)
+
+    @classmethod
+    def from_iterable(cls, iterable, **kwargs):
+        """ Returns a new LinkedList with the values from `iterable`.
+
+        Any keyword arguments are passed to the new LinkedList.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(iterable)
+        return new_list
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the LinkedList.
 
-        node.next = after.next
-        after.next = node
+        The values are linked into a chain in one pass, which is then
+        linked to the tail. `iterable` can be a generator, it is consumed
+        as the chain is built.
+        """
+        label = self._last_node._label + _GAP \
+                if self._ordered and self._last_node is not None else 0
+        first, last, count = self._chain(iterable, label, _GAP)
+        if first is None:
+            return
+
+        if self.first_node is None:
+            self.first_node = first
+        else:
+            _set_next(self._last_node, first)
+        if self._doubly:
+            _set_prev(first, self._last_node)
+        prev = self._last_node
+        self._last_node = last
+        self._size += count
+        if self._index is not None:
+            self._index_chain(first, prev)
+        self._skip_invalidate()
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the LinkedList.
+
+        Like `collections.deque.extendleft`, each value is prepended in
+        turn so they end up in reverse order. The values are linked into
+        a chain in one pass, which is then linked to the head.
+        """
+        label = self.first_node._label - _GAP \
+                if self._ordered and self.first_node is not None else 0
+        first, last, count = self._chain(iterable, label, -_GAP)
+        if first is None:
+            return
+
+        # The chain was built in reverse, so `last` is its head.
+        _set_next(first, self.first_node)
+        if self.first_node is None:
+            self._last_node = first
+        elif self._doubly:
+            _set_prev(self.first_node, first)
+        if self._doubly:
+            _set_prev(last, None)
+        self.first_node = last
+        self._size += count
+        if self._index is not None:
+            self._index_chain(last, None, count, backwards=True)
+        self._skip_invalidate()
+
+    def insert_many(self, values, after):
+        """ Inserts each value in `values` in order after the Node `after`.
+        """
+        if not isinstance(after, Node):
+            # If the after parameter is not a Node raise an error.
+            raise TypeError("After must be a Node not a %s" % (type(after)))
+        if self._ordered and after._list is not self:
+            raise ValueError("Node %s could not be found." % (after.data,))
+
+        first, last, count = self._chain(values)
+        if first is None:
+            return
+
+        _set_next(last, after.next)
+        _set_next(after, first)
+        if self._doubly:
+            _set_prev(first, after)
+            if last.next is not None:
+                _set_prev(last.next, last)
+        if self._ordered:
+            self._label_run(after, list(islice(self.iter_from(first), count)),
+                    last.next)
+        if after is self._last_node:
+            self._last_node = last
+        self._size += count
+        if self._index is not None:
+            self._index_chain(first, after, count)
+        self._skip_invalidate()
+
+    def _chain(self, values, label=None, step=None):
+        """ Links a Node for each value into a chain that is not in the list.
+
+        Nodes in `values` are used as they are. In a strict or indexed list
+        each Node is tagged as it is linked, so one that is already in the
+        list or repeated in `values` raises a `ValueError`. If `label` is
+        given the Nodes are labelled from it in steps of `step`. A negative
+        `step` links each Node before the previous one.
+
+        Returns the first and last Nodes that were linked, and the count.
+        """
+        ordered = self._ordered
+        doubly = self._doubly
+        node_type = self._new_node if self._pool is not None \
+                else self._node_type
+        backwards = step is not None and step < 0
+        first = last = None
+        count = 0
+        try:
+            for node in values:
+                if not isinstance(node, Node):
+                    node = node_type(node)
+                elif ordered or node._list is not None:
+                    self._claim(node)
+                if ordered:
+                    _set_list(node, self)
+                    if label is not None:
+                        _set_label(node, label)
+                        label += step
+                if last is None:
+                    first = node
+                elif backwards:
+                    _set_next(node, last)
+                    if doubly:
+                        _set_prev(last, node)
+                else:
+                    _set_next(last, node)
+                    if doubly:
+                        _set_prev(node, last)
+                last = node
+                count += 1
+        except Exception:
+            # Leave the list as it was.
+            if ordered:
+                head = last if backwards else first
+                for node in islice(self.iter_from(head), count):
+                    _set_list(node, None)
+            raise
+
+        if first is not None:
+            if backwards:
+                _set_next(first, None)
+            else:
+                _set_next(last, None)
+        return first, last, count
+
+    def _index_chain(self, node, prev, count=None, backwards=False):
+        """ Adds `count` Nodes from `node`, which follows `prev`, to the index.
+
+        If `backwards` is `True` the Nodes are added from the last one, so
+        that when they are at the head each is added before any others with
+        the same `data`, which takes constant time.
+        """
+        if backwards:
+            nodes = list(islice(self.iter_from(node), count))
+            for i in range(len(nodes) - 1, -1, -1):
+                if self._index is None:
+                    break
+                self._index_add(nodes[i], nodes[i - 1] if i else prev)
+            return
+        for node in islice(self.iter_from(node), count):
+            if self._index is None:
+                # The index was dropped for unhashable data.
+                break
+            self._index_add(node, prev)
+            prev = node
+
+    def _new_node(self, data):
+        """ Returns a Node for `data`, reused from the pool if it has one.
+        """
+        pool = self._pool
+        if pool is not None and pool.nodes:
+            node = pool.get()
+            _set_data(node, data)
+            return node
+        return self._node_type(data)
+
+    def _recycle(self, node):
+        """ Puts `node`, which has been removed from the list, in the pool if
+        the list allocated it and the pool isn't full.
+
+        Returns `True` if the Node was recycled.
+        """
+        return node.__class__ is self._node_type and self._pool.put(node)
 
     def push(self, node):
         """ Prepends a Node to the head. """
         self.prepend(node)
 
-    def pop(self):
-        """ Returns the Node from the head, and removes it. """
+    def pop(self, recycle=None):
+        """ Returns the Node from the head, and removes it.
+
+        If the list has a pool and allocated the Node it is put in the pool,
+        unless `recycle` is `False`. A recycled Node keeps its `data`, but
+        is reused by a later value, so it must not be kept once more values
+        are added.
+        """
         res = self.first_node
+        if self._skip is not None and self._skip.valid:
+            self._skip.remove(res)
         self.first_node = self.first_node.next
+        if self.first_node is None:
+            # The list is now empty.
+            self._last_node = None
+        elif self._doubly:
+            _set_prev(self.first_node, None)
+        self._size -= 1
+        if self._index is not None:
+            self._index_discard(res, None)
+        # The Node no longer belongs to this list.
+        _set_list(res, None)
+        if self._pool is not None and recycle is not False:
+            self._recycle(res)
         return res
 
     def remove(self, node):
@@ -142,6 +703,139 @@ class LinkedList(object):
         curr, prev = self.find(node, inc_prev=True)
         if curr:
             self._remove(curr, prev)
+            if curr is not node and self._pool is not None \
+                    and self._recycle(curr):
+                # The Node wasn't passed in, so its data isn't needed.
+                _set_data(curr, None)
+
+    def remove_if(self, predicate):
+        """ Removes every Node whose `data` satisfies `predicate`.
+
+        The list is traversed once, so this takes `O(n)` time however many
+        Nodes are removed. Returns the number of Nodes removed.
+        """
+        return self._remove_matching(lambda node: predicate(node.data))
+
+    def remove_all(self, node):
+        """ Removes every Node with the same `data` as `node`.
+
+        Returns the number of Nodes removed.
+        """
+        value = node.data if isinstance(node, Node) else node
+        return self._remove_matching(lambda node: node.data == value)
+
+    def remove_values(self, values):
+        """ Removes every Node whose `data` is in the iterable `values`.
+
+        The values must be hashable as they are put in a `set`, so each
+        Node is checked in constant time. Returns the number of Nodes
+        removed.
+        """
+        values = set(values)
+
+        def match(node):
+            try:
+                return node.data in values
+            except TypeError:
+                # Unhashable data can't be in the set.
+                return False
+        return self._remove_matching(match)
+
+    def dedupe(self, key=None):
+        """ Removes every Node with the same `data` as a Node before it.
+
+        If `key` is given the Nodes are compared by `key(data)` instead.
+        Returns the number of Nodes removed.
+        """
+        seen = set()
+        # Unhashable keys are compared with the ones seen before.
+        unhashable = []
+
+        def match(node):
+            value = node.data if key is None else key(node.data)
+            try:
+                if value in seen:
+                    return True
+                seen.add(value)
+            except TypeError:
+                if value in unhashable:
+                    return True
+                unhashable.append(value)
+            return False
+        return self._remove_matching(match)
+
+    def _remove_matching(self, match):
+        """ Removes every Node for which `match(node)` is `True`, in one
+        pass, and returns the number of Nodes removed.
+
+        If `match` raises an exception the Nodes already removed stay
+        removed and the rest of the list is left as it was.
+        """
+        ordered = self._ordered
+        doubly = self._doubly
+        prev_nodes = self._prev
+        pool = self._pool
+        # The values of the Nodes that have been removed, whose Nodes in
+        # the index are updated once at the end.
+        stale = set()
+        removed = 0
+        # `prev` is the last Node that is kept, and `gap` is `True` while
+        # the Nodes after it are being removed, until one is kept.
+        prev = None
+        gap = False
+        node = self.first_node
+        try:
+            while node is not None:
+                if match(node):
+                    next = node.next
+                    if ordered:
+                        # The Node no longer belongs to this list.
+                        _set_list(node, None)
+                    if prev_nodes is not None:
+                        del prev_nodes[node]
+                        stale.add(node.data)
+                    if pool is not None and self._recycle(node):
+                        _set_data(node, None)
+                    removed += 1
+                    gap = True
+                    node = next
+                    continue
+                if gap:
+                    if prev is None:
+                        self.first_node = node
+                    else:
+                        _set_next(prev, node)
+                    if doubly:
+                        _set_prev(node, prev)
+                    if prev_nodes is not None:
+                        prev_nodes[node] = prev
+                    gap = False
+                prev = node
+                node = node.next
+        finally:
+            if gap:
+                if prev is None:
+                    self.first_node = node
+                else:
+                    _set_next(prev, node)
+                if node is None:
+                    self._last_node = prev
+                else:
+                    if doubly:
+                        _set_prev(node, prev)
+                    if prev_nodes is not None:
+                        prev_nodes[node] = prev
+            for value in stale:
+                nodes = deque(n for n in self._index[value]
+                        if n._list is self)
+                if nodes:
+                    self._index[value] = nodes
+                else:
+                    del self._index[value]
+            if removed:
+                self._size -= removed
+                self._skip_invalidate()
+        return removed
 
     def find(self, node, inc_prev=None):
         """ Find the specified Node.
@@ -159,113 +853,1133 @@ class LinkedList(object):
 
         This method returns `None` if the node cannot be found.
         """
-        if inc_prev is None:
-            # Default include previous node to False
-            inc_prev = False
-        if not isinstance(node, Node):
-            # If the node parameter is not a Node then update it
-            # to refer to one.
-            node = Node(node)
+        curr, prev = self._find(node)
+        if inc_prev:
+            # include the previous node in the return value
+            return (curr, prev)
+        # just return the node
+        return curr
 
-        if node.next:
+    def _find(self, node):
+        """ Returns the Node matching `node` and the Node before it. """
+        if isinstance(node, Node) and node.next is not None:
             # match based on Node
-            test = lambda curr, node: curr == node
+            if self._doubly:
+                if node._list is self:
+                    return (node, node.prev)
+            elif self._index is not None:
+                if node in self._prev:
+                    return (node, self._prev[node])
+            else:
+                prev = None
+                curr = self.first_node
+                while curr is not None:
+                    if curr is node:
+                        return (curr, prev)
+                    prev = curr
+                    curr = curr.next
+            raise ValueError("Node %s could not be found." % (node.data))
+
+        # match based on data
+        if isinstance(node, Node):
+            value = node.data
         else:
-            # match based on data
-            test = lambda curr, node: curr.data == node.data
+            value = node
+
+        if self._index is not None:
+            try:
+                nodes = self._index.get(value)
+            except TypeError:
+                # An unhashable value can't be in the index, but it may
+                # still be equal to a value in the list.
+                pass
+            else:
+                if nodes:
+                    return (nodes[0], self._prev[nodes[0]])
+                raise ValueError("Node %s could not be found." % (value))
 
         prev = None
         curr = self.first_node
 
         # Iterate over each node.
-        while curr:
-            if test(curr, node):
-                # include the previous node in the return value
-                if inc_prev:
-                    return (curr, prev)
-                # just return the node
-                else:
-                    return curr
+        while curr is not None:
+            if curr.data == value:
+                return (curr, prev)
             prev = curr
             curr = curr.next
 
         # No node could be found.
-        raise ValueError("Node %s could not be found." % (node.data))
+        raise ValueError("Node %s could not be found." % (value))
+
+    def __contains__(self, node):
+        """ Returns `True` if `node` is in this LinkedList.
+
+        A Node is matched by identity, any other value by `data`.
+        """
+        if isinstance(node, Node):
+            if self._doubly:
+                return node._list is self
+            if self._index is not None:
+                return node in self._prev
+            curr = self.first_node
+            while curr is not None:
+                if curr is node:
+                    return True
+                curr = curr.next
+            return False
+        try:
+            self._find(node)
+        except ValueError:
+            return False
+        return True
 
     def _remove(self, curr, prev):
         """ Remove `curr` and update the next attribute for `prev`. """
+        if self._skip is not None and self._skip.valid:
+            self._skip.remove(curr)
         if prev:
             # If there is a previous node then update it's next attribute
             # to refer to the next node of the node that is being removed.
-            prev.next = curr.next
+            _set_next(prev, curr.next)
         else:
             # If there is no previous node then we are at the head of the list.
             # Update the first_node reference to the next node of the node 
             # that is being removed.
             self.first_node = curr.next
+        if curr is self._last_node:
+            # The tail has been removed so `prev` is the new tail.
+            self._last_node = prev
+        elif self._doubly:
+            _set_prev(curr.next, prev)
+        self._size -= 1
+        if self._index is not None:
+            self._index_discard(curr, prev)
+        # The Node no longer belongs to this list.
+        _set_list(curr, None)
         # Delete the node that has been delinked.
         del curr
 
+    def popleft(self, recycle=None):
+        """ Returns the Node from the head, and removes it. """
+        return self.pop(recycle)
+
+    def pop_last(self):
+        """ Returns the Node from the tail, and removes it.
+
+        This takes constant time in a doubly linked list, otherwise the
+        list is scanned for the Node before the tail.
+        """
+        node = self._last_node
+        if node is None:
+            raise ValueError("Cannot pop from an empty LinkedList.")
+        self.unlink(node)
+        return node
+
+    def unlink(self, node):
+        """ Removes the Node `node` from the LinkedList.
+
+        This takes constant time in a doubly linked list, otherwise the
+        list is scanned for the Node before `node`.
+        """
+        if not isinstance(node, Node):
+            raise TypeError("Node must be a Node not a %s" % (type(node)))
+        if self._doubly:
+            if node._list is not self:
+                raise ValueError("Node %s could not be found." % (node.data))
+            self._remove(node, node.prev)
+            return
+
+        prev = None
+        curr = self.first_node
+        while curr is not None and curr is not node:
+            prev = curr
+            curr = curr.next
+        if curr is None:
+            raise ValueError("Node %s could not be found." % (node.data))
+        self._remove(curr, prev)
+
+    def insert_before(self, node, ref):
+        """ Inserts `node` and makes it refer to the Node `ref`.
+
+        This takes constant time in a doubly linked list, otherwise the
+        list is scanned for the Node before `ref`.
+        """
+        if not isinstance(ref, Node):
+            # If the ref parameter is not a Node raise an error.
+            raise TypeError("Ref must be a Node not a %s" % (type(ref)))
+        if self._doubly:
+            if ref._list is not self:
+                raise ValueError("Node %s could not be found." % (ref.data))
+            prev = ref.prev
+        else:
+            prev = None
+            curr = self.first_node
+            while curr is not None and curr is not ref:
+                prev = curr
+                curr = curr.next
+            if curr is None:
+                raise ValueError("Node %s could not be found." % (ref.data))
+
+        if prev is None:
+            self.prepend(node)
+        else:
+            self.insert(node, prev)
+
+    def node_at(self, i):
+        """ Returns the Node at position `i`.
+
+        A negative position counts back from the tail. This takes
+        `O(log n)` expected time if the list has a skip list, otherwise
+        the list is walked from the head.
+        """
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("LinkedList index out of range")
+        if i == self._size - 1:
+            return self._last_node
+
+        skip = self._skip_index()
+        if skip is not None:
+            return skip.locate(self.first_node, i)
+        return next(islice(self.iter_nodes(), i, None))
+
+    def __getitem__(self, i):
+        """ Returns the `data` of the Node at position `i`. """
+        i = _position(i, "LinkedList indices must be integers, use slice()")
+        return self.node_at(i).data
+
+    def __setitem__(self, i, value):
+        """ Updates the `data` of the Node at position `i`. """
+        i = _position(i, "LinkedList indices must be integers")
+        node = self.node_at(i)
+        if self._index is not None:
+            # Move the Node to the Nodes for its new data.
+            self._index_drop(node)
+            _set_data(node, value)
+            self._index_add(node, self._prev[node])
+        else:
+            _set_data(node, value)
+
+    def insert_at(self, i, node):
+        """ Inserts `node` so that it is at position `i`.
+
+        Like `list.insert`, a position past either end inserts at that end.
+        """
+        if i < 0:
+            i = max(i + self._size, 0)
+        if i == 0:
+            self.prepend(node)
+        elif i >= self._size:
+            self.append(node)
+        else:
+            self.insert(node, self.node_at(i - 1))
+
+    def delete_at(self, i):
+        """ Returns the Node at position `i`, and removes it. """
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("LinkedList index out of range")
+        if i == 0:
+            return self.pop(recycle=False)
+        prev = self.node_at(i - 1)
+        node = prev.next
+        self._remove(node, prev)
+        return node
+
+    def index(self, node):
+        """ Returns the position of the first Node that matches `node`.
+
+        Nodes are matched as they are by `find`. This takes `O(log n)`
+        expected time if the list has an index and a skip list.
+        """
+        node = self._find(node)[0]
+        skip = self._skip_index()
+        if skip is not None:
+            return skip.rank(self.first_node, node)
+        for i, curr in enumerate(self.iter_nodes()):
+            if curr is node:
+                return i
+
+    def reverse(self):
+        """ Reverses the order of the Nodes in place.
+
+        The `next` attribute of each Node is updated in a single pass,
+        without allocating any Nodes.
+        """
+        ordered = self._ordered
+        doubly = self._doubly
+        prev_nodes = self._prev
+        prev = None
+        node = self.first_node
+        while node is not None:
+            next = node.next
+            _set_next(node, prev)
+            if doubly:
+                _set_prev(node, next)
+            if ordered:
+                # Negating the labels reverses their order.
+                _set_label(node, -node._label)
+            if prev_nodes is not None:
+                prev_nodes[node] = next
+            prev = node
+            node = next
+
+        self._last_node = self.first_node
+        self.first_node = prev
+        if self._index is not None:
+            # Nodes with the same data are kept in the order of the list.
+            for nodes in self._index.values():
+                nodes.reverse()
+        self._skip_invalidate()
+
+    def sort(self, key=None, reverse=False):
+        """ Sorts the Nodes in place, like `list.sort`.
+
+        This is a bottom-up merge sort that relinks the existing Nodes, so
+        it takes `O(n log n)` time and constant extra memory and doesn't
+        recurse. The sort is stable. The key of the Node at the head of
+        each run being merged is kept, so `key` is called once per Node
+        per pass rather than once per comparison side.
+
+        If `key` or a comparison raises an exception the Nodes are left
+        linked in a partly sorted order.
+        """
+        head = self.first_node
+        if head is None or head.next is None:
+            return
+
+        # The list is split into runs of `size` Nodes, each pair of runs
+        # is merged onto the output after `output`, and then the size is
+        # doubled until there is only one merge in a pass.
+        output = Node(None)
+        set_next = _set_next
+        size = 1
+        psize = 0
+        p = q = None
+        tail = output
+        try:
+            while True:
+                p = head
+                tail = output
+                merges = 0
+                while p is not None:
+                    merges += 1
+                    q = p
+                    psize = 0
+                    while psize < size and q is not None:
+                        psize += 1
+                        q = q.next
+                    qsize = size
+
+                    if q is not None:
+                        pkey = p.data if key is None else key(p.data)
+                        qkey = q.data if key is None else key(q.data)
+                        while True:
+                            # Take from `q` only if it sorts strictly before
+                            # `p`, which keeps the sort stable.
+                            if pkey < qkey if reverse else qkey < pkey:
+                                set_next(tail, q)
+                                tail = q
+                                q = q.next
+                                qsize -= 1
+                                if not qsize or q is None:
+                                    break
+                                qkey = q.data if key is None else key(q.data)
+                            else:
+                                set_next(tail, p)
+                                tail = p
+                                p = p.next
+                                psize -= 1
+                                if not psize:
+                                    break
+                                pkey = p.data if key is None else key(p.data)
+
+                    if psize:
+                        # The rest of the run at `p` is already in order.
+                        set_next(tail, p)
+                        for _ in range(psize):
+                            tail = p
+                            p = p.next
+                        psize = 0
+                    else:
+                        # So is the rest of the run at `q`.
+                        set_next(tail, q)
+                        while qsize and q is not None:
+                            tail = q
+                            q = q.next
+                            qsize -= 1
+                    p = q
+
+                set_next(tail, None)
+                head = output.next
+                if merges == 1:
+                    break
+                size *= 2
+        except Exception:
+            # Link the output to the rest of the run at `p`, which is still
+            # linked in order, and the rest of the list from `q`.
+            rest = q
+            if psize:
+                last = p
+                for _ in range(psize - 1):
+                    last = last.next
+                set_next(last, q)
+                rest = p
+            set_next(tail, rest)
+            head = output.next
+            self.first_node = head
+            self._resync()
+            raise
+
+        self.first_node = head
+        self._resync()
+
+    def insert_sorted(self, node, key=None, reverse=False):
+        """ Inserts `node` into this sorted LinkedList, keeping it sorted.
+
+        `node` is inserted after any Nodes with an equal key, as `sort`
+        would leave it. Inserting at the tail takes constant time,
+        otherwise the list is walked to the position.
+        """
+        data = node.data if isinstance(node, Node) else node
+        node_key = data if key is None else key(data)
+
+        def before(curr):
+            # Returns `True` if `node` sorts before the Node `curr`.
+            curr_key = curr.data if key is None else key(curr.data)
+            return curr_key < node_key if reverse else node_key < curr_key
+
+        if self._last_node is None or not before(self._last_node):
+            self.append(node)
+            return
+        prev = None
+        curr = self.first_node
+        while not before(curr):
+            prev = curr
+            curr = curr.next
+        if prev is None:
+            self.prepend(node)
+        else:
+            self.insert(node, prev)
+
+    def merge(self, other, key=None, reverse=False):
+        """ Moves the Nodes of the sorted LinkedList `other` into this one.
+
+        Both lists must be sorted by `key` and `reverse`. The Nodes are
+        relinked in one pass, so this takes `O(n + m)` time, and `other` is
+        left empty. The merge is stable, Nodes of this list come before
+        Nodes of `other` with an equal key.
+        """
+        if not isinstance(other, LinkedList):
+            raise TypeError("Other must be a LinkedList not a %s" \
+                    % (type(other)))
+        if other is self:
+            raise ValueError("Cannot merge a LinkedList with itself.")
+        if self._doubly and not other._doubly:
+            for node in other.iter_nodes():
+                if not isinstance(node, DoublyNode):
+                    raise TypeError("Node must be a DoublyNode not a %s" \
+                            % (type(node)))
+
+        ordered = self._ordered
+        a = self.first_node
+        b = other.first_node
+        head = tail = None
+        try:
+            if a is not None and b is not None:
+                akey = a.data if key is None else key(a.data)
+                bkey = b.data if key is None else key(b.data)
+            while a is not None and b is not None:
+                # Take from `other` only if it sorts strictly first.
+                from_b = akey < bkey if reverse else bkey < akey
+                if from_b:
+                    node = b
+                    b = b.next
+                    if not ordered:
+                        _set_list(node, None)
+                else:
+                    node = a
+                    a = a.next
+                if tail is None:
+                    head = node
+                else:
+                    _set_next(tail, node)
+                tail = node
+
+                if from_b and b is not None:
+                    bkey = b.data if key is None else key(b.data)
+                elif not from_b and a is not None:
+                    akey = a.data if key is None else key(a.data)
+        except Exception:
+            # Keep the Nodes merged so far, the rest of `other` is left in
+            # `other`.
+            rest = a
+            raise
+        else:
+            rest = a
+            if a is None:
+                rest = b
+                if not ordered:
+                    for node in other.iter_from(b):
+                        _set_list(node, None)
+                b = None
+        finally:
+            if tail is None:
+                head = rest
+            else:
+                _set_next(tail, rest)
+            self.first_node = head
+            self._resync()
+            other.first_node = b
+            other._resync()
+
+    def concat(self, other):
+        """ Moves the Nodes of the LinkedList `other` to the tail of this one.
+
+        The chain of `other` is linked on as it is and `other` is left
+        empty. This takes constant time unless either list is strict,
+        indexed, doubly linked or has a skip list, in which case each
+        Node that is moved is tagged as belonging to this list.
+        """
+        self.splice(other, self._last_node)
+
+    def __iadd__(self, other):
+        """ Moves the Nodes of the LinkedList `other` to the tail, or appends
+        the values of any other iterable.
+        """
+        if isinstance(other, LinkedList):
+            self.concat(other)
+        else:
+            self.extend(other)
+        return self
+
+    def splice(self, other, after=None):
+        """ Moves the Nodes of the LinkedList `other` in after the Node
+        `after`, or to the head if `after` is `None`.
+
+        `other` is left empty. Like `concat`, this takes constant time for
+        plain lists.
+        """
+        if not isinstance(other, LinkedList):
+            raise TypeError("Other must be a LinkedList not a %s" \
+                    % (type(other)))
+        if other is self:
+            raise ValueError("Cannot splice a LinkedList into itself.")
+        if after is not None:
+            if not isinstance(after, Node):
+                raise TypeError("After must be a Node not a %s" \
+                        % (type(after)))
+            if self._ordered and after._list is not self:
+                raise ValueError("Node %s could not be found." \
+                        % (after.data,))
+        first = other.first_node
+        if first is None:
+            return
+        last = other._last_node
+        count = other._size
+
+        nodes = None
+        if self._ordered:
+            nodes = other.as_list()
+            for node in nodes:
+                if node._list is self:
+                    raise ValueError("Cannot insert %s cycle detected" \
+                            % (node.data,))
+                if self._doubly and not isinstance(node, DoublyNode):
+                    raise TypeError("Node must be a DoublyNode not a %s" \
+                            % (type(node)))
+        elif other._ordered:
+            # The Nodes no longer belong to a strict or indexed list.
+            for node in other.iter_nodes():
+                _set_list(node, None)
+
+        other.first_node = other._last_node = None
+        other._size = 0
+        if other._index is not None:
+            other._index = {}
+            other._prev = {}
+        other._skip_invalidate()
+
+        succ = self.first_node if after is None else after.next
+        _set_next(last, succ)
+        if after is None:
+            self.first_node = first
+        else:
+            _set_next(after, first)
+        if self._doubly:
+            _set_prev(first, after)
+            if succ is not None:
+                _set_prev(succ, last)
+        if nodes is not None:
+            if after is not None:
+                self._label_run(after, nodes, succ)
+            else:
+                # Label the Nodes below the first Node of this list.
+                label = (succ._label if succ is not None else 0) \
+                        - (count + 1) * _GAP
+                for node in nodes:
+                    label += _GAP
+                    _set_label(node, label)
+                    _set_list(node, self)
+        if succ is None:
+            self._last_node = last
+        self._size += count
+        if self._index is not None:
+            self._index_chain(first, after, count, backwards=after is None)
+        self._skip_invalidate()
+
+    def split_after(self, node):
+        """ Removes the Nodes after the Node `node`, and returns them as a new
+        LinkedList with the same settings.
+
+        The chain is cut after `node`, so no Nodes are copied, but the
+        Nodes that are moved are counted, which takes time in proportion to
+        their number.
+        """
+        if not isinstance(node, Node):
+            raise TypeError("Node must be a Node not a %s" % (type(node)))
+        if self._ordered and node._list is not self:
+            raise ValueError("Node %s could not be found." % (node.data,))
+        new_list = self._copy()
+        first = node.next
+        count = 0
+        curr = node
+        while curr.next is not None:
+            curr = curr.next
+            count += 1
+        if curr is not self._last_node:
+            raise ValueError("Node %s could not be found." % (node.data,))
+        if first is None:
+            return new_list
+
+        _set_next(node, None)
+        if self._doubly:
+            _set_prev(first, None)
+        new_list.first_node = first
+        new_list._last_node = self._last_node
+        new_list._size = count
+        self._last_node = node
+        self._size -= count
+
+        if self._ordered:
+            # The labels still increase, so only the owner changes.
+            for curr in new_list.iter_nodes():
+                _set_list(curr, new_list)
+        if self._index is not None:
+            stale = set()
+            for curr in new_list.iter_nodes():
+                del self._prev[curr]
+                stale.add(curr.data)
+            for value in stale:
+                nodes = deque(n for n in self._index[value]
+                        if n._list is self)
+                if nodes:
+                    self._index[value] = nodes
+                else:
+                    del self._index[value]
+            new_list._reindex()
+        self._skip_invalidate()
+        new_list._skip_invalidate()
+        return new_list
+
+    def split_at(self, i):
+        """ Removes the Nodes from position `i` on, and returns them as a new
+        LinkedList with the same settings.
+        """
+        if i < 0:
+            i += self._size
+        if i <= 0:
+            new_list = self._copy()
+            new_list.splice(self)
+            return new_list
+        if i >= self._size:
+            return self._copy()
+        return self.split_after(self.node_at(i - 1))
+
+    def _copy(self):
+        """ Returns a new, empty LinkedList with the same settings. """
+        return self.__class__(strict=self.strict,
+                index=self._index is not None, doubly=self._doubly,
+                skiplist=self._skip is not None, pool=self._pool_size)
+
+    def reversed_copy(self):
+        """ Returns a new LinkedList with the data in reverse order.
+
+        The new LinkedList has new Nodes, so this LinkedList is unchanged.
+        """
+        new_list = self._copy()
+        new_list.extendleft(self)
+        return new_list
+
     def reverse_iterative(self):
-        """ Returns a new LinkedList with the Nodes in reverse order. 
+        """ Returns a new LinkedList with the data in reverse order. 
 
         This method uses an iterative approach.
         """
-        # Create the new LinkedList.
-        new_list = LinkedList()
+        return self.reversed_copy()
+
+    def reverse_recursive(self, node=None):
+        """ Returns a new LinkedList with the data in reverse order. 
+
+        The data is reversed from `node`, which defaults to the first
+        Node. This method uses a recursive approach. Each call handles
+        half of the Nodes given to it, so the depth of the recursion is
+        `log2(n)` rather than `n`.
+        """
+        new_list = self._copy()
+        if node is None:
+            node = self.first_node
+            count = self._size
+        else:
+            count = sum(1 for _ in self.iter_from(node))
+
+        def prepend_from(node, count):
+            # Prepend the data of `count` Nodes from `node` to the new list
+            # and return the Node after them.
+            if count == 1:
+                new_list.prepend(node.data)
+                return node.next
+            node = prepend_from(node, count // 2)
+            return prepend_from(node, count - count // 2)
+
+        if count:
+            prepend_from(node, count)
+        return new_list
 
-        # Set the initial node to reverse from.
+    def _index_add(self, node, prev):
+        """ Adds `node`, which has been linked after `prev`, to the index. """
+        try:
+            nodes = self._index.get(node.data)
+        except TypeError:
+            # The data is unhashable so the list can't be indexed.
+            self._index = self._prev = None
+            return
+        # Keep the Nodes with the same data in the order of the list. They
+        # are usually added at either end; the labels are only compared to
+        # find the place of a Node added between the others.
+        if nodes is None:
+            self._index[node.data] = deque((node,))
+        elif nodes[-1]._label < node._label:
+            nodes.append(node)
+        elif nodes[0]._label > node._label:
+            nodes.appendleft(node)
+        else:
+            pos = len(nodes) - 1
+            while nodes[pos - 1]._label > node._label:
+                pos -= 1
+            nodes.insert(pos, node)
+
+        self._prev[node] = prev
+        if node.next is not None:
+            self._prev[node.next] = node
+
+    def _index_discard(self, node, prev):
+        """ Removes `node`, which was linked after `prev`, from the index. """
+        self._index_drop(node)
+        del self._prev[node]
+        if node.next is not None:
+            self._prev[node.next] = prev
+
+    def _index_drop(self, node):
+        """ Removes `node` from the Nodes in the index with its `data`. """
+        nodes = self._index[node.data]
+        if nodes[0] is node:
+            nodes.popleft()
+        elif nodes[-1] is node:
+            nodes.pop()
+        else:
+            nodes.remove(node)
+        if not nodes:
+            del self._index[node.data]
+
+    def _reindex(self):
+        """ Rebuilds the index from the Nodes reachable from `first_node`. """
+        self._index = {}
+        self._prev = {}
+        prev = None
         node = self.first_node
+        while node is not None and self._index is not None:
+            self._index_add(node, prev)
+            prev = node
+            node = node.next
 
-        # iterate over each node and stop when node is None
-        while node:
-            next = node.next
-            # Prepend the node to the new list.
-            new_list.prepend(node)
+    def _skip_invalidate(self):
+        """ Marks the skip list to be rebuilt after the list is rearranged.
+        """
+        if self._skip is not None:
+            self._skip.valid = False
 
-            # Update the node reference.
-            node = next
+    def _skip_index(self):
+        """ Returns the skip list, rebuilt if needed, or `None`. """
+        skip = self._skip
+        if skip is not None and not skip.valid:
+            skip.rebuild(self.first_node, self._size)
+        return skip
+
+    def _claim(self, node):
+        """ Prepares `node` to be linked into this strict LinkedList.
+
+        A Node that was recycled is taken out of its pool, so it isn't
+        reused while it is in a list. A Node that is already part of the
+        list can't be added again as that would create a cycle, and a Node
+        of another strict, indexed or doubly linked list can't be added
+        as that list would lose track of it.
+        """
+        owner = node._list
+        if owner.__class__ is _Pool:
+            owner.take(node)
+        elif owner is self:
+            raise ValueError("Cannot insert %s cycle detected" % (node.data))
+        elif owner is not None:
+            raise ValueError("Cannot insert %s it belongs to another list" \
+                    % (node.data))
+        if not self._ordered:
+            return
+        if self._doubly and not isinstance(node, DoublyNode):
+            raise TypeError("Node must be a DoublyNode not a %s" \
+                    % (type(node)))
+        _set_list(node, None)
+
+    def _label_run(self, prev, run, succ):
+        """ Labels the Nodes in `run`, which are linked from `prev` to `succ`.
+
+        The labels of the Nodes in a strict LinkedList increase from the
+        head to the tail, so a link from a Node to one with a lower or equal
+        label is a cycle. If there is no room between the labels of `prev`
+        and `succ`, the Nodes after `succ` are relabelled until the gap per
+        Node is at least the number of Nodes being relabelled.
+        """
+        lo = prev._label
+        hi = succ._label if succ is not None else None
+        while hi is not None and (hi - lo) // (len(run) + 1) < len(run):
+            # Widen the range by relabelling the next Node as well.
+            run.append(succ)
+            succ = succ.next
+            hi = succ._label if succ is not None else None
+
+        if hi is None:
+            step = _GAP
+        else:
+            step = (hi - lo) // (len(run) + 1)
+        for node in run:
+            lo += step
+            _set_label(node, lo)
+            _set_list(node, self)
+
+    def _relink(self, node, value):
+        """ Sets `node.next` to `value`, where `node` belongs to this list.
+
+        This is called by `Node.__setattr__` when a Node of a strict,
+        indexed or doubly linked LinkedList is modified directly. A
+        `ValueError` is raised if the link would create a cycle. Otherwise
+        the Nodes that are linked in are labelled, and the size, tail,
+        index and prev links are updated for the Nodes that are linked in
+        or cut off.
+        """
+        # Follow `value` until it joins this list. The labels are only
+        # compared where it joins, so the check is O(1) unless new Nodes
+        # are being linked in.
+        run = []
+        seen = set()
+        succ = value
+        while succ is not None and succ._list is not self:
+            if succ in seen:
+                raise ValueError("Cannot insert %s cycle detected" \
+                        % (value.data))
+            if self._doubly and not isinstance(succ, DoublyNode):
+                raise TypeError("Node must be a DoublyNode not a %s" \
+                        % (type(succ)))
+            if succ._list is not None and succ._list.__class__ is not _Pool:
+                raise ValueError("Cannot insert %s it belongs to another " \
+                        "list" % (succ.data))
+            seen.add(succ)
+            run.append(succ)
+            succ = succ.next
+        if succ is not None and succ._label <= node._label:
+            # `succ` comes before `node` so it can reach `node`.
+            raise ValueError("Cannot insert %s cycle detected" % (value.data))
+
+        # The Nodes between `node` and `succ` are no longer in the list.
+        curr = node.next
+        while curr is not succ:
+            if self._index is not None:
+                self._index_discard(curr, node)
+            _set_list(curr, None)
+            self._size -= 1
+            curr = curr.next
+
+        _set_next(node, value)
+        if run:
+            for curr in run:
+                if curr._list is not None:
+                    # Take a recycled Node out of its pool.
+                    curr._list.take(curr)
+            self._label_run(node, run[:], succ)
+            prev = node
+            for curr in run:
+                if self._index is not None:
+                    self._index_add(curr, prev)
+                if self._doubly:
+                    _set_prev(curr, prev)
+                prev = curr
+        if self._doubly and succ is not None:
+            _set_prev(succ, run[-1] if run else node)
+        self._size += len(run)
+        if succ is None:
+            self._last_node = run[-1] if run else node
+        self._skip_invalidate()
+
+    def validate(self):
+        """ Checks the Nodes of this LinkedList for a cycle.
+
+        This can be used when Nodes have been linked outside of the
+        LinkedList API. Brent's algorithm is used, so it runs in linear
+        time with constant memory. If there is a cycle a `ValueError` is
+        raised, otherwise the tail and size are updated and the size is
+        returned.
+        """
+        if self.first_node is not None:
+            power = steps = 1
+            tortoise = self.first_node
+            hare = tortoise.next
+            while hare is not None:
+                if hare is tortoise:
+                    raise ValueError("Cycle detected at %s" % (hare.data))
+                if power == steps:
+                    # Move the tortoise up and double the distance the
+                    # hare can go before it moves again.
+                    tortoise = hare
+                    power *= 2
+                    steps = 0
+                hare = hare.next
+                steps += 1
+
+        # There is no cycle so the list can be walked to resync it.
+        return self._resync()
+
+    def _resync(self):
+        """ Updates the tail, size, labels and indexes from the Nodes.
+
+        This is used after the Nodes reachable from `first_node` have been
+        relinked, and returns the size.
+        """
+        size = 0
+        label = 0
+        node = self.first_node
+        self._last_node = None
+        while node is not None:
+            if self._ordered:
+                _set_label(node, label)
+                _set_list(node, self)
+                label += _GAP
+            if self._doubly:
+                _set_prev(node, self._last_node)
+            self._last_node = node
+            size += 1
+            node = node.next
+        self._size = size
+        if self._index is not None:
+            self._reindex()
+        self._skip_invalidate()
+        return size
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each Node. """
+        node = self.first_node
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def iter_nodes(self):
+        """ Returns an iterator over the Nodes of this LinkedList. """
+        return self.iter_from(self.first_node)
+
+    def iter_from(self, node):
+        """ Returns an iterator over the Nodes from `node` to the tail. """
+        while node is not None:
+            yield node
+            node = node.next
+
+    def slice(self, start, stop=None):
+        """ Returns an iterator over the `data` from `start` up to `stop`.
+
+        Like `itertools.islice`, the positions can't be negative and a
+        `stop` of `None` continues to the tail.
+        """
+        return islice(self, start, stop)
+
+    def __reversed__(self):
+        """ Returns an iterator over the `data` from the tail to the head.
+
+        A doubly linked list is walked backwards from the tail. Otherwise
+        the list is walked once to remember every `sqrt(n)`th Node, then
+        each block of Nodes between those is walked again and yielded in
+        reverse, so only `O(sqrt(n))` values are held at once.
+        """
+        if self._doubly:
+            node = self._last_node
+            while node is not None:
+                yield node.data
+                node = node.prev
+            return
+
+        step = max(int(sqrt(self._size)), 1)
+        starts = []
+        for count, node in enumerate(self.iter_nodes()):
+            if count % step == 0:
+                starts.append(node)
+
+        while starts:
+            block = list(islice(self.iter_from(starts.pop()), step))
+            while block:
+                yield block.pop().data
+
+    def __reduce__(self):
+        """ Pickles the LinkedList as its settings and a stream of `data`.
+
+        The Nodes are not pickled, so pickling doesn't recurse along the
+        `next` references. The `data` is pickled in batches from an
+        iterator and added back with `extend` when it is unpickled.
+        """
+        return (self.__class__, (self.strict, None, self._index is not None,
+                self._doubly, self._skip is not None, self._pool_size), None,
+                iter(self))
+
+    def dump(self, fp, chunk_size=65536, protocol=pickle.HIGHEST_PROTOCOL):
+        """ Writes the `data` of each Node to the binary file `fp`.
+
+        The `data` is pickled in chunks of `chunk_size` values, so only one
+        chunk is held in memory at a time. It can be read back by `load`.
+        """
+        _dump(self, self._size, fp, chunk_size, protocol)
+
+    @classmethod
+    def load(cls, fp, **kwargs):
+        """ Returns a new LinkedList with the values written by `dump`.
+
+        The values are read and added one chunk at a time. Any keyword
+        arguments are passed to the new LinkedList. As the values are
+        unpickled, only load files from a trusted source.
+        """
+        new_list = cls(**kwargs)
+        for chunk in _load(fp):
+            new_list.extend(chunk)
         return new_list
 
-    def reverse_recursive(self, node=None, new_list=None):
-        """ Returns a new LinkedList with the Nodes in reverse order. 
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the `str` of the `data` of each Node to the text file
+        `fp`, separated by `sep`.
 
-        This method uses a recursive approach.
+        The strings are joined and written `chunk_size` at a time, so the
+        whole of the text is never held in memory. With the default `sep`
+        the text is the same as `str` of the list, and with `sep="\\n"`
+        it can be read back by `read_from`.
         """
-        if new_list is None:
-            # First time through we initalise the new LinkedList
-            # and set the initial node to being reversing from.
-            new_list = LinkedList()
-            if node is None:
-                node = self.first_node
+        _write(self, fp, sep, chunk_size)
 
-        if node:
-            # If we have a node then prepend it to the new list.
-            # As all nodes are being prepended the new list will
-            # have the nodes in the reverse order. 
-            next = node.next
-            new_list.prepend(node)
-            if next is not None:
-                # If there are more nodes call this method again.
-                self.reverse_recursive(next, new_list)
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new LinkedList with a value for each line of the text
+        file `fp`.
+
+        The line endings are removed and each line is passed to `parse`,
+        if it is given, for the value. The lines are read as the Nodes are
+        linked, so the file is never read into memory as a whole. Any
+        keyword arguments are passed to the new LinkedList.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def to_numpy(self, dtype=float):
+        """ Returns a NumPy array of the `data` of each Node.
 
-        # Node reference is None, so we've reached the end of
-        # the LinkedList.
+        The array is filled in one pass over the list, without building a
+        `list` of the values first. This method requires NumPy.
+        """
+        import numpy
+        return numpy.fromiter(self, dtype=dtype, count=self._size)
+
+    @classmethod
+    def from_numpy(cls, values, chunk_size=65536, **kwargs):
+        """ Returns a new LinkedList of the values in the one dimensional
+        array `values`, as Python numbers.
+
+        The values are converted `chunk_size` at a time, so no more than
+        one chunk of them is held in a `list`. Any keyword arguments are
+        passed to the new LinkedList. This method requires NumPy.
+
+        With `backend="numeric"` the values are copied into the new
+        NumericLinkedList in one step, and it keeps the `dtype` of
+        `values`.
+        """
+        if kwargs.get("backend") == "numeric":
+            from amzlist.numeric import NumericLinkedList
+            del kwargs["backend"]
+            return NumericLinkedList.from_numpy(values, **kwargs)
+        import numpy
+        values = numpy.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("The array must be one dimensional.")
+
+        def converted():
+            for start in range(0, len(values), chunk_size):
+                for value in values[start:start + chunk_size].tolist():
+                    yield value
+
+        new_list = cls(**kwargs)
+        new_list.extend(converted())
         return new_list
 
+    def parallel_map(self, func, workers=None, chunk_size=1024,
+            threshold=10000, executor=None):
+        """ Returns a new LinkedList of `func(data)` for each Node, mapped in
+        a pool of `workers` processes.
+
+        See `amzlist.parallel.parallel_map`.
+        """
+        from amzlist.parallel import parallel_map
+        return parallel_map(self, func, workers, chunk_size, threshold,
+                executor)
+
+    def parallel_filter(self, predicate, workers=None, chunk_size=1024,
+            threshold=10000, executor=None):
+        """ Returns a new LinkedList of the `data` for which `predicate` is
+        `True`, tested in a pool of `workers` processes.
+
+        See `amzlist.parallel.parallel_filter`.
+        """
+        from amzlist.parallel import parallel_filter
+        return parallel_filter(self, predicate, workers, chunk_size,
+                threshold, executor)
+
+    def parallel_reduce(self, func, *initial, **kwargs):
+        """ Returns the `data` of the Nodes combined with the associative
+        `func`, in a pool of processes.
+
+        See `amzlist.parallel.parallel_reduce`.
+        """
+        from amzlist.parallel import parallel_reduce
+        return parallel_reduce(self, func, *initial, **kwargs)
+
     def as_list(self):
         """ Returns this LinkedList as a `list` of Nodes. """
-        nodes = []
-        node = self.first_node
-        while node:
-            nodes.append(node)
-            node = node.next
-        return nodes
+        return list(self.iter_nodes())
 
     def __len__(self):
         """ Returns the length/size of this LinkedList. """
-        return len(self.as_list())
+        return self._size
 
     def __str__(self):
         """ The string representation of the LinkedList. """
-        return "->".join([str(n.data) for n in self.as_list()])
+        # Join the values in chunks, rather than making a `str` for every
+        # value before they are joined.
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns e.g. LinkedList([1, 2, 3]), with at most the first
+        `_REPR_COUNT` values.
+        """
+        return _repr(self.__class__.__name__, self, self._size)
@@ -0,0 +1,183 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" A LinkedList for asyncio. This module requires Python 3.5 or later. """
+
+import asyncio
+from collections import deque
+
+from amzlist import LinkedList
+
+
+class AsyncLinkedList(object):
+    """ A LinkedList that coroutines can wait on.
+
+    `pop` waits until there is a Node to pop, and, if `maxsize` is more
+    than 0, `push` and `append` wait while the list holds `maxsize` Nodes.
+    A waiting coroutine is woken by the operation that lets it go on, so
+    nothing polls. The list must only be used from one event loop, which
+    is why no locks are needed.
+
+    `async for` pops and yields the `data` of each Node, and stops once the
+    list has been closed and is empty.
+    """
+
+    def __init__(self, maxsize=0, **kwargs):
+        """ Initialize a new AsyncLinkedList.
+
+        The keyword arguments, such as `strict` or `backend`, are passed to
+        the LinkedList that holds the Nodes.
+        """
+        super(AsyncLinkedList, self).__init__()
+        self.maxsize = maxsize
+        self.linked_list = LinkedList(**kwargs)
+        self._closed = False
+
+        # The futures of the coroutines waiting to pop, and to push or
+        # append, in the order they started waiting.
+        self._getters = deque()
+        self._putters = deque()
+
+    def empty(self):
+        """ Returns `True` if there are no Nodes to pop. """
+        return len(self.linked_list) == 0
+
+    def full(self):
+        """ Returns `True` if `push` and `append` would wait. """
+        return 0 < self.maxsize <= len(self.linked_list)
+
+    def _wake(self, waiters):
+        """ Wakes the first coroutine in `waiters` that is still waiting. """
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    async def _wait(self, waiters, ready):
+        """ Waits in `waiters` until `ready()` returns `True`. """
+        while not ready():
+            waiter = asyncio.get_event_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    # The waiter had been woken, so pass that on.
+                    self._wake(waiters)
+                raise
+
+    def _check_open(self):
+        """ Raises a `ValueError` if the list has been closed. """
+        if self._closed:
+            raise ValueError("The list is closed.")
+
+    def _can_put(self):
+        """ Returns `True` if a Node can be added without waiting. """
+        self._check_open()
+        return not self.full()
+
+    def _can_get(self):
+        """ Returns `True` if a Node can be popped without waiting. """
+        if self._closed and self.empty():
+            raise ValueError("The list is closed.")
+        return not self.empty()
+
+    async def push(self, node):
+        """ Prepends a Node to the head, waiting while the list is full. """
+        await self._wait(self._putters, self._can_put)
+        self.push_nowait(node)
+
+    async def append(self, node):
+        """ Appends a Node to the tail, waiting while the list is full. """
+        await self._wait(self._putters, self._can_put)
+        self.append_nowait(node)
+
+    def push_nowait(self, node):
+        """ Prepends a Node to the head.
+
+        `asyncio.QueueFull` is raised if the list is full.
+        """
+        self._check_open()
+        if self.full():
+            raise asyncio.QueueFull
+        self.linked_list.push(node)
+        self._wake(self._getters)
+
+    def append_nowait(self, node):
+        """ Appends a Node to the tail.
+
+        `asyncio.QueueFull` is raised if the list is full.
+        """
+        self._check_open()
+        if self.full():
+            raise asyncio.QueueFull
+        self.linked_list.append(node)
+        self._wake(self._getters)
+
+    async def pop(self):
+        """ Returns the first Node and removes it.
+
+        If the list is empty this waits until a Node is added. A
+        `ValueError` is raised if the list is closed and empty.
+        """
+        await self._wait(self._getters, self._can_get)
+        return self.pop_nowait()
+
+    def pop_nowait(self):
+        """ Returns the first Node and removes it.
+
+        `asyncio.QueueEmpty` is raised if the list is empty.
+        """
+        if self.empty():
+            raise asyncio.QueueEmpty
+        node = self.linked_list.pop()
+        self._wake(self._putters)
+        return node
+
+    async def pop_many(self, count):
+        """ Returns a `list` of up to `count` Nodes popped from the head.
+
+        This waits until the list isn't empty, then pops as many Nodes as
+        there are, up to `count`, so a consumer is woken once for a batch.
+        """
+        await self._wait(self._getters, self._can_get)
+        nodes = []
+        while len(nodes) < count and not self.empty():
+            nodes.append(self.pop_nowait())
+        return nodes
+
+    def close(self):
+        """ Closes the list, so no more Nodes can be added.
+
+        The waiting coroutines are woken. Nodes that are in the list can
+        still be popped.
+        """
+        self._closed = True
+        for waiters in (self._getters, self._putters):
+            while waiters:
+                self._wake(waiters)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """ Pops the next Node and returns its `data`. """
+        try:
+            return (await self.pop()).data
+        except ValueError:
+            raise StopAsyncIteration
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return len(self.linked_list)
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return str(self.linked_list)
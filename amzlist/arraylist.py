@@ -0,0 +1,407 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from array import array
+
+import pickle
+
+from amzlist import Node
+from amzlist import _dump
+from amzlist import _load
+from amzlist import _read
+from amzlist import _repr
+from amzlist import _texts
+from amzlist import _write
+
+# The index used in place of a `None` reference.
+_NONE = -1
+
+
+class ArrayNode(object):
+    """ A handle to an element of an ArrayLinkedList.
+
+    An ArrayNode has the `data` and `next` attributes of a Node, but the
+    values are stored in the arrays of the list. Handles are created when
+    they are needed, so two handles to the same element are equal but
+    not identical. Using a handle after its element has been removed
+    raises a `ValueError`.
+    """
+    __slots__ = ("_owner", "_index", "_gen")
+
+    def __init__(self, owner, index):
+        """ Initialize a handle to the element at `index` of `owner`. """
+        self._owner = owner
+        self._index = index
+        self._gen = owner._gen[index]
+
+    def _check(self):
+        """ Returns the index of the element, if it is still in the list. """
+        if self._owner._gen[self._index] != self._gen:
+            raise ValueError("The element has been removed from the list.")
+        return self._index
+
+    @property
+    def data(self):
+        """ Returns the `data` of the element. """
+        return self._owner._data[self._check()]
+
+    @data.setter
+    def data(self, value):
+        """ Updates the `data` of the element. """
+        self._owner._data[self._check()] = value
+
+    @property
+    def next(self):
+        """ Returns a handle to the next element, or `None`. """
+        return self._owner._node(self._owner._next[self._check()])
+
+    def __eq__(self, other):
+        """ Handles are equal if they refer to the same element. """
+        return isinstance(other, ArrayNode) and self._owner is other._owner \
+                and self._index == other._index and self._gen == other._gen
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._owner), self._index, self._gen))
+
+    def __str__(self):
+        """ Returns the string representation e.g. A->None, or A->B. """
+        next = self.next
+        next = next.data if next is not None else "None"
+        return "%s->%s" % (self.data, next)
+
+
+class ArrayLinkedList(object):
+    """ A LinkedList that stores its elements in parallel arrays.
+
+    The `data` of each element is kept in a `list` and the index of the
+    next element in an `array`, so there is no Node object per element.
+    The slots of removed elements are kept on a free list and reused.
+
+    The methods match those of LinkedList, with ArrayNode handles in
+    place of Nodes. Nodes passed to the list are copied by their `data`.
+    Create one with `LinkedList(backend="array")`.
+    """
+
+    def __init__(self, strict=None):
+        """ Initialize a new ArrayLinkedList.
+
+        The elements can only be linked through the list, which can't
+        create a cycle, so `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+
+        super(ArrayLinkedList, self).__init__()
+        self._data = []
+        self._next = array("q")
+        # The generation of each slot is incremented when its element is
+        # removed, which invalidates any handles to it.
+        self._gen = array("L")
+        self._head = _NONE
+        self._tail = _NONE
+        self._free = _NONE
+        self._size = 0
+
+    def _node(self, index):
+        """ Returns a handle to the element at `index`. """
+        if index == _NONE:
+            return None
+        return ArrayNode(self, index)
+
+    def _index(self, node):
+        """ Returns the index of the element `node` refers to. """
+        if not isinstance(node, ArrayNode) or node._owner is not self:
+            raise TypeError("After must be an ArrayNode of this list not a %s" \
+                    % (type(node)))
+        return node._check()
+
+    def _alloc(self, data):
+        """ Stores `data` in a free slot and returns its index. """
+        if isinstance(data, (Node, ArrayNode)):
+            data = data.data
+        index = self._free
+        if index == _NONE:
+            # There are no free slots so grow the arrays.
+            index = len(self._data)
+            self._data.append(data)
+            self._next.append(_NONE)
+            self._gen.append(0)
+        else:
+            # Reuse the slot at the head of the free list.
+            self._free = self._next[index]
+            self._data[index] = data
+            self._next[index] = _NONE
+        return index
+
+    def _release(self, index):
+        """ Returns the slot at `index` to the free list. """
+        self._data[index] = None
+        self._gen[index] += 1
+        self._next[index] = self._free
+        self._free = index
+
+    @property
+    def first_node(self):
+        """ Returns the first ArrayNode. """
+        return self._node(self._head)
+
+    @property
+    def last_node(self):
+        """ Returns the last ArrayNode. """
+        return self._node(self._tail)
+
+    @property
+    def next(self):
+        """ Returns the `next` ArrayNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first element. """
+        return self.first_node.data
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        index = self._alloc(node)
+        self._next[index] = self._head
+        if self._head == _NONE:
+            self._tail = index
+        self._head = index
+        self._size += 1
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list. """
+        index = self._alloc(node)
+        if self._head == _NONE:
+            self._head = index
+        else:
+            self._next[self._tail] = index
+        self._tail = index
+        self._size += 1
+
+    def insert(self, node, after):
+        """ Inserts `node` after the element `after` refers to. """
+        after = self._index(after)
+        index = self._alloc(node)
+        self._next[index] = self._next[after]
+        self._next[after] = index
+        if after == self._tail:
+            self._tail = index
+        self._size += 1
+
+    @classmethod
+    def from_iterable(cls, iterable, strict=None):
+        """ Returns a new ArrayLinkedList with the values from `iterable`. """
+        new_list = cls(strict=strict)
+        new_list.extend(iterable)
+        return new_list
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        for value in iterable:
+            self.append(value)
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the list. """
+        for value in iterable:
+            self.prepend(value)
+
+    def insert_many(self, values, after):
+        """ Inserts each value in `values` in order after `after`. """
+        after = self._index(after)
+        for value in values:
+            index = self._alloc(value)
+            self._next[index] = self._next[after]
+            self._next[after] = index
+            if after == self._tail:
+                self._tail = index
+            self._size += 1
+            after = index
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def pop(self):
+        """ Returns a Node with the data from the head, and removes it. """
+        index = self._head
+        if index == _NONE:
+            raise AttributeError("The list is empty.")
+        res = Node(self._data[index])
+        self._head = self._next[index]
+        if self._head == _NONE:
+            self._tail = _NONE
+        self._release(index)
+        self._size -= 1
+        return res
+
+    def remove(self, node):
+        """ Remove the specified `node`.
+
+        If `node` is an ArrayNode its element is removed, otherwise the
+        first element with the same `data` is removed.
+        """
+        curr, prev = self._find(node)
+        nxt = self._next
+        if prev == _NONE:
+            self._head = nxt[curr]
+        else:
+            nxt[prev] = nxt[curr]
+        if curr == self._tail:
+            self._tail = prev
+        self._release(curr)
+        self._size -= 1
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified element.
+
+        If `node` is an ArrayNode the element it refers to will match,
+        otherwise the first element with the same `data` will match.
+
+        If `inc_prev` is `True`, this method returns the handle and the
+        handle of the previous element in a tuple, otherwise it returns
+        the handle. A `ValueError` is raised if there is no match.
+        """
+        curr, prev = self._find(node)
+        if inc_prev:
+            return (self._node(curr), self._node(prev))
+        return self._node(curr)
+
+    def _find(self, node):
+        """ Returns the indexes of the matching element and the previous one.
+        """
+        data = self._data
+        nxt = self._next
+        prev = _NONE
+        curr = self._head
+        if isinstance(node, ArrayNode):
+            target = self._index(node)
+            while curr != _NONE and curr != target:
+                prev = curr
+                curr = nxt[curr]
+        else:
+            if isinstance(node, Node):
+                node = node.data
+            while curr != _NONE and data[curr] != node:
+                prev = curr
+                curr = nxt[curr]
+        if curr == _NONE:
+            raise ValueError("Node %s could not be found." % (node))
+        return curr, prev
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each element. """
+        data = self._data
+        nxt = self._next
+        curr = self._head
+        while curr != _NONE:
+            yield data[curr]
+            curr = nxt[curr]
+
+    def reverse(self):
+        """ Reverses the order of the elements in place. """
+        nxt = self._next
+        prev = _NONE
+        curr = self._head
+        while curr != _NONE:
+            following = nxt[curr]
+            nxt[curr] = prev
+            prev = curr
+            curr = following
+        self._tail = self._head
+        self._head = prev
+
+    def reversed_copy(self):
+        """ Returns a new ArrayLinkedList with the elements in reverse order.
+        """
+        return self.reverse_iterative()
+
+    def reverse_iterative(self):
+        """ Returns a new ArrayLinkedList with the elements in reverse order.
+
+        This method uses an iterative approach.
+        """
+        new_list = ArrayLinkedList(strict=self.strict)
+        for value in self:
+            new_list.prepend(value)
+        return new_list
+
+    def reverse_recursive(self):
+        """ Returns a new ArrayLinkedList with the elements in reverse order.
+
+        This method uses a recursive approach, which halves the elements
+        at each level so the depth of recursion is logarithmic.
+        """
+        new_list = ArrayLinkedList(strict=self.strict)
+        data = self._data
+        nxt = self._next
+
+        def prepend_from(curr, count):
+            # Prepend `count` elements from `curr` to the new list, and
+            # return the index of the element after them.
+            if count == 1:
+                new_list.prepend(data[curr])
+                return nxt[curr]
+            curr = prepend_from(curr, count // 2)
+            return prepend_from(curr, count - count // 2)
+
+        if self._size:
+            prepend_from(self._head, self._size)
+        return new_list
+
+    def dump(self, fp, chunk_size=65536, protocol=pickle.HIGHEST_PROTOCOL):
+        """ Writes the values to the binary file `fp`, as LinkedList.dump.
+        """
+        _dump(self, self._size, fp, chunk_size, protocol)
+
+    @classmethod
+    def load(cls, fp, **kwargs):
+        """ Returns a new ArrayLinkedList with the values from `dump`.
+        """
+        new_list = cls(**kwargs)
+        for chunk in _load(fp):
+            new_list.extend(chunk)
+        return new_list
+
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the values to the text file `fp`, as LinkedList.write_to.
+        """
+        _write(self, fp, sep, chunk_size)
+
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new ArrayLinkedList with the lines of the text file
+        `fp`, as LinkedList.read_from.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def as_list(self):
+        """ Returns this list as a `list` of ArrayNodes. """
+        nodes = []
+        nxt = self._next
+        curr = self._head
+        while curr != _NONE:
+            nodes.append(ArrayNode(self, curr))
+            curr = nxt[curr]
+        return nodes
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns the `repr` of the list, as LinkedList.__repr__. """
+        return _repr(self.__class__.__name__, self, self._size)
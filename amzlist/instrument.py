@@ -0,0 +1,289 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" Counts the work done by each LinkedList operation.
+
+While instrumentation is enabled, each call to a LinkedList operation
+records how many Nodes it visited by following `next`, how many Nodes
+it allocated, and how many Nodes a strict list stepped over to check
+for a cycle:
+
+    from amzlist.instrument import profile
+
+    with profile() as stats:
+        lnkd_list.find(value)
+    print(stats)
+
+Instrumentation works by replacing `Node.next`, `Node.__init__` and the
+LinkedList methods with versions that count, and putting the originals
+back when it is disabled, so a disabled list runs the same code as if
+this module had never been imported. Only the default, Node based,
+LinkedList is instrumented, and the counters are not thread safe.
+"""
+
+from contextlib import contextmanager
+
+from amzlist import LinkedList
+from amzlist import Node
+
+
+# The LinkedList methods that are recorded as operations. A method called
+# by another operation is counted as part of that operation.
+OPERATIONS = ("prepend", "append", "insert", "extend", "extendleft",
+        "insert_many", "push", "pop", "pop_last", "remove", "unlink",
+        "find", "__contains__", "node_at", "index", "reverse", "sort",
+        "merge", "reversed_copy", "reverse_iterative", "reverse_recursive",
+        "as_list", "validate", "__str__")
+
+# The methods that check a strict list for cycles. The Nodes visited
+# while they run are counted as `checks` rather than `visited`.
+_CHECKS = ("_relink", "_label_run")
+
+
+class OperationStats(object):
+    """ The counts for one operation.
+
+    `calls` is the number of times the operation was called, `visited`
+    the number of times a Node's `next` was followed, `allocated` the
+    number of Nodes created and `checks` the number of Nodes followed to
+    check a strict list for a cycle.
+    """
+    __slots__ = ("calls", "visited", "allocated", "checks")
+
+    def __init__(self, calls=0, visited=0, allocated=0, checks=0):
+        self.calls = calls
+        self.visited = visited
+        self.allocated = allocated
+        self.checks = checks
+
+    def add(self, other):
+        """ Adds the counts of `other` to these counts. """
+        self.calls += other.calls
+        self.visited += other.visited
+        self.allocated += other.allocated
+        self.checks += other.checks
+
+    def __eq__(self, other):
+        if not isinstance(other, OperationStats):
+            return NotImplemented
+        return self._counts() == other._counts()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def _counts(self):
+        return (self.calls, self.visited, self.allocated, self.checks)
+
+    def __repr__(self):
+        return "OperationStats(calls=%d, visited=%d, allocated=%d, " \
+                "checks=%d)" % self._counts()
+
+
+class Stats(object):
+    """ The counts of each operation called while a profile was enabled.
+
+    `operations` maps the name of each operation, such as `"find"` or
+    `"Node.__setattr__"`, to its OperationStats. If a `callback` is given
+    it is called with the name and the OperationStats of every call as
+    it returns.
+    """
+
+    def __init__(self, callback=None):
+        super(Stats, self).__init__()
+        self.callback = callback
+        self.operations = {}
+
+    def __getitem__(self, name):
+        """ Returns the counts for `name`, which are 0 if it wasn't called. """
+        return self.operations.get(name, OperationStats())
+
+    def total(self):
+        """ Returns the counts of all the operations added together. """
+        total = OperationStats()
+        for counts in self.operations.values():
+            total.add(counts)
+        return total
+
+    def reset(self):
+        """ Forgets the counts recorded so far. """
+        self.operations = {}
+
+    def _record(self, name, counts):
+        try:
+            self.operations[name].add(counts)
+        except KeyError:
+            self.operations[name] = OperationStats(*counts._counts())
+        if self.callback is not None:
+            self.callback(name, counts)
+
+    def __str__(self):
+        """ A table of the operations, the most Nodes visited first. """
+        lines = ["%-20s %8s %10s %10s %10s" % ("operation", "calls",
+                "visited", "allocated", "checks")]
+        operations = sorted(self.operations.items(),
+                key=lambda item: (-item[1].visited, item[0]))
+        for name, counts in operations:
+            lines.append("%-20s %8d %10d %10d %10d" % ((name,)
+                    + counts._counts()))
+        return "\n".join(lines)
+
+
+class _Counter(object):
+    """ The running counts, shared by the instrumented methods. """
+    __slots__ = ("visited", "allocated", "checks", "checking", "depth")
+
+    def __init__(self):
+        self.visited = 0
+        self.allocated = 0
+        self.checks = 0
+        self.checking = False
+        self.depth = 0
+
+_counter = _Counter()
+
+# The Stats of the profiles that are enabled, and the attributes that were
+# replaced, by class and name, so they can be put back.
+_profiles = []
+_originals = {}
+
+
+def _record(name, visited, allocated, checks):
+    """ Records a call to `name` that started at the given counts. """
+    counts = OperationStats(1, _counter.visited - visited,
+            _counter.allocated - allocated, _counter.checks - checks)
+    for stats in _profiles:
+        stats._record(name, counts)
+
+
+def _operation(name, method):
+    """ Returns `method` wrapped to record each call as operation `name`. """
+    def instrumented(*args, **kwargs):
+        counter = _counter
+        if counter.depth:
+            return method(*args, **kwargs)
+        start = (counter.visited, counter.allocated, counter.checks)
+        counter.depth = 1
+        try:
+            return method(*args, **kwargs)
+        finally:
+            counter.depth = 0
+            _record(name, *start)
+    instrumented.__name__ = method.__name__
+    instrumented.__doc__ = method.__doc__
+    return instrumented
+
+
+def _check(method):
+    """ Returns `method` wrapped so the Nodes it visits count as checks. """
+    def instrumented(*args, **kwargs):
+        checking = _counter.checking
+        _counter.checking = True
+        try:
+            return method(*args, **kwargs)
+        finally:
+            _counter.checking = checking
+    instrumented.__name__ = method.__name__
+    instrumented.__doc__ = method.__doc__
+    return instrumented
+
+
+def _next_property(descriptor):
+    """ Returns a property for `Node.next` that counts each time it's read. """
+    get = descriptor.__get__
+
+    def get_next(node):
+        counter = _counter
+        if counter.checking:
+            counter.checks += 1
+        else:
+            counter.visited += 1
+        return get(node, Node)
+
+    return property(get_next, descriptor.__set__, descriptor.__delete__,
+            descriptor.__doc__)
+
+
+def _node_init(init):
+    """ Returns `Node.__init__` wrapped to count the Nodes created. """
+    def __init__(self, data):
+        _counter.allocated += 1
+        init(self, data)
+    __init__.__doc__ = init.__doc__
+    return __init__
+
+
+def _replace(cls, name, value):
+    _originals[(cls, name)] = cls.__dict__[name]
+    setattr(cls, name, value)
+
+
+def _install():
+    """ Replaces the Node and LinkedList attributes with counting ones. """
+    _replace(Node, "next", _next_property(Node.__dict__["next"]))
+    _replace(Node, "__init__", _node_init(Node.__dict__["__init__"]))
+    _replace(Node, "__setattr__", _operation("Node.__setattr__",
+            Node.__dict__["__setattr__"]))
+    for name in OPERATIONS:
+        _replace(LinkedList, name, _operation(name,
+                LinkedList.__dict__[name]))
+    last_node = LinkedList.__dict__["last_node"]
+    _replace(LinkedList, "last_node", property(_operation("last_node",
+            last_node.fget), doc=last_node.__doc__))
+    for name in _CHECKS:
+        _replace(LinkedList, name, _check(LinkedList.__dict__[name]))
+
+
+def _uninstall():
+    """ Puts back the attributes replaced by `_install`. """
+    for (cls, name), value in _originals.items():
+        setattr(cls, name, value)
+    _originals.clear()
+
+
+def enable(callback=None):
+    """ Starts counting the operations and returns the Stats to count in.
+
+    `callback`, if given, is called with the name and the OperationStats
+    of each operation as it returns. More than one profile can be enabled
+    at a time, each with its own Stats.
+    """
+    stats = Stats(callback)
+    if not _profiles:
+        _install()
+    _profiles.append(stats)
+    return stats
+
+
+def disable(stats):
+    """ Stops counting in `stats`, which was returned by `enable`.
+
+    Once no profile is enabled the original methods are put back.
+    """
+    _profiles.remove(stats)
+    if not _profiles:
+        _uninstall()
+
+
+def is_enabled():
+    """ Returns `True` if any profile is enabled. """
+    return bool(_profiles)
+
+
+@contextmanager
+def profile(callback=None):
+    """ Counts the operations called in a `with` block.
+
+    The Stats are returned by the context manager, and hold the counts
+    once the block has finished.
+    """
+    stats = enable(callback)
+    try:
+        yield stats
+    finally:
+        disable(stats)
@@ -0,0 +1,523 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import mmap
+import os
+import pickle
+import struct
+
+from amzlist import Node
+from amzlist import _read
+from amzlist import _repr
+from amzlist import _texts
+from amzlist import _write
+
+# The index used in place of a `None` reference.
+_NONE = -1
+
+# The records file starts with a header: a magic string, the version of
+# the format, the indexes of the head, the tail and the first free
+# record, the size, the number of records used and the end of the heap.
+_MAGIC = b"AMZM"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIqqqQQQ")
+_HEADER_SIZE = 64
+
+# Each record holds the index of the next record, and the offset, the
+# capacity and the length of its payload in the heap, the generation of
+# the record and the kind of payload.
+_RECORD = struct.Struct("<qQIIII")
+_NEXT = struct.Struct("<q")
+
+# The kinds of payload. `bytes` are stored as they are, anything else is
+# pickled.
+_BYTES = 0
+_PICKLED = 1
+
+# The initial number of records and size of the heap of a new list.
+_RECORDS = 1024
+_HEAP = 1 << 16
+
+
+class MappedNode(object):
+    """ A handle to an element of a MappedLinkedList.
+
+    A MappedNode has the `data` and `next` attributes of a Node, which are
+    read from the mapped files when they are used. `raw` returns the
+    stored payload as a `memoryview` of the mapping, without copying it.
+    Using a handle after its element has been removed raises
+    a `ValueError`.
+    """
+    __slots__ = ("_owner", "_index", "_gen")
+
+    def __init__(self, owner, index):
+        """ Initialize a handle to the element at `index` of `owner`. """
+        self._owner = owner
+        self._index = index
+        self._gen = owner._record(index)[4]
+
+    def _check(self):
+        """ Returns the index of the element, if it is still in the list. """
+        if self._owner._record(self._index)[4] != self._gen:
+            raise ValueError("The element has been removed from the list.")
+        return self._index
+
+    @property
+    def data(self):
+        """ Returns the `data` of the element. """
+        return self._owner._value(self._check())
+
+    @data.setter
+    def data(self, value):
+        """ Updates the `data` of the element. """
+        self._owner._store(self._check(), value)
+
+    @property
+    def raw(self):
+        """ Returns a `memoryview` of the stored payload of the element.
+
+        The payload is the `bytes` for a `bytes` value, otherwise the
+        pickled value. The list can't grow its heap while a view is held.
+        """
+        return self._owner._view(self._check())
+
+    @property
+    def next(self):
+        """ Returns a handle to the next element, or `None`. """
+        return self._owner._node(self._owner._next(self._check()))
+
+    def __eq__(self, other):
+        """ Handles are equal if they refer to the same element. """
+        return isinstance(other, MappedNode) and self._owner is other._owner \
+                and self._index == other._index and self._gen == other._gen
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._owner), self._index, self._gen))
+
+    def __str__(self):
+        """ Returns the string representation e.g. A->None, or A->B. """
+        next = self.next
+        next = next.data if next is not None else "None"
+        return "%s->%s" % (self.data, next)
+
+
+class MappedLinkedList(object):
+    """ A LinkedList that stores its elements in memory mapped files.
+
+    The file at `path` holds a fixed size record for each element, with
+    the index of the next record, and `path + ".heap"` holds the payloads.
+    The list is changed in place in the mappings, so it can be larger than
+    memory, and reopening the file restores the list without rebuilding
+    it. `flush` writes the changes to the files, and `sync` also makes
+    sure they have reached the disk.
+
+    Removed records are kept on a free list and reused, and so is their
+    space in the heap for a payload that fits in it. A payload that
+    doesn't fit in the space of its record is put at the end of the heap,
+    and the old space isn't used again, so if payloads grow the heap keeps
+    growing; copy the values into a new list to reclaim it. The files are
+    grown by doubling when they are full. A `memoryview` from `MappedNode.raw`
+    must be released before the heap can grow, otherwise a `BufferError`
+    is raised and the list is left unchanged.
+
+    The methods match those of LinkedList, with MappedNode handles in
+    place of Nodes, except for the ones that create a new list. Nodes
+    passed to the list are copied by their `data`. Create one with
+    `LinkedList(backend="mapped", path=path)`.
+    """
+
+    def __init__(self, path, strict=None):
+        """ Opens the list at `path`, or creates it if it doesn't exist.
+
+        The elements can only be linked through the list, which can't
+        create a cycle, so `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+
+        super(MappedLinkedList, self).__init__()
+        self.path = path
+        heap_path = path + ".heap"
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists and not (os.path.exists(heap_path)
+                and os.path.getsize(heap_path) > 0):
+            raise ValueError("The heap file %s is missing or empty." \
+                    % (heap_path,))
+        mode = "r+b" if exists else "w+b"
+        self._records_file = open(path, mode)
+        self._heap_file = open(heap_path, mode if os.path.exists(heap_path) \
+                else "w+b")
+
+        if exists:
+            self._records = mmap.mmap(self._records_file.fileno(), 0)
+            self._heap = mmap.mmap(self._heap_file.fileno(), 0)
+            magic, version, self._head, self._tail, self._free, self._size, \
+                    self._count, self._heap_end = \
+                    _HEADER.unpack_from(self._records, 0)
+            if magic != _MAGIC:
+                self.close()
+                raise ValueError("%s is not a MappedLinkedList." % (path,))
+            if version != _VERSION:
+                self.close()
+                raise ValueError("Unsupported format version %s" % (version))
+        else:
+            self._records_file.truncate(_HEADER_SIZE + _RECORDS * _RECORD.size)
+            self._heap_file.truncate(_HEAP)
+            self._records = mmap.mmap(self._records_file.fileno(), 0)
+            self._heap = mmap.mmap(self._heap_file.fileno(), 0)
+            self._head = self._tail = self._free = _NONE
+            self._size = self._count = self._heap_end = 0
+            self._save_header()
+
+    def _save_header(self):
+        """ Writes the head, tail, free list and sizes to the header. """
+        _HEADER.pack_into(self._records, 0, _MAGIC, _VERSION, self._head,
+                self._tail, self._free, self._size, self._count,
+                self._heap_end)
+
+    def _record(self, index):
+        """ Returns the fields of the record at `index`. """
+        return _RECORD.unpack_from(self._records,
+                _HEADER_SIZE + index * _RECORD.size)
+
+    def _next(self, index):
+        """ Returns the index of the record after the one at `index`. """
+        return _NEXT.unpack_from(self._records,
+                _HEADER_SIZE + index * _RECORD.size)[0]
+
+    def _link(self, index, next):
+        """ Sets the index of the record after the one at `index`. """
+        _NEXT.pack_into(self._records, _HEADER_SIZE + index * _RECORD.size,
+                next)
+
+    def _view(self, index):
+        """ Returns a `memoryview` of the payload of the record at `index`.
+        """
+        _, offset, _, length, _, _ = self._record(index)
+        return memoryview(self._heap)[offset:offset + length]
+
+    def _value(self, index):
+        """ Returns the value stored in the record at `index`. """
+        _, offset, _, length, _, kind = self._record(index)
+        if kind == _BYTES:
+            return self._heap[offset:offset + length]
+        view = memoryview(self._heap)[offset:offset + length]
+        try:
+            return pickle.loads(view)
+        finally:
+            view.release()
+
+    def _node(self, index):
+        """ Returns a handle to the element at `index`. """
+        if index == _NONE:
+            return None
+        return MappedNode(self, index)
+
+    def _index(self, node):
+        """ Returns the index of the element `node` refers to. """
+        if not isinstance(node, MappedNode) or node._owner is not self:
+            raise TypeError("After must be a MappedNode of this list not " \
+                    "a %s" % (type(node)))
+        return node._check()
+
+    def _grow(self, mapping, fileobj, size):
+        """ Returns `mapping` remapped after growing its file to `size`. """
+        new_size = len(mapping)
+        while new_size < size:
+            new_size *= 2
+        # Closing the mapping raises a BufferError if a view is held.
+        mapping.close()
+        fileobj.truncate(new_size)
+        return mmap.mmap(fileobj.fileno(), 0)
+
+    def _store(self, index, value):
+        """ Stores `value` as the payload of the record at `index`. """
+        if isinstance(value, Node):
+            value = value.data
+        if isinstance(value, bytes):
+            kind, payload = _BYTES, value
+        else:
+            kind, payload = _PICKLED, pickle.dumps(value,
+                    pickle.HIGHEST_PROTOCOL)
+
+        next, offset, capacity, _, gen, _ = self._record(index)
+        if len(payload) > capacity:
+            # The payload doesn't fit in the space of the record, so put it
+            # at the end of the heap.
+            end = self._heap_end + len(payload)
+            if end > len(self._heap):
+                self._heap = self._grow(self._heap, self._heap_file, end)
+            offset = self._heap_end
+            capacity = len(payload)
+            self._heap_end = end
+        self._heap[offset:offset + len(payload)] = payload
+        _RECORD.pack_into(self._records, _HEADER_SIZE + index * _RECORD.size,
+                next, offset, capacity, len(payload), gen, kind)
+
+    def _alloc(self, value):
+        """ Stores `value` in a free record and returns its index. """
+        index = self._free
+        if index == _NONE:
+            # There are no free records so use a new one.
+            index = self._count
+            end = _HEADER_SIZE + (index + 1) * _RECORD.size
+            if end > len(self._records):
+                self._records = self._grow(self._records, self._records_file,
+                        end)
+            _RECORD.pack_into(self._records, end - _RECORD.size, _NONE, 0, 0,
+                    0, 0, _PICKLED)
+            self._store(index, value)
+            self._count += 1
+        else:
+            # Reuse the record at the head of the free list.
+            self._store(index, value)
+            self._free = self._next(index)
+        self._link(index, _NONE)
+        return index
+
+    def _release(self, index):
+        """ Returns the record at `index` to the free list. """
+        next, offset, capacity, _, gen, kind = self._record(index)
+        _RECORD.pack_into(self._records, _HEADER_SIZE + index * _RECORD.size,
+                self._free, offset, capacity, 0, gen + 1, kind)
+        self._free = index
+
+    @property
+    def first_node(self):
+        """ Returns the first MappedNode. """
+        return self._node(self._head)
+
+    @property
+    def last_node(self):
+        """ Returns the last MappedNode. """
+        return self._node(self._tail)
+
+    @property
+    def next(self):
+        """ Returns the `next` MappedNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first element. """
+        return self.first_node.data
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        index = self._alloc(node)
+        self._link(index, self._head)
+        if self._head == _NONE:
+            self._tail = index
+        self._head = index
+        self._size += 1
+        self._save_header()
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list. """
+        index = self._alloc(node)
+        if self._head == _NONE:
+            self._head = index
+        else:
+            self._link(self._tail, index)
+        self._tail = index
+        self._size += 1
+        self._save_header()
+
+    def insert(self, node, after):
+        """ Inserts `node` after the element `after` refers to. """
+        after = self._index(after)
+        index = self._alloc(node)
+        self._link(index, self._next(after))
+        self._link(after, index)
+        if after == self._tail:
+            self._tail = index
+        self._size += 1
+        self._save_header()
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        for value in iterable:
+            self.append(value)
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the list. """
+        for value in iterable:
+            self.prepend(value)
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def pop(self):
+        """ Returns a Node with the data from the head, and removes it. """
+        index = self._head
+        if index == _NONE:
+            raise AttributeError("The list is empty.")
+        res = Node(self._value(index))
+        self._head = self._next(index)
+        if self._head == _NONE:
+            self._tail = _NONE
+        self._release(index)
+        self._size -= 1
+        self._save_header()
+        return res
+
+    def remove(self, node):
+        """ Remove the specified `node`.
+
+        If `node` is a MappedNode its element is removed, otherwise the
+        first element with the same `data` is removed.
+        """
+        curr, prev = self._find(node)
+        if prev == _NONE:
+            self._head = self._next(curr)
+        else:
+            self._link(prev, self._next(curr))
+        if curr == self._tail:
+            self._tail = prev
+        self._release(curr)
+        self._size -= 1
+        self._save_header()
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified element.
+
+        If `node` is a MappedNode the element it refers to will match,
+        otherwise the first element with the same `data` will match.
+
+        If `inc_prev` is `True`, this method returns the handle and the
+        handle of the previous element in a tuple, otherwise it returns
+        the handle. A `ValueError` is raised if there is no match.
+        """
+        curr, prev = self._find(node)
+        if inc_prev:
+            return (self._node(curr), self._node(prev))
+        return self._node(curr)
+
+    def _find(self, node):
+        """ Returns the indexes of the matching element and the previous one.
+        """
+        prev = _NONE
+        curr = self._head
+        if isinstance(node, MappedNode):
+            target = self._index(node)
+            while curr != _NONE and curr != target:
+                prev = curr
+                curr = self._next(curr)
+        else:
+            if isinstance(node, Node):
+                node = node.data
+            while curr != _NONE and not self._matches(curr, node):
+                prev = curr
+                curr = self._next(curr)
+        if curr == _NONE:
+            raise ValueError("Node %s could not be found." % (node,))
+        return curr, prev
+
+    def _matches(self, index, value):
+        """ Returns `True` if the record at `index` holds `value`. """
+        _, offset, _, length, _, kind = self._record(index)
+        if kind == _BYTES:
+            if not isinstance(value, bytes):
+                return False
+            # Compare the payload in place rather than copying it.
+            if length != len(value):
+                return False
+            return self._heap.find(value, offset, offset + length) == offset
+        return self._value(index) == value
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each element. """
+        curr = self._head
+        while curr != _NONE:
+            yield self._value(curr)
+            curr = self._next(curr)
+
+    def iter_raw(self):
+        """ Returns an iterator over a `memoryview` of each payload. """
+        curr = self._head
+        while curr != _NONE:
+            yield self._view(curr)
+            curr = self._next(curr)
+
+    def reverse(self):
+        """ Reverses the order of the elements in place. """
+        prev = _NONE
+        curr = self._head
+        while curr != _NONE:
+            following = self._next(curr)
+            self._link(curr, prev)
+            prev = curr
+            curr = following
+        self._tail = self._head
+        self._head = prev
+        self._save_header()
+
+    def as_list(self):
+        """ Returns this list as a `list` of MappedNodes. """
+        nodes = []
+        curr = self._head
+        while curr != _NONE:
+            nodes.append(MappedNode(self, curr))
+            curr = self._next(curr)
+        return nodes
+
+    def flush(self):
+        """ Writes the changes in the mappings to the files. """
+        self._records.flush()
+        self._heap.flush()
+
+    def sync(self):
+        """ Flushes the changes and waits for them to reach the disk. """
+        self.flush()
+        os.fsync(self._records_file.fileno())
+        os.fsync(self._heap_file.fileno())
+
+    def close(self):
+        """ Flushes the changes and closes the files. """
+        if self._records.closed:
+            return
+        self.flush()
+        self._records.close()
+        self._heap.close()
+        self._records_file.close()
+        self._heap_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the values to the text file `fp`, as LinkedList.write_to.
+        """
+        _write(self, fp, sep, chunk_size)
+
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new MappedLinkedList with the lines of the text file
+        `fp`, as LinkedList.read_from.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns the `repr` of the list, as LinkedList.__repr__. """
+        return _repr(self.__class__.__name__, self, self._size)
@@ -0,0 +1,608 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" A LinkedList of numbers stored in a NumPy array.
+
+This module requires NumPy.
+"""
+
+from array import array
+
+import numpy
+
+from amzlist import Node
+from amzlist import _read
+from amzlist import _repr
+from amzlist import _texts
+from amzlist import _write
+
+# The index used in place of a `None` reference.
+_NONE = -1
+
+# The number of values converted to Python objects at a time when the list
+# is iterated.
+_CHUNK = 4096
+
+
+class NumericNode(object):
+    """ A handle to an element of a NumericLinkedList.
+
+    A NumericNode has the `data` and `next` attributes of a Node. `data`
+    is returned as a Python number. Two handles to the same element are
+    equal but not identical. Using a handle after its element has been
+    removed raises a `ValueError`.
+    """
+    __slots__ = ("_owner", "_index", "_gen")
+
+    def __init__(self, owner, index):
+        """ Initialize a handle to the element at `index` of `owner`. """
+        self._owner = owner
+        self._index = index
+        self._gen = owner._gen[index]
+
+    def _check(self):
+        """ Returns the index of the element, if it is still in the list. """
+        if self._owner._gen[self._index] != self._gen:
+            raise ValueError("The element has been removed from the list.")
+        return self._index
+
+    @property
+    def data(self):
+        """ Returns the `data` of the element. """
+        return self._owner._values[self._check()].item()
+
+    @data.setter
+    def data(self, value):
+        """ Updates the `data` of the element. """
+        self._owner._values[self._check()] = value
+
+    @property
+    def next(self):
+        """ Returns a handle to the next element, or `None`. """
+        return self._owner._node(self._owner._next[self._check()])
+
+    def __eq__(self, other):
+        """ Handles are equal if they refer to the same element. """
+        return isinstance(other, NumericNode) \
+                and self._owner is other._owner \
+                and self._index == other._index and self._gen == other._gen
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._owner), self._index, self._gen))
+
+    def __str__(self):
+        """ Returns the string representation e.g. A->None, or A->B. """
+        next = self.next
+        next = next.data if next is not None else "None"
+        return "%s->%s" % (self.data, next)
+
+
+class NumericLinkedList(object):
+    """ A LinkedList of numbers of one NumPy `dtype`.
+
+    The values are kept in a NumPy array and the index of the next element
+    in a side array, so the elements are linked like those of an
+    ArrayLinkedList. While values are only appended they are stored in
+    list order, otherwise the order is found by following the links once
+    and kept until the list is changed again.
+
+    `map`, `filter`, `remove_if`, `sum`, `min`, `max` and `find` work on
+    all of the values at once in NumPy rather than on each Node in
+    Python. The other methods match those of LinkedList, with NumericNode
+    handles in place of Nodes. Create one with
+    `LinkedList(backend="numeric", dtype=...)`.
+    """
+
+    def __init__(self, strict=None, dtype=float, capacity=16):
+        """ Initialize a new NumericLinkedList of values of `dtype`.
+
+        The elements can only be linked through the list, which can't
+        create a cycle, so `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+
+        super(NumericLinkedList, self).__init__()
+        self.dtype = numpy.dtype(dtype)
+        self._values = numpy.zeros(max(capacity, 1), self.dtype)
+        # Whether each slot holds an element, so the values can be reduced
+        # without working out their order.
+        self._live = numpy.zeros(len(self._values), bool)
+        self._next = array("q")
+        # The generation of each slot is incremented when its element is
+        # removed, which invalidates any handles to it.
+        self._gen = array("L")
+        self._head = _NONE
+        self._tail = _NONE
+        self._free = _NONE
+        self._size = 0
+
+        # `_contiguous` is `True` while the elements are the first `_size`
+        # slots in list order. `_order` holds the slots in list order once
+        # it has been worked out, until the list is changed.
+        self._contiguous = True
+        self._order = None
+
+    def _node(self, index):
+        """ Returns a handle to the element at `index`. """
+        if index == _NONE:
+            return None
+        return NumericNode(self, index)
+
+    def _index(self, node):
+        """ Returns the index of the element `node` refers to. """
+        if not isinstance(node, NumericNode) or node._owner is not self:
+            raise TypeError("After must be a NumericNode of this list not " \
+                    "a %s" % (type(node)))
+        return node._check()
+
+    def _alloc(self, data):
+        """ Stores `data` in a free slot and returns its index. """
+        if isinstance(data, (Node, NumericNode)):
+            data = data.data
+        index = self._free
+        if index == _NONE:
+            index = len(self._next)
+            if index == len(self._values):
+                # Double the capacity of the values.
+                self._grow(2 * index)
+            self._values[index] = data
+            self._next.append(_NONE)
+            self._gen.append(0)
+        else:
+            # Reuse the slot at the head of the free list.
+            self._values[index] = data
+            self._free = self._next[index]
+            self._next[index] = _NONE
+        self._live[index] = True
+        return index
+
+    def _grow(self, capacity):
+        """ Increases the number of slots for values to `capacity`. """
+        used = len(self._next)
+        values = numpy.zeros(capacity, self.dtype)
+        values[:used] = self._values[:used]
+        self._values = values
+        live = numpy.zeros(capacity, bool)
+        live[:used] = self._live[:used]
+        self._live = live
+
+    def _release(self, index):
+        """ Returns the slot at `index` to the free list. """
+        self._live[index] = False
+        self._gen[index] += 1
+        self._next[index] = self._free
+        self._free = index
+
+    def _changed(self, contiguous=False):
+        """ Forgets the order of the elements after the list is changed.
+
+        `contiguous` is whether the elements are still the first slots in
+        list order.
+        """
+        self._contiguous = contiguous
+        self._order = None
+
+    def _slots(self):
+        """ Returns an array of the slots of the elements in list order. """
+        if self._order is None:
+            if self._contiguous:
+                self._order = numpy.arange(self._size, dtype=numpy.int64)
+            else:
+                order = array("q")
+                nxt = self._next
+                curr = self._head
+                while curr != _NONE:
+                    order.append(curr)
+                    curr = nxt[curr]
+                self._order = numpy.frombuffer(order, dtype=numpy.int64)
+        return self._order
+
+    def _link(self, slots):
+        """ Links the elements in `slots` into a list, in that order. """
+        links = numpy.frombuffer(self._next, dtype=numpy.int64)
+        links[slots[:-1]] = slots[1:]
+        del links
+        if len(slots):
+            self._next[int(slots[-1])] = _NONE
+            self._head = int(slots[0])
+            self._tail = int(slots[-1])
+        else:
+            self._head = self._tail = _NONE
+
+    def values(self):
+        """ Returns a NumPy array of the values in list order.
+
+        The array is a copy, so changing it doesn't change the list.
+        """
+        if self._contiguous:
+            return self._values[:self._size].copy()
+        return self._values[self._slots()]
+
+    def to_numpy(self, dtype=None):
+        """ Returns a NumPy array of the values, of `dtype` if given. """
+        values = self.values()
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+        return values
+
+    @classmethod
+    def from_numpy(cls, values, dtype=None, strict=None):
+        """ Returns a new NumericLinkedList with the values of the one
+        dimensional array `values`, and its `dtype` unless one is given.
+        """
+        values = numpy.asarray(values, dtype=dtype)
+        if values.ndim != 1:
+            raise ValueError("The array must be one dimensional.")
+        new_list = cls(strict=strict, dtype=values.dtype,
+                capacity=len(values))
+        new_list._extend_array(values)
+        return new_list
+
+    def _extend_array(self, values):
+        """ Appends the values of an array in one step. """
+        count = len(values)
+        if not count:
+            return
+        if self._free != _NONE:
+            # Free slots are reused one at a time.
+            for value in values.tolist():
+                self.append(value)
+            return
+        start = len(self._next)
+        if start + count > len(self._values):
+            self._grow(max(2 * len(self._values), start + count))
+        self._values[start:start + count] = values
+        self._live[start:start + count] = True
+        self._next.extend(range(start + 1, start + count + 1))
+        self._next[-1] = _NONE
+        self._gen.extend([0] * count)
+        if self._tail == _NONE:
+            self._head = start
+        else:
+            self._next[self._tail] = start
+        self._tail = start + count - 1
+        self._changed(self._contiguous and start == self._size)
+        self._size += count
+
+    @property
+    def first_node(self):
+        """ Returns the first NumericNode. """
+        return self._node(self._head)
+
+    @property
+    def last_node(self):
+        """ Returns the last NumericNode. """
+        return self._node(self._tail)
+
+    @property
+    def next(self):
+        """ Returns the `next` NumericNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first element. """
+        return self.first_node.data
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        index = self._alloc(node)
+        self._next[index] = self._head
+        if self._head == _NONE:
+            self._tail = index
+        self._head = index
+        self._changed(self._size == 0 and index == 0)
+        self._size += 1
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list. """
+        index = self._alloc(node)
+        if self._head == _NONE:
+            self._head = index
+        else:
+            self._next[self._tail] = index
+        self._tail = index
+        self._changed(self._contiguous and index == self._size)
+        self._size += 1
+
+    def insert(self, node, after):
+        """ Inserts `node` after the element `after` refers to. """
+        after = self._index(after)
+        if after == self._tail:
+            self.append(node)
+            return
+        index = self._alloc(node)
+        self._next[index] = self._next[after]
+        self._next[after] = index
+        self._changed()
+        self._size += 1
+
+    @classmethod
+    def from_iterable(cls, iterable, strict=None, dtype=float):
+        """ Returns a new NumericLinkedList with the values from `iterable`.
+        """
+        new_list = cls(strict=strict, dtype=dtype)
+        new_list.extend(iterable)
+        return new_list
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        if isinstance(iterable, numpy.ndarray) and iterable.ndim == 1:
+            self._extend_array(iterable)
+            return
+        for value in iterable:
+            self.append(value)
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the list. """
+        for value in iterable:
+            self.prepend(value)
+
+    def insert_many(self, values, after):
+        """ Inserts each value in `values` in order after `after`. """
+        after = self._node(self._index(after))
+        for value in values:
+            self.insert(value, after)
+            after = after.next
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def pop(self):
+        """ Returns a Node with the data from the head, and removes it. """
+        index = self._head
+        if index == _NONE:
+            raise AttributeError("The list is empty.")
+        res = Node(self._values[index].item())
+        order = None
+        if self._size > 1 and (self._contiguous or self._order is not None):
+            # The rest of the elements stay in the same order.
+            order = self._slots()[1:]
+        self._head = self._next[index]
+        if self._head == _NONE:
+            self._tail = _NONE
+        self._release(index)
+        self._size -= 1
+        self._changed(not self._size)
+        self._order = order
+        return res
+
+    def remove(self, node):
+        """ Remove the specified `node`.
+
+        If `node` is a NumericNode its element is removed, otherwise the
+        first element with the same `data` is removed.
+        """
+        curr, prev = self._find(node)
+        nxt = self._next
+        if prev == _NONE:
+            self._head = nxt[curr]
+        else:
+            nxt[prev] = nxt[curr]
+        if curr == self._tail:
+            self._tail = prev
+        self._release(curr)
+        self._changed()
+        self._size -= 1
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified element.
+
+        If `node` is a NumericNode the element it refers to will match,
+        otherwise the first element equal to `node` will match. The values
+        are compared in one NumPy operation.
+
+        If `inc_prev` is `True`, this method returns the handle and the
+        handle of the previous element in a tuple, otherwise it returns
+        the handle. A `ValueError` is raised if there is no match.
+        """
+        curr, prev = self._find(node)
+        if inc_prev:
+            return (self._node(curr), self._node(prev))
+        return self._node(curr)
+
+    def _find(self, node):
+        """ Returns the indexes of the matching element and the previous one.
+
+        The order of the elements is only needed if more than one matches.
+        """
+        if isinstance(node, NumericNode):
+            return self._with_prev(self._index(node))
+        if isinstance(node, Node):
+            node = node.data
+        used = len(self._next)
+        matches = numpy.flatnonzero((self._values[:used] == node)
+                & self._live[:used])
+        if len(matches) == 1:
+            return self._with_prev(int(matches[0]))
+        if not len(matches):
+            raise ValueError("Node %s could not be found." % (node,))
+        slots = self._slots()
+        position = numpy.flatnonzero(self._values[slots] == node)[0]
+        prev = int(slots[position - 1]) if position else _NONE
+        return int(slots[position]), prev
+
+    def _with_prev(self, index):
+        """ Returns `index` and the index of the element before it.
+
+        Only an element links to another element, so the previous one is
+        found by comparing all of the links at once.
+        """
+        if index == self._head:
+            return index, _NONE
+        links = numpy.frombuffer(self._next, dtype=numpy.int64)
+        prev = int(numpy.flatnonzero(links == index)[0])
+        del links
+        return index, prev
+
+    def __contains__(self, node):
+        """ Returns `True` if `node` is in this NumericLinkedList. """
+        try:
+            self._find(node)
+        except ValueError:
+            return False
+        return True
+
+    def map(self, func):
+        """ Returns a new NumericLinkedList of `func(values)`.
+
+        `func` is called once with an array of the values in list order,
+        and must return an array of the same length, e.g.
+        `lnkd_list.map(lambda values: values * 2)`.
+        """
+        result = numpy.asarray(func(self.values()))
+        if result.shape != (self._size,):
+            raise ValueError("The function must return %d values." \
+                    % (self._size,))
+        return self.from_numpy(result, strict=self.strict)
+
+    def filter(self, predicate):
+        """ Returns a new NumericLinkedList of the values for which
+        `predicate` is `True`.
+
+        `predicate` is called once with an array of the values in list
+        order and returns an array of booleans, e.g.
+        `lnkd_list.filter(lambda values: values > 0)`.
+        """
+        values = self.values()
+        return self.from_numpy(values[self._mask(predicate, values)],
+                strict=self.strict)
+
+    def remove_if(self, predicate):
+        """ Removes the values for which `predicate` is `True`.
+
+        `predicate` is called with an array of the values, as in `filter`.
+        The remaining elements are relinked in one NumPy operation.
+        Returns the number of elements removed.
+        """
+        slots = self._slots()
+        mask = self._mask(predicate, self._values[slots])
+        removed = slots[mask]
+        if not len(removed):
+            return 0
+
+        kept = slots[~mask]
+        self._link(kept)
+        # Put the removed slots on the free list, and invalidate handles.
+        gens = numpy.frombuffer(self._gen, dtype=numpy.uint32
+                if self._gen.itemsize == 4 else numpy.uint64)
+        gens[removed] += 1
+        del gens
+        links = numpy.frombuffer(self._next, dtype=numpy.int64)
+        links[removed[:-1]] = removed[1:]
+        del links
+        self._next[int(removed[-1])] = self._free
+        self._free = int(removed[0])
+
+        self._live[removed] = False
+        self._size = len(kept)
+        self._contiguous = False
+        self._order = kept
+        return len(removed)
+
+    def _mask(self, predicate, values):
+        """ Returns the boolean array `predicate` returns for `values`. """
+        mask = numpy.asarray(predicate(values), dtype=bool)
+        if mask.shape != values.shape:
+            raise ValueError("The predicate must return %d booleans." \
+                    % (len(values),))
+        return mask
+
+    def _live_values(self):
+        """ Returns an array of the values in any order. """
+        if self._contiguous:
+            return self._values[:self._size]
+        used = len(self._next)
+        return self._values[:used][self._live[:used]]
+
+    def sum(self):
+        """ Returns the sum of the values. """
+        return self._live_values().sum().item()
+
+    def min(self):
+        """ Returns the smallest value.
+
+        A `ValueError` is raised if the list is empty.
+        """
+        return self._live_values().min().item()
+
+    def max(self):
+        """ Returns the largest value.
+
+        A `ValueError` is raised if the list is empty.
+        """
+        return self._live_values().max().item()
+
+    def __iter__(self):
+        """ Returns an iterator over the values, as Python numbers. """
+        slots = self._slots()
+        values = self._values
+        for start in range(0, len(slots), _CHUNK):
+            for value in values[slots[start:start + _CHUNK]].tolist():
+                yield value
+
+    def reverse(self):
+        """ Reverses the order of the elements in place. """
+        slots = self._slots()[::-1].copy()
+        self._link(slots)
+        self._contiguous = False
+        self._order = slots
+
+    def reversed_copy(self):
+        """ Returns a new NumericLinkedList with the elements in reverse
+        order.
+        """
+        return self.from_numpy(self.values()[::-1], strict=self.strict)
+
+    def reverse_iterative(self):
+        """ Returns a new NumericLinkedList with the elements in reverse
+        order.
+        """
+        return self.reversed_copy()
+
+    def reverse_recursive(self):
+        """ Returns a new NumericLinkedList with the elements in reverse
+        order.
+
+        The values are reversed by NumPy, so there is no recursion.
+        """
+        return self.reversed_copy()
+
+    def as_list(self):
+        """ Returns this list as a `list` of NumericNodes. """
+        return [NumericNode(self, slot) for slot in self._slots().tolist()]
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the values to the text file `fp`, as LinkedList.write_to.
+        """
+        _write(self, fp, sep, chunk_size)
+
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new NumericLinkedList with the lines of the text file
+        `fp`, as LinkedList.read_from.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns the `repr` of the list, as LinkedList.__repr__. """
+        return _repr(self.__class__.__name__, self, self._size)
@@ -0,0 +1,142 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" Map, filter and reduce the data of a LinkedList in a process pool.
+
+The values are sent to the worker processes in chunks, taken from the
+list as it is traversed. Only a few chunks are in flight at a time, so
+the list is never pickled as a whole, and the results are added to the
+new list in order as they come back. Lists shorter than `threshold` are
+processed in this process, as starting the work in a pool would cost
+more than it saves.
+
+The functions are pickled to be sent to the workers, so they must be
+defined at the top level of a module, as must the values.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import islice
+
+# The number of chunks sent to the pool for each worker before waiting
+# for the first one to finish.
+_AHEAD = 2
+
+# The default `initial` of `parallel_reduce`, as `None` is a valid value.
+_MISSING = object()
+
+
+def _chunks(values, chunk_size):
+    """ Returns an iterator over `list`s of `chunk_size` values. """
+    values = iter(values)
+    while True:
+        chunk = list(islice(values, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_chunk(func, chunk):
+    return [func(value) for value in chunk]
+
+
+def _filter_chunk(predicate, chunk):
+    # The positions of the values to keep are sent back, rather than the
+    # values themselves.
+    return [i for i, value in enumerate(chunk) if predicate(value)]
+
+
+def _reduce_chunk(func, chunk):
+    return reduce(func, chunk)
+
+
+def _run(work, func, lnkd_list, workers, chunk_size, executor):
+    """ Returns an iterator over the chunks of `lnkd_list` and the result
+    of `work(func, chunk)` for each, in order.
+
+    The chunks are run on `executor`, or on a new pool of `workers`
+    processes that is shut down afterwards.
+    """
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    window = _AHEAD * (workers or os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for chunk in _chunks(lnkd_list, chunk_size):
+            pending.append((chunk, pool.submit(work, func, chunk)))
+            if len(pending) >= window:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+    finally:
+        for chunk, future in pending:
+            future.cancel()
+        if executor is None:
+            pool.shutdown()
+
+
+def _serial(lnkd_list, workers, threshold):
+    """ Returns `True` if the work should be done in this process. """
+    return len(lnkd_list) < threshold or workers == 1
+
+
+def parallel_map(lnkd_list, func, workers=None, chunk_size=1024,
+        threshold=10000, executor=None):
+    """ Returns a new LinkedList of `func(data)` for each Node.
+
+    `workers` is the number of processes, which defaults to the number of
+    CPUs, and `chunk_size` the number of values sent to a process at a
+    time. A `concurrent.futures` `executor` can be given to use instead of
+    a new pool. If the list has fewer than `threshold` Nodes, or there is
+    one worker, the values are mapped in this process.
+    """
+    new_list = lnkd_list._copy()
+    if _serial(lnkd_list, workers, threshold):
+        new_list.extend(func(value) for value in lnkd_list)
+        return new_list
+    for chunk, results in _run(_map_chunk, func, lnkd_list, workers,
+            chunk_size, executor):
+        new_list.extend(results)
+    return new_list
+
+
+def parallel_filter(lnkd_list, predicate, workers=None, chunk_size=1024,
+        threshold=10000, executor=None):
+    """ Returns a new LinkedList of the `data` for which `predicate` is
+    `True`.
+
+    The arguments are as for `parallel_map`. Only the positions of the
+    values to keep are sent back from the workers.
+    """
+    new_list = lnkd_list._copy()
+    if _serial(lnkd_list, workers, threshold):
+        new_list.extend(value for value in lnkd_list if predicate(value))
+        return new_list
+    for chunk, kept in _run(_filter_chunk, predicate, lnkd_list, workers,
+            chunk_size, executor):
+        new_list.extend(chunk[i] for i in kept)
+    return new_list
+
+
+def parallel_reduce(lnkd_list, func, initial=_MISSING, workers=None,
+        chunk_size=1024, threshold=10000, executor=None):
+    """ Returns the `data` of the Nodes combined with `func`, like
+    `functools.reduce`.
+
+    Each chunk is reduced by a worker, and the results of the chunks are
+    reduced in this process, starting from `initial` if it is given, so
+    `func` must be associative. The other arguments are as for
+    `parallel_map`.
+    """
+    initial = () if initial is _MISSING else (initial,)
+    if _serial(lnkd_list, workers, threshold):
+        return reduce(func, lnkd_list, *initial)
+    results = (result for chunk, result in _run(_reduce_chunk, func,
+            lnkd_list, workers, chunk_size, executor))
+    return reduce(func, results, *initial)
@@ -0,0 +1,485 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" An immutable LinkedList whose versions share their Nodes. """
+
+from amzlist import LinkedList
+from amzlist import Node
+
+
+class PersistentNode(object):
+    """ An immutable Node of a PersistentLinkedList.
+
+    A PersistentNode has the `data` and `next` attributes of a Node, but
+    they can't be changed, as the Node may be shared by many versions of
+    a list.
+    """
+    __slots__ = ("data", "next")
+
+    def __init__(self, data, next=None):
+        """ Initialize a new PersistentNode linked to `next`. """
+        _set_data(self, data)
+        _set_next(self, next)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("A PersistentNode can't be modified.")
+
+    def __str__(self):
+        """ Returns the string representation e.g. A->None, or A->B. """
+        next = self.next.data if self.next else "None"
+        return "%s->%s" % (self.data, next)
+
+# The slot descriptors are used to set up PersistentNodes, and to link the
+# Nodes a TransientLinkedList has created and not yet shared.
+_set_data = PersistentNode.data.__set__
+_set_next = PersistentNode.next.__set__
+
+
+def _value(node):
+    """ Returns the `data` of `node` if it is a Node, or `node` otherwise. """
+    if isinstance(node, (Node, PersistentNode)):
+        return node.data
+    return node
+
+
+class PersistentLinkedList(object):
+    """ An immutable LinkedList.
+
+    The methods that would modify a LinkedList return a new version of
+    the list instead, and the versions share as many Nodes as they can.
+    `prepend` and `pop` take `O(1)` time and don't copy anything, so a
+    version can be kept as a snapshot for free and iterated while new
+    versions are made from it, without locking. `append`, `insert` and
+    `remove` copy the Nodes before the change and share the rest.
+
+    Use `transient` to make a number of changes without creating a
+    version for each one.
+    """
+
+    def __init__(self, strict=None):
+        """ Initialize a new, empty PersistentLinkedList.
+
+        PersistentNodes can't be modified, so a cycle can't be created and
+        `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+
+        super(PersistentLinkedList, self).__init__()
+        self.first_node = None
+        self._last_node = None
+        self._size = 0
+
+    @classmethod
+    def _new(cls, first, last, size, strict=False):
+        """ Returns a version of the list made of the given Nodes. """
+        new_list = cls(strict=strict)
+        new_list.first_node = first
+        new_list._last_node = last
+        new_list._size = size
+        return new_list
+
+    @classmethod
+    def from_iterable(cls, iterable, strict=None):
+        """ Returns a new PersistentLinkedList with the values from
+        `iterable`, which may be a LinkedList.
+        """
+        builder = TransientLinkedList(cls(strict=strict))
+        builder.extend(iterable)
+        return builder.persistent()
+
+    def to_linked_list(self, **kwargs):
+        """ Returns a new, mutable LinkedList with the values of this list.
+
+        The keyword arguments are passed to the LinkedList.
+        """
+        return LinkedList.from_iterable(self, **kwargs)
+
+    def transient(self):
+        """ Returns a TransientLinkedList to make changes to this list. """
+        return TransientLinkedList(self)
+
+    @property
+    def last_node(self):
+        """ Returns the last PersistentNode. """
+        return self._last_node
+
+    @property
+    def next(self):
+        """ Returns the `next` PersistentNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first PersistentNode. """
+        return self.first_node.data
+
+    def prepend(self, node):
+        """ Returns a new version with `node` at the head.
+
+        The new version shares all the Nodes of this one.
+        """
+        first = PersistentNode(_value(node), self.first_node)
+        last = self._last_node if self._size else first
+        return self._new(first, last, self._size + 1, self.strict)
+
+    def push(self, node):
+        """ Returns a new version with `node` at the head. """
+        return self.prepend(node)
+
+    def pop(self):
+        """ Returns the version without the first Node.
+
+        The first Node can be read from `first_node` or `data`. The new
+        version is the rest of this one, so nothing is copied.
+        """
+        if self.first_node is None:
+            raise AttributeError("The list is empty.")
+        if self._size == 1:
+            return self._new(None, None, 0, self.strict)
+        return self._new(self.first_node.next, self._last_node,
+                self._size - 1, self.strict)
+
+    def append(self, node):
+        """ Returns a new version with `node` at the tail.
+
+        Every Node of this version is copied.
+        """
+        builder = self.transient()
+        builder.append(node)
+        return builder.persistent()
+
+    def extend(self, iterable):
+        """ Returns a new version with the values of `iterable` appended.
+        """
+        builder = self.transient()
+        builder.extend(iterable)
+        return builder.persistent()
+
+    def extendleft(self, iterable):
+        """ Returns a new version with each value of `iterable` prepended.
+
+        The new version shares all the Nodes of this one.
+        """
+        builder = self.transient()
+        builder.extendleft(iterable)
+        return builder.persistent()
+
+    def insert(self, node, after):
+        """ Returns a new version with `node` after the Node `after`.
+
+        The Nodes up to `after` are copied and the rest are shared.
+        """
+        if not isinstance(after, PersistentNode):
+            raise TypeError("After must be a PersistentNode not a %s" \
+                    % (type(after)))
+        builder = self.transient()
+        builder._insert_at(self._position(after) + 1, node)
+        return builder.persistent()
+
+    def remove(self, node):
+        """ Returns a new version without the specified `node`.
+
+        If `node` is a PersistentNode of this version it is removed,
+        otherwise the first Node with the same `data` is removed. The
+        Nodes before it are copied and the rest are shared.
+        """
+        builder = self.transient()
+        builder._remove_at(self._position(node))
+        return builder.persistent()
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified PersistentNode.
+
+        If `node` is a PersistentNode it will match itself, otherwise the
+        first Node with the same `data` will match.
+
+        If `inc_prev` is `True`, this method returns the Node and the
+        previous Node in a tuple, otherwise it returns the Node. A
+        `ValueError` is raised if there is no match.
+        """
+        prev = None
+        curr = self.first_node
+        while curr is not None and not self._matches(curr, node):
+            prev = curr
+            curr = curr.next
+        if curr is None:
+            raise ValueError("Node %s could not be found." % (_value(node),))
+        if inc_prev:
+            return (curr, prev)
+        return curr
+
+    def _matches(self, curr, node):
+        if isinstance(node, PersistentNode):
+            return curr is node
+        return curr.data == _value(node)
+
+    def _position(self, node):
+        """ Returns the position of the Node that `find` would return. """
+        position = 0
+        curr = self.first_node
+        while curr is not None and not self._matches(curr, node):
+            position += 1
+            curr = curr.next
+        if curr is None:
+            raise ValueError("Node %s could not be found." % (_value(node),))
+        return position
+
+    def __contains__(self, node):
+        """ Returns `True` if `node` is in this PersistentLinkedList. """
+        try:
+            self._position(node)
+        except ValueError:
+            return False
+        return True
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each Node. """
+        node = self.first_node
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def iter_nodes(self):
+        """ Returns an iterator over the PersistentNodes of this list. """
+        node = self.first_node
+        while node is not None:
+            yield node
+            node = node.next
+
+    def reverse(self):
+        """ Returns a new version with the data in reverse order. """
+        return self.reverse_iterative()
+
+    def reversed_copy(self):
+        """ Returns a new version with the data in reverse order. """
+        return self.reverse_iterative()
+
+    def reverse_iterative(self):
+        """ Returns a new version with the data in reverse order.
+
+        This method uses an iterative approach.
+        """
+        return self._new(None, None, 0, self.strict).extendleft(self)
+
+    def reverse_recursive(self):
+        """ Returns a new version with the data in reverse order.
+
+        This method uses a recursive approach, which halves the Nodes at
+        each level so the depth of recursion is logarithmic.
+        """
+        builder = TransientLinkedList(self._new(None, None, 0, self.strict))
+
+        def prepend_from(node, count):
+            # Prepend the data of `count` Nodes from `node` and return the
+            # Node after them.
+            if count == 1:
+                builder.prepend(node.data)
+                return node.next
+            node = prepend_from(node, count // 2)
+            return prepend_from(node, count - count // 2)
+
+        if self._size:
+            prepend_from(self.first_node, self._size)
+        return builder.persistent()
+
+    def __reduce__(self):
+        """ Pickles the values rather than the chain of Nodes. """
+        return (_rebuild, (self.__class__, list(self), self.strict))
+
+    def as_list(self):
+        """ Returns this list as a `list` of PersistentNodes. """
+        return list(self.iter_nodes())
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(str(data) for data in self)
+
+
+def _rebuild(cls, values, strict):
+    """ Returns a PersistentLinkedList of `values`, for unpickling. """
+    return cls.from_iterable(values, strict=strict)
+
+
+class TransientLinkedList(object):
+    """ Makes a number of changes to a PersistentLinkedList at once.
+
+    The Nodes a TransientLinkedList creates are only visible to it until
+    `persistent` is called, so it modifies them in place rather than
+    copying them for each change. Nodes of the original list are copied
+    the first time they have to change, and are otherwise shared.
+
+        builder = persistent_list.transient()
+        builder.extend(values)
+        persistent_list = builder.persistent()
+    """
+
+    def __init__(self, source):
+        """ Initialize a new TransientLinkedList from the PersistentLinkedList
+        `source`.
+        """
+        super(TransientLinkedList, self).__init__()
+        self._source = source
+        self.first_node = source.first_node
+        self._last_node = source._last_node
+        self._size = source._size
+
+        # The first `_owned` Nodes were created by this builder and may be
+        # modified. `_owned_last` is the last of them.
+        self._owned = 0
+        self._owned_last = None
+
+    def _own(self, count):
+        """ Copies the shared Nodes so the first `count` are owned. """
+        prev = self._owned_last
+        curr = prev.next if prev is not None else self.first_node
+        while self._owned < count:
+            node = PersistentNode(curr.data, curr.next)
+            if prev is None:
+                self.first_node = node
+            else:
+                _set_next(prev, node)
+            if curr is self._last_node:
+                self._last_node = node
+            prev = node
+            curr = curr.next
+            self._owned += 1
+        self._owned_last = prev
+
+    def _before(self, position):
+        """ Returns the Node before `position`, once the Nodes up to it are
+        owned.
+        """
+        self._own(position)
+        if position == self._owned:
+            return self._owned_last
+        node = self.first_node
+        for _ in range(position - 1):
+            node = node.next
+        return node
+
+    def _insert_at(self, position, node):
+        """ Links `node` in at `position`, where 0 is the head. """
+        if position == 0:
+            self.prepend(node)
+            return
+        prev = self._before(position)
+        new = PersistentNode(_value(node), prev.next)
+        _set_next(prev, new)
+        if prev is self._last_node:
+            self._last_node = new
+        if prev is self._owned_last:
+            self._owned_last = new
+        self._owned += 1
+        self._size += 1
+
+    def _remove_at(self, position):
+        """ Unlinks the Node at `position`, where 0 is the head. """
+        if position == 0:
+            self.pop()
+            return
+        prev = self._before(position)
+        curr = prev.next
+        _set_next(prev, curr.next)
+        if curr is self._last_node:
+            self._last_node = prev
+        if position < self._owned:
+            # The Node was owned, so `prev` may now be the last owned.
+            self._owned -= 1
+            if curr is self._owned_last:
+                self._owned_last = prev
+        self._size -= 1
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        first = PersistentNode(_value(node), self.first_node)
+        if self.first_node is None:
+            self._last_node = first
+        if self._owned == 0:
+            self._owned_last = first
+        self.first_node = first
+        self._owned += 1
+        self._size += 1
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list.
+
+        The first append copies any shared Nodes, after which appending
+        takes `O(1)` time.
+        """
+        self._insert_at(self._size, node)
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        for value in iterable:
+            self._insert_at(self._size, value)
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the list. """
+        for value in iterable:
+            self.prepend(value)
+
+    def pop(self):
+        """ Returns a Node with the data from the head, and removes it. """
+        first = self.first_node
+        if first is None:
+            raise AttributeError("The list is empty.")
+        self.first_node = first.next
+        if self.first_node is None:
+            self._last_node = None
+        if self._owned:
+            self._owned -= 1
+            if self._owned == 0:
+                self._owned_last = None
+        self._size -= 1
+        return Node(first.data)
+
+    def remove(self, node):
+        """ Removes the first Node with the same `data` as `node`. """
+        position = 0
+        curr = self.first_node
+        value = _value(node)
+        while curr is not None and curr.data != value:
+            position += 1
+            curr = curr.next
+        if curr is None:
+            raise ValueError("Node %s could not be found." % (value,))
+        self._remove_at(position)
+
+    def persistent(self):
+        """ Returns the PersistentLinkedList with the changes made so far.
+
+        The Nodes are shared with the returned version from then on, so
+        later changes copy them again.
+        """
+        self._owned = 0
+        self._owned_last = None
+        return self._source._new(self.first_node, self._last_node,
+                self._size, self._source.strict)
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each Node. """
+        node = self.first_node
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(str(data) for data in self)
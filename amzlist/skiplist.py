@@ -0,0 +1,204 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from random import random
+
+# The probability that a Node with a lane on one level also has a lane on
+# the level above it.
+_PROMOTE = 0.25
+
+# The most levels of lanes.
+_MAX_LEVELS = 32
+
+
+class Lane(object):
+    """ A Lane is a link between two Nodes that skips the Nodes in between.
+
+    `span` is the number of positions from `node` to `right.node`. If
+    `right` is `None` the span is to the position after the last Node.
+    `down` is the Lane for the same Node on the level below.
+    """
+    __slots__ = ("node", "right", "down", "span")
+
+    def __init__(self, node, right, down, span):
+        """ Initialize a new Lane. """
+        self.node = node
+        self.right = right
+        self.down = down
+        self.span = span
+
+
+class SkipIndex(object):
+    """ An indexable skip list over the Nodes of a LinkedList.
+
+    The lanes are kept in addition to the `next` references of the Nodes.
+    Each Node has a lane on the first level with a probability of
+    `_PROMOTE`, and on each level above with the same probability. The
+    span of each lane lets the position of a Node be found, and the Node
+    at a position be found, in `O(log n)` expected time.
+
+    Lanes are found by the order labels of the Nodes, so a Node that has
+    been linked into the list can be added before its position is known.
+    """
+
+    def __init__(self):
+        """ Initialize a new SkipIndex. """
+        # The head lane of each level, from the first level up. The head
+        # lanes are at position -1, before the first Node.
+        self.heads = []
+        self.size = 0
+
+        # Whether the lanes match the list. After the list is rearranged
+        # the lanes are rebuilt the next time they are needed.
+        self.valid = True
+
+    def _levels(self):
+        """ Returns a random number of levels for a new Node. """
+        levels = 0
+        while levels < _MAX_LEVELS and random() < _PROMOTE:
+            levels += 1
+        return levels
+
+    def _path(self, node):
+        """ Returns the last lane before `node` on each level.
+
+        The lanes and their positions are returned from the first level up.
+        """
+        lanes = [None] * len(self.heads)
+        positions = [None] * len(self.heads)
+        if not self.heads:
+            return lanes, positions
+
+        label = node._label
+        lane = self.heads[-1]
+        pos = -1
+        for level in range(len(self.heads) - 1, -1, -1):
+            while lane.right is not None and lane.right.node._label < label:
+                pos += lane.span
+                lane = lane.right
+            lanes[level] = lane
+            positions[level] = pos
+            lane = lane.down
+        return lanes, positions
+
+    def _walk(self, first_node, lane, pos, node):
+        """ Returns the position of `node`, walking from `lane` at `pos`. """
+        if lane is None or lane.node is None:
+            # Walk from the head of the list.
+            curr = first_node
+            pos = 0
+        else:
+            curr = lane.node
+        while curr is not node:
+            curr = curr.next
+            pos += 1
+        return pos
+
+    def rank(self, first_node, node):
+        """ Returns the position of `node`, which is in the list. """
+        lanes, positions = self._path(node)
+        if lanes and lanes[0].right is not None \
+                and lanes[0].right.node is node:
+            return positions[0] + lanes[0].span
+        if lanes:
+            return self._walk(first_node, lanes[0], positions[0], node)
+        return self._walk(first_node, None, -1, node)
+
+    def locate(self, first_node, index):
+        """ Returns the Node at position `index`. """
+        lane = None
+        pos = -1
+        if self.heads:
+            lane = self.heads[-1]
+            for level in range(len(self.heads) - 1, -1, -1):
+                while lane.right is not None and pos + lane.span <= index:
+                    pos += lane.span
+                    lane = lane.right
+                if level:
+                    lane = lane.down
+
+        if lane is None or lane.node is None:
+            node = first_node
+            pos = 0
+        else:
+            node = lane.node
+        while pos < index:
+            node = node.next
+            pos += 1
+        return node
+
+    def insert(self, first_node, node):
+        """ Adds lanes for `node`, which has just been linked into the list.
+        """
+        levels = self._levels()
+        while len(self.heads) < levels:
+            # Add a level, its head lane spans the whole list.
+            down = self.heads[-1] if self.heads else None
+            self.heads.append(Lane(None, None, down, self.size + 1))
+
+        lanes, positions = self._path(node)
+        if levels:
+            rank = self._walk(first_node, lanes[0], positions[0], node)
+        down = None
+        for level, lane in enumerate(lanes):
+            if level < levels:
+                # The new lane takes over the rest of the span.
+                pos = positions[level]
+                new = Lane(node, lane.right, down, pos + lane.span + 1 - rank)
+                lane.right = new
+                lane.span = rank - pos
+                down = new
+            else:
+                lane.span += 1
+        self.size += 1
+
+    def remove(self, node):
+        """ Removes the lanes for `node`, before it is unlinked. """
+        lanes, _ = self._path(node)
+        for lane in lanes:
+            if lane.right is not None and lane.right.node is node:
+                lane.span += lane.right.span - 1
+                lane.right = lane.right.right
+            else:
+                lane.span -= 1
+        while self.heads and self.heads[-1].right is None:
+            # Drop levels that no longer have any lanes.
+            self.heads.pop()
+        self.size -= 1
+
+    def rebuild(self, first_node, size):
+        """ Rebuilds the lanes for the Nodes from `first_node`. """
+        self.heads = []
+        self.size = size
+        self.valid = True
+
+        # The last lane on each level and its position.
+        lasts = []
+        positions = []
+        pos = 0
+        node = first_node
+        while node is not None:
+            levels = self._levels()
+            while len(lasts) < levels:
+                down = self.heads[-1] if self.heads else None
+                head = Lane(None, None, down, 0)
+                self.heads.append(head)
+                lasts.append(head)
+                positions.append(-1)
+            down = None
+            for level in range(levels):
+                new = Lane(node, None, down, 0)
+                lasts[level].right = new
+                lasts[level].span = pos - positions[level]
+                lasts[level] = new
+                positions[level] = pos
+                down = new
+            pos += 1
+            node = node.next
+
+        for level, lane in enumerate(lasts):
+            # The last lane on each level spans to the end of the list.
+            lane.span = size - positions[level]
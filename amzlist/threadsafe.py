@@ -0,0 +1,312 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from threading import Lock
+
+from amzlist import Node
+from amzlist import _read
+from amzlist import _repr
+from amzlist import _set_next
+from amzlist import _texts
+from amzlist import _write
+
+
+class LockedNode(Node):
+    """ A Node of a ConcurrentLinkedList, with a lock of its own.
+
+    The lock is held while the `next` attribute of the Node is changed.
+    `_removed` is set, with the lock held, when the Node is removed from
+    its list.
+    """
+    __slots__ = ("_lock", "_removed")
+
+    def __init__(self, data):
+        """ Initialize a new LockedNode with the specified data. """
+        super(LockedNode, self).__init__(data)
+        _set_lock(self, Lock())
+        _set_removed(self, False)
+
+_set_lock = LockedNode._lock.__set__
+_set_removed = LockedNode._removed.__set__
+
+
+class ConcurrentLinkedList(object):
+    """ A LinkedList that can be shared by threads.
+
+    The list starts with a sentinel LockedNode. `push` and `pop` lock the
+    sentinel, and `append` locks the last Node and the tail lock, so the
+    two ends can be used at the same time (as in a two-lock queue).
+    `insert`, `remove` and `find` lock the Nodes hand over hand, holding
+    at most two Node locks at a time, so threads working on different
+    parts of the list don't wait for each other.
+
+    Locks are taken in list order, and the tail lock last, so the
+    operations can't deadlock. Iterating doesn't hold any locks between
+    Nodes; an iterator sees the Nodes that are in the list as it passes
+    them.
+
+    The Nodes must only be linked through the list, `next` must not be
+    assigned directly.
+    """
+
+    def __init__(self, strict=None):
+        """ Initialize a new ConcurrentLinkedList.
+
+        The Nodes can only be linked through the list, which can't create
+        a cycle, so `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+
+        super(ConcurrentLinkedList, self).__init__()
+        self._head = LockedNode(None)
+        self._tail = self._head
+        self._tail_lock = Lock()
+        self._size = 0
+        self._size_lock = Lock()
+
+    def _new_node(self, node):
+        """ Returns a new LockedNode with the data of `node`. """
+        if isinstance(node, Node):
+            node = node.data
+        return LockedNode(node)
+
+    def _resize(self, delta):
+        """ Adds `delta` to the size of the list. """
+        with self._size_lock:
+            self._size += delta
+
+    @property
+    def first_node(self):
+        """ Returns the first LockedNode. """
+        return self._head.next
+
+    @property
+    def last_node(self):
+        """ Returns the last LockedNode. """
+        tail = self._tail
+        return None if tail is self._head else tail
+
+    @property
+    def next(self):
+        """ Returns the `next` LockedNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first LockedNode. """
+        return self.first_node.data
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        node = self._new_node(node)
+        head = self._head
+        with head._lock:
+            _set_next(node, head.next)
+            if node.next is None:
+                with self._tail_lock:
+                    _set_next(head, node)
+                    self._tail = node
+            else:
+                _set_next(head, node)
+        self._resize(1)
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list. """
+        node = self._new_node(node)
+        while True:
+            # The tail may change before it is locked, in which case lock
+            # the new tail instead.
+            tail = self._tail
+            with tail._lock:
+                with self._tail_lock:
+                    if self._tail is tail:
+                        _set_next(tail, node)
+                        self._tail = node
+                        break
+        self._resize(1)
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        for value in iterable:
+            self.append(value)
+
+    def pop(self):
+        """ Removes the first LockedNode and returns it. """
+        head = self._head
+        with head._lock:
+            first = head.next
+            if first is None:
+                raise AttributeError("The list is empty.")
+            with first._lock:
+                self._unlink(head, first)
+        self._resize(-1)
+        return first
+
+    def insert(self, node, after):
+        """ Inserts `node` after the LockedNode `after`.
+
+        A `ValueError` is raised if `after` has been removed.
+        """
+        if not isinstance(after, LockedNode):
+            raise TypeError("After must be a LockedNode not a %s" \
+                    % (type(after)))
+        node = self._new_node(node)
+        with after._lock:
+            if after._removed:
+                raise ValueError("Node %s is not in the list." % (after.data,))
+            _set_next(node, after.next)
+            if node.next is None:
+                with self._tail_lock:
+                    _set_next(after, node)
+                    self._tail = node
+            else:
+                _set_next(after, node)
+        self._resize(1)
+
+    def _unlink(self, prev, curr):
+        """ Unlinks `curr` from after `prev`, with both of them locked.
+
+        `curr` keeps its `next` reference, so iterators that are at `curr`
+        can carry on.
+        """
+        if curr.next is None:
+            with self._tail_lock:
+                _set_next(prev, None)
+                self._tail = prev
+        else:
+            _set_next(prev, curr.next)
+        _set_removed(curr, True)
+
+    def _search(self, node):
+        """ Locks the matching LockedNode and the one before it.
+
+        If `node` is a LockedNode the same Node will match, otherwise the
+        first Node with the same `data` will match. The two Nodes are
+        returned, locked, or `None` if there is no match.
+        """
+        locked = isinstance(node, LockedNode)
+        if not locked and isinstance(node, Node):
+            node = node.data
+        prev = self._head
+        prev._lock.acquire()
+        curr = prev.next
+        while curr is not None:
+            curr._lock.acquire()
+            try:
+                match = curr is node if locked else bool(curr.data == node)
+            except BaseException:
+                # Don't leave the list locked if the comparison fails.
+                curr._lock.release()
+                prev._lock.release()
+                raise
+            if match:
+                return prev, curr
+            # Hand over hand, release the lock on the Node behind.
+            prev._lock.release()
+            prev = curr
+            curr = curr.next
+        prev._lock.release()
+        return None
+
+    def remove(self, node):
+        """ Remove the specified `node`.
+
+        If `node` is a LockedNode it is removed, otherwise the first Node
+        with the same `data` is removed. A `ValueError` is raised if there
+        is no match.
+        """
+        found = self._search(node)
+        if found is None:
+            raise ValueError("Node %s could not be found." % (node,))
+        prev, curr = found
+        try:
+            self._unlink(prev, curr)
+        finally:
+            curr._lock.release()
+            prev._lock.release()
+        self._resize(-1)
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified node.
+
+        If `inc_prev` is `True`, this method returns the LockedNode and the
+        one before it in a tuple, otherwise it returns the LockedNode.
+        A `ValueError` is raised if there is no match.
+        """
+        found = self._search(node)
+        if found is None:
+            raise ValueError("Node %s could not be found." % (node,))
+        prev, curr = found
+        curr._lock.release()
+        prev._lock.release()
+        if inc_prev:
+            return (curr, None if prev is self._head else prev)
+        return curr
+
+    def __contains__(self, value):
+        """ Returns `True` if a Node with the `data` `value` is in the list.
+        """
+        found = self._search(value)
+        if found is None:
+            return False
+        prev, curr = found
+        curr._lock.release()
+        prev._lock.release()
+        return True
+
+    def iter_nodes(self):
+        """ Returns an iterator over the LockedNodes. """
+        curr = self._head
+        while True:
+            with curr._lock:
+                curr = curr.next
+            if curr is None:
+                return
+            # A removed Node still refers to the Node after it, so the
+            # iterator can pass through Nodes removed behind it.
+            if not curr._removed:
+                yield curr
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each LockedNode. """
+        for node in self.iter_nodes():
+            yield node.data
+
+    def as_list(self):
+        """ Returns this list as a `list` of LockedNodes. """
+        return list(self.iter_nodes())
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the values to the text file `fp`, as LinkedList.write_to.
+        """
+        _write(self, fp, sep, chunk_size)
+
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new ConcurrentLinkedList with the lines of the text file
+        `fp`, as LinkedList.read_from.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns the `repr` of the list, as LinkedList.__repr__. """
+        return _repr(self.__class__.__name__, self, self._size)
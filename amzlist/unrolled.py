@@ -0,0 +1,524 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from weakref import ref
+
+import pickle
+
+from amzlist import Node
+from amzlist import _dump
+from amzlist import _load
+from amzlist import _read
+from amzlist import _repr
+from amzlist import _texts
+from amzlist import _write
+
+
+# The number of references to cursors a block holds before the dead ones
+# are dropped.
+_LIMIT = 8
+
+
+class _Block(object):
+    """ A link in an UnrolledLinkedList, holding up to a block of values.
+
+    `cursors` holds weak references to the UnrolledNodes that refer to
+    values in the block, so they can be moved when the values move. Once
+    it holds more than `limit` references the dead ones are dropped.
+    """
+    __slots__ = ("values", "next", "prev", "cursors", "limit")
+
+    def __init__(self, values):
+        """ Initialize a new _Block with the specified values. """
+        self.values = values
+        self.next = None
+        self.prev = None
+        self.cursors = None
+        self.limit = _LIMIT
+
+
+class UnrolledNode(object):
+    """ A cursor to an element of an UnrolledLinkedList.
+
+    An UnrolledNode has the `data` and `next` attributes of a Node. It
+    keeps referring to the same element when the element is moved to
+    another block, and using it after the element has been removed
+    raises a `ValueError`.
+    """
+    __slots__ = ("_owner", "_block", "_offset", "__weakref__")
+
+    def __init__(self, owner, block, offset):
+        """ Initialize a cursor to the value at `offset` in `block`. """
+        self._owner = owner
+        self._block = block
+        self._offset = offset
+        _register(block, self)
+
+    def _check(self):
+        """ Returns the block and offset, if the element is still in the list.
+        """
+        if self._block is None:
+            raise ValueError("The element has been removed from the list.")
+        return self._block, self._offset
+
+    @property
+    def data(self):
+        """ Returns the `data` of the element. """
+        block, offset = self._check()
+        return block.values[offset]
+
+    @data.setter
+    def data(self, value):
+        """ Updates the `data` of the element. """
+        block, offset = self._check()
+        block.values[offset] = value
+
+    @property
+    def next(self):
+        """ Returns a cursor to the next element, or `None`. """
+        block, offset = self._check()
+        if offset + 1 < len(block.values):
+            return UnrolledNode(self._owner, block, offset + 1)
+        if block.next is not None:
+            return UnrolledNode(self._owner, block.next, 0)
+        return None
+
+    def __eq__(self, other):
+        """ Cursors are equal if they refer to the same element. """
+        return isinstance(other, UnrolledNode) and self._block is not None \
+                and self._block is other._block \
+                and self._offset == other._offset
+
+    def __ne__(self, other):
+        return not self == other
+
+    # Cursors move, so they can't be hashed by the element they refer to.
+    __hash__ = None
+
+    def __str__(self):
+        """ Returns the string representation e.g. A->None, or A->B. """
+        next = self.next
+        next = next.data if next is not None else "None"
+        return "%s->%s" % (self.data, next)
+
+
+def _register(block, cursor):
+    """ Adds a reference to `cursor` to the cursors into `block`.
+
+    The dead references are dropped when there are more than twice as
+    many references as there were live cursors last time, so cursors that
+    are only read don't make the block grow.
+    """
+    if block.cursors is None:
+        block.cursors = []
+    block.cursors.append(ref(cursor))
+    if len(block.cursors) > block.limit:
+        block.limit = max(_LIMIT, 2 * len(_cursors(block)))
+
+
+def _cursors(block):
+    """ Returns the live cursors into `block`, and forgets the dead ones. """
+    if block.cursors is None:
+        return []
+    cursors = []
+    seen = set()
+    for cursor in (r() for r in block.cursors):
+        # A cursor that moved away and back again has two references.
+        if cursor is not None and cursor._block is block \
+                and id(cursor) not in seen:
+            seen.add(id(cursor))
+            cursors.append(cursor)
+    block.cursors = [ref(cursor) for cursor in cursors] if cursors else None
+    return cursors
+
+
+class UnrolledLinkedList(object):
+    """ A LinkedList that stores a block of values in each link.
+
+    Each link holds up to `block_size` values in a `list`, so iterating,
+    counting and searching touch one Python object per block rather than
+    one per element. Blocks are split when an insert overflows them, and
+    a block that removals leave at most half full is merged with the
+    previous or next block if their values fit in one.
+
+    The methods match those of LinkedList, with UnrolledNode cursors in
+    place of Nodes. Nodes passed to the list are copied by their `data`.
+    Create one with `LinkedList(backend="unrolled")`.
+    """
+
+    def __init__(self, strict=None, block_size=64):
+        """ Initialize a new UnrolledLinkedList.
+
+        The elements can only be linked through the list, which can't
+        create a cycle, so `strict` is accepted for compatibility only.
+        """
+        if strict is None:
+            strict = False
+        self.strict = strict
+        if block_size < 2:
+            raise ValueError("The block size must be at least 2.")
+        self.block_size = block_size
+
+        super(UnrolledLinkedList, self).__init__()
+        self._head = None
+        self._tail = None
+        self._size = 0
+
+    def _value(self, node):
+        """ Returns the value to store for `node`. """
+        if isinstance(node, (Node, UnrolledNode)):
+            return node.data
+        return node
+
+    def _position(self, node):
+        """ Returns the block and offset that the cursor `node` refers to. """
+        if not isinstance(node, UnrolledNode) or node._owner is not self:
+            raise TypeError("After must be an UnrolledNode of this list not " \
+                    "a %s" % (type(node)))
+        return node._check()
+
+    def _link_after(self, block, new):
+        """ Links the block `new` after `block`, or at the head. """
+        if block is None:
+            new.next = self._head
+            self._head = new
+        else:
+            new.next = block.next
+            block.next = new
+        new.prev = block
+        if new.next is None:
+            self._tail = new
+        else:
+            new.next.prev = new
+
+    def _unlink(self, block):
+        """ Unlinks the empty `block`. """
+        if block.prev is None:
+            self._head = block.next
+        else:
+            block.prev.next = block.next
+        if block.next is None:
+            self._tail = block.prev
+        else:
+            block.next.prev = block.prev
+
+    def _insert_at(self, block, offset, value):
+        """ Inserts `value` at `offset` in `block`, splitting it if full. """
+        if len(block.values) >= self.block_size:
+            # Move the second half of the values to a new block.
+            half = len(block.values) // 2
+            new = _Block(block.values[half:])
+            del block.values[half:]
+            self._link_after(block, new)
+            for cursor in _cursors(block):
+                if cursor._offset >= half:
+                    cursor._block = new
+                    cursor._offset -= half
+                    _register(new, cursor)
+            if offset > half:
+                block = new
+                offset -= half
+
+        block.values.insert(offset, value)
+        if block.cursors is not None:
+            for cursor in _cursors(block):
+                if cursor._offset >= offset:
+                    cursor._offset += 1
+        self._size += 1
+
+    def _remove_at(self, block, offset):
+        """ Removes and returns the value at `offset` in `block`. """
+        value = block.values.pop(offset)
+        if block.cursors is not None:
+            for cursor in _cursors(block):
+                if cursor._offset == offset:
+                    # The cursor's element has gone.
+                    cursor._block = None
+                elif cursor._offset > offset:
+                    cursor._offset -= 1
+        self._size -= 1
+
+        if not block.values:
+            self._unlink(block)
+        elif len(block.values) <= self.block_size // 2:
+            # Merge the block with a neighbour that it fits in with.
+            if block.prev is not None and len(block.prev.values) + \
+                    len(block.values) <= self.block_size:
+                self._merge(block.prev)
+            elif block.next is not None and len(block.values) + \
+                    len(block.next.values) <= self.block_size:
+                self._merge(block)
+        return value
+
+    def _merge(self, block):
+        """ Moves the values of the block after `block` into `block`. """
+        following = block.next
+        shift = len(block.values)
+        block.values.extend(following.values)
+        for cursor in _cursors(following):
+            cursor._block = block
+            cursor._offset += shift
+            _register(block, cursor)
+        following.values = []
+        self._unlink(following)
+
+    @property
+    def first_node(self):
+        """ Returns a cursor to the first element. """
+        if self._head is None:
+            return None
+        return UnrolledNode(self, self._head, 0)
+
+    @property
+    def last_node(self):
+        """ Returns a cursor to the last element. """
+        if self._tail is None:
+            return None
+        return UnrolledNode(self, self._tail, len(self._tail.values) - 1)
+
+    @property
+    def next(self):
+        """ Returns the `next` UnrolledNode. """
+        return self.first_node.next
+
+    @property
+    def data(self):
+        """ Returns the `data` for the first element. """
+        return self._head.values[0]
+
+    def prepend(self, node):
+        """ Inserts `node` at the head of the list. """
+        value = self._value(node)
+        if self._head is None or len(self._head.values) >= self.block_size:
+            self._link_after(None, _Block([]))
+        self._insert_at(self._head, 0, value)
+
+    def append(self, node):
+        """ Inserts `node` at the tail of the list. """
+        value = self._value(node)
+        if self._tail is None or len(self._tail.values) >= self.block_size:
+            # Start a new block rather than splitting the full one, so
+            # appended blocks are left full.
+            self._link_after(self._tail, _Block([]))
+        self._tail.values.append(value)
+        self._size += 1
+
+    def insert(self, node, after):
+        """ Inserts `node` after the element `after` refers to. """
+        block, offset = self._position(after)
+        value = self._value(node)
+        if offset + 1 == len(block.values) and block.next is not None \
+                and len(block.next.values) < self.block_size:
+            # Insert at the start of the next block rather than split.
+            self._insert_at(block.next, 0, value)
+        else:
+            self._insert_at(block, offset + 1, value)
+
+    @classmethod
+    def from_iterable(cls, iterable, **kwargs):
+        """ Returns a new UnrolledLinkedList with the values from `iterable`.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(iterable)
+        return new_list
+
+    def extend(self, iterable):
+        """ Appends each value in `iterable` to the tail of the list. """
+        for value in iterable:
+            self.append(value)
+
+    def extendleft(self, iterable):
+        """ Prepends each value in `iterable` to the head of the list. """
+        for value in iterable:
+            self.prepend(value)
+
+    def insert_many(self, values, after):
+        """ Inserts each value in `values` in order after `after`. """
+        after = UnrolledNode(self, *self._position(after))
+        for value in values:
+            self.insert(value, after)
+            after = after.next
+
+    def push(self, node):
+        """ Prepends a Node to the head. """
+        self.prepend(node)
+
+    def pop(self):
+        """ Returns a Node with the data from the head, and removes it. """
+        if self._head is None:
+            raise AttributeError("The list is empty.")
+        return Node(self._remove_at(self._head, 0))
+
+    def remove(self, node):
+        """ Remove the specified `node`.
+
+        If `node` is an UnrolledNode its element is removed, otherwise the
+        first element with the same `data` is removed.
+        """
+        block, offset = self._find(node)
+        self._remove_at(block, offset)
+
+    def find(self, node, inc_prev=None):
+        """ Find the specified element.
+
+        If `node` is an UnrolledNode the element it refers to will match,
+        otherwise the first element with the same `data` will match.
+
+        If `inc_prev` is `True`, this method returns the cursor and the
+        cursor of the previous element in a tuple, otherwise it returns
+        the cursor. A `ValueError` is raised if there is no match.
+        """
+        block, offset = self._find(node)
+        curr = UnrolledNode(self, block, offset)
+        if not inc_prev:
+            return curr
+        if offset:
+            prev = UnrolledNode(self, block, offset - 1)
+        elif block.prev is not None:
+            prev = UnrolledNode(self, block.prev, len(block.prev.values) - 1)
+        else:
+            prev = None
+        return (curr, prev)
+
+    def _find(self, node):
+        """ Returns the block and offset of the matching element. """
+        if isinstance(node, UnrolledNode):
+            return self._position(node)
+
+        value = self._value(node)
+        block = self._head
+        while block is not None:
+            # The values of a block are searched by `list.index`.
+            try:
+                return block, block.values.index(value)
+            except ValueError:
+                block = block.next
+        raise ValueError("Node %s could not be found." % (value))
+
+    def reverse(self):
+        """ Reverses the order of the elements in place. """
+        block = self._head
+        while block is not None:
+            block.values.reverse()
+            last = len(block.values) - 1
+            for cursor in _cursors(block):
+                cursor._offset = last - cursor._offset
+            block.next, block.prev = block.prev, block.next
+            block = block.prev
+        self._head, self._tail = self._tail, self._head
+
+    def reversed_copy(self):
+        """ Returns a new UnrolledLinkedList with the elements reversed. """
+        return self.reverse_iterative()
+
+    def reverse_iterative(self):
+        """ Returns a new UnrolledLinkedList with the elements reversed.
+
+        This method uses an iterative approach.
+        """
+        new_list = UnrolledLinkedList(strict=self.strict,
+                block_size=self.block_size)
+        block = self._tail
+        while block is not None:
+            for value in reversed(block.values):
+                new_list.append(value)
+            block = block.prev
+        return new_list
+
+    def reverse_recursive(self):
+        """ Returns a new UnrolledLinkedList with the elements reversed.
+
+        This method uses a recursive approach, which halves the blocks at
+        each level so the depth of recursion is logarithmic.
+        """
+        new_list = UnrolledLinkedList(strict=self.strict,
+                block_size=self.block_size)
+
+        def prepend_from(block, count):
+            # Prepend the values of `count` blocks from `block` to the new
+            # list, and return the block after them.
+            if count == 1:
+                for value in block.values:
+                    new_list.prepend(value)
+                return block.next
+            block = prepend_from(block, count // 2)
+            return prepend_from(block, count - count // 2)
+
+        count = 0
+        block = self._head
+        while block is not None:
+            count += 1
+            block = block.next
+        if count:
+            prepend_from(self._head, count)
+        return new_list
+
+    def __iter__(self):
+        """ Returns an iterator over the `data` of each element. """
+        block = self._head
+        while block is not None:
+            for value in block.values:
+                yield value
+            block = block.next
+
+    def __reduce__(self):
+        """ Pickles the list as its settings and a stream of values.
+
+        The blocks are not pickled, so pickling doesn't recurse along the
+        `next` references, and cursors aren't kept.
+        """
+        return (self.__class__, (self.strict, self.block_size), None,
+                iter(self))
+
+    def dump(self, fp, chunk_size=65536, protocol=pickle.HIGHEST_PROTOCOL):
+        """ Writes the values to the binary file `fp`, as LinkedList.dump.
+        """
+        _dump(self, self._size, fp, chunk_size, protocol)
+
+    @classmethod
+    def load(cls, fp, **kwargs):
+        """ Returns a new UnrolledLinkedList with the values from `dump`.
+        """
+        new_list = cls(**kwargs)
+        for chunk in _load(fp):
+            new_list.extend(chunk)
+        return new_list
+
+    def write_to(self, fp, sep="->", chunk_size=1024):
+        """ Writes the values to the text file `fp`, as LinkedList.write_to.
+        """
+        _write(self, fp, sep, chunk_size)
+
+    @classmethod
+    def read_from(cls, fp, parse=None, **kwargs):
+        """ Returns a new UnrolledLinkedList with the lines of the text file
+        `fp`, as LinkedList.read_from.
+        """
+        new_list = cls(**kwargs)
+        new_list.extend(_read(fp, parse))
+        return new_list
+
+    def as_list(self):
+        """ Returns this list as a `list` of UnrolledNodes. """
+        nodes = []
+        block = self._head
+        while block is not None:
+            for offset in range(len(block.values)):
+                nodes.append(UnrolledNode(self, block, offset))
+            block = block.next
+        return nodes
+
+    def __len__(self):
+        """ Returns the length/size of this list. """
+        return self._size
+
+    def __str__(self):
+        """ The string representation of the list. """
+        return "->".join(_texts(self, "->", 1024))
+
+    def __repr__(self):
+        """ Returns the `repr` of the list, as LinkedList.__repr__. """
+        return _repr(self.__class__.__name__, self, self._size)
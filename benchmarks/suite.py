@@ -0,0 +1,388 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" Measures the time and peak memory of the LinkedList operations.
+
+Each operation is run on a list of every size, in strict and non-strict
+mode, and on a `list` and a `collections.deque` for comparison. The
+results are written as JSON so two runs can be compared:
+
+    python benchmarks/suite.py run --sizes 10 1000 100000 -o before.json
+    python benchmarks/suite.py run --sizes 10 1000 100000 -o after.json
+    python benchmarks/suite.py compare before.json after.json
+
+`compare` prints the operations that got slower, or used more memory,
+by more than the threshold and exits with status 1 if there are any.
+Sizes up to 10**7 can be given, although building the larger lists takes
+a while and the memory is measured by tracemalloc, which is slow.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from amzlist import LinkedList
+
+
+OPERATIONS = ("prepend", "append", "insert", "find", "remove", "pop",
+        "reverse_iterative", "reverse_recursive", "__len__", "__str__")
+
+# The operations that take time proportional to the size of the list,
+# which are run fewer times on larger lists.
+LINEAR = ("find", "remove")
+
+# The operations that are run once on the whole list.
+WHOLE = ("reverse_iterative", "reverse_recursive", "__str__")
+
+
+class Target(object):
+    """ A structure to measure, with a function for each operation.
+
+    Each function is called with the structure, its size and a `range`
+    of values, and performs the operation once for each value. If the
+    structure holds resources, `dispose` is called with it once it has
+    been measured.
+    """
+
+    def __init__(self, name, build, operations, strict=None, backend=None,
+            dispose=None):
+        self.name = name
+        self.build = build
+        self.operations = operations
+        self.strict = strict
+        self.backend = backend
+        self.dispose = dispose
+
+
+def linked_list_target(strict, backend=None):
+    """ Returns the Target for a LinkedList. """
+
+    def build(size):
+        kwargs = {"backend": backend} if backend else {}
+        if backend == "mapped":
+            # Each list gets its own files, which `dispose` removes.
+            kwargs["path"] = os.path.join(tempfile.mkdtemp(), "list")
+        return LinkedList.from_iterable(range(size), strict=strict,
+                **kwargs)
+
+    def dispose(lnkd_list):
+        lnkd_list.close()
+        shutil.rmtree(os.path.dirname(lnkd_list.path))
+
+    def prepend(lnkd_list, size, values):
+        for value in values:
+            lnkd_list.prepend(value)
+
+    def append(lnkd_list, size, values):
+        for value in values:
+            lnkd_list.append(value)
+
+    def insert(lnkd_list, size, values):
+        after = lnkd_list.find(size // 2)
+        for value in values:
+            lnkd_list.insert(value, after)
+
+    def find(lnkd_list, size, values):
+        for value in values:
+            lnkd_list.find(size // 2 + value)
+
+    def remove(lnkd_list, size, values):
+        for value in values:
+            lnkd_list.remove(size // 2 + value)
+
+    def pop(lnkd_list, size, values):
+        for value in values:
+            lnkd_list.pop()
+
+    def length(lnkd_list, size, values):
+        for value in values:
+            len(lnkd_list)
+
+    operations = {
+        "prepend": prepend,
+        "append": append,
+        "insert": insert,
+        "find": find,
+        "remove": remove,
+        "pop": pop,
+        "reverse_iterative": lambda l, size, values: l.reverse_iterative(),
+        "reverse_recursive": lambda l, size, values: l.reverse_recursive(),
+        "__len__": length,
+        "__str__": lambda l, size, values: str(l),
+    }
+    if backend == "mapped":
+        # A MappedLinkedList is reversed in place, it has no copies to
+        # return.
+        del operations["reverse_iterative"], operations["reverse_recursive"]
+    name = "LinkedList"
+    if backend:
+        name += "[%s]" % backend
+    if strict:
+        name += "(strict)"
+    return Target(name, build, operations, strict=strict, backend=backend,
+            dispose=dispose if backend == "mapped" else None)
+
+
+def sequence_target(name, kind):
+    """ Returns the Target for a `list` or a `deque`.
+
+    The nearest equivalent of each operation is used, `insert` inserts in
+    the middle and `pop` removes the first value.
+    """
+    def build(size):
+        return kind(range(size))
+
+    def prepend_values(seq, size, values):
+        if kind is deque:
+            for value in values:
+                seq.appendleft(value)
+        else:
+            for value in values:
+                seq.insert(0, value)
+
+    def append(seq, size, values):
+        for value in values:
+            seq.append(value)
+
+    def insert(seq, size, values):
+        for value in values:
+            seq.insert(size // 2, value)
+
+    def find(seq, size, values):
+        for value in values:
+            seq.index(size // 2 + value)
+
+    def remove(seq, size, values):
+        for value in values:
+            seq.remove(size // 2 + value)
+
+    def pop(seq, size, values):
+        pop_first = seq.popleft if kind is deque else lambda: seq.pop(0)
+        for value in values:
+            pop_first()
+
+    def length(seq, size, values):
+        for value in values:
+            len(seq)
+
+    operations = {
+        "prepend": prepend_values,
+        "append": append,
+        "insert": insert,
+        "find": find,
+        "remove": remove,
+        "pop": pop,
+        "reverse_iterative": lambda s, size, values: kind(reversed(s)),
+        "reverse_recursive": lambda s, size, values: s[::-1]
+                if kind is list else kind(reversed(s)),
+        "__len__": length,
+        "__str__": lambda s, size, values: "->".join(map(str, s)),
+    }
+    return Target(name, build, operations)
+
+
+def count_for(operation, size, ops, budget):
+    """ Returns how many times `operation` is run on a list of `size`. """
+    if operation in WHOLE:
+        return 1
+    if operation in LINEAR:
+        # Half the list from the middle can be found or removed.
+        return max(1, min(ops, budget // max(size, 1), size - size // 2))
+    if operation == "pop":
+        return max(1, min(ops, size))
+    return ops
+
+
+def measure(target, operation, size, args):
+    """ Returns the result of running `operation` on `target`. """
+    run = target.operations[operation]
+    values = range(count_for(operation, size, args.ops, args.budget))
+
+    # The structure is built again for each repeat, as most of the
+    # operations change it.
+    best = None
+    for repeat in range(args.repeat):
+        structure = target.build(size)
+        try:
+            start = time.perf_counter()
+            run(structure, size, values)
+            elapsed = time.perf_counter() - start
+        finally:
+            if target.dispose is not None:
+                target.dispose(structure)
+        best = elapsed if best is None else min(best, elapsed)
+        del structure
+
+    structure = target.build(size)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        run(structure, size, values)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+        if target.dispose is not None:
+            target.dispose(structure)
+
+    return {
+        "operation": operation,
+        "target": target.name,
+        "strict": target.strict,
+        "backend": target.backend,
+        "size": size,
+        "count": len(values),
+        "seconds": best,
+        "per_op": best / len(values),
+        "peak_bytes": peak,
+    }
+
+
+def targets_for(args):
+    """ Returns the Targets selected by the command line. """
+    targets = []
+    for backend in args.backends:
+        backend = None if backend == "node" else backend
+        for strict in (False, True):
+            targets.append(linked_list_target(strict, backend))
+    if not args.no_baselines:
+        targets.append(sequence_target("list", list))
+        targets.append(sequence_target("deque", deque))
+    return targets
+
+
+def run(args):
+    """ Runs the benchmarks and writes the results as JSON. """
+    results = []
+    operations = args.operations or OPERATIONS
+    for size in args.sizes:
+        for target in targets_for(args):
+            for operation in operations:
+                if operation not in target.operations:
+                    continue
+                result = measure(target, operation, size, args)
+                results.append(result)
+                if not args.quiet:
+                    sys.stderr.write("%-26s %-18s %9d %12.3fus %12dB\n" % (
+                        target.name, operation, size,
+                        result["per_op"] * 1e6, result["peak_bytes"]))
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        sys.stdout.write("\n")
+
+
+def _key(result):
+    return (result["target"], result["operation"], result["size"])
+
+
+def compare(args):
+    """ Prints the changes between two runs and flags the regressions.
+
+    Returns 1 if an operation is slower, or has a higher peak memory, by
+    more than `args.threshold`, and 0 otherwise.
+    """
+    with open(args.before) as fp:
+        before = dict((_key(r), r) for r in json.load(fp)["results"])
+    with open(args.after) as fp:
+        after = json.load(fp)["results"]
+
+    regressions = 0
+    print("%-26s %-18s %9s %10s %10s  %s" % ("target", "operation", "size",
+            "time", "memory", ""))
+    for result in after:
+        old = before.get(_key(result))
+        if old is None:
+            continue
+        # Short timings and small peaks vary from run to run, so they are
+        # only compared once they are larger than the minimums.
+        if max(old["seconds"], result["seconds"]) < args.min_seconds:
+            time_ratio = 1.0
+        else:
+            time_ratio = result["per_op"] / old["per_op"]
+        if max(old["peak_bytes"], result["peak_bytes"]) < args.min_bytes:
+            memory_ratio = 1.0
+        else:
+            memory_ratio = result["peak_bytes"] / max(old["peak_bytes"], 1)
+        flags = []
+        if time_ratio > 1 + args.threshold:
+            flags.append("SLOWER")
+        if memory_ratio > 1 + args.threshold:
+            flags.append("MEMORY")
+        if flags:
+            regressions += 1
+        if flags or args.verbose:
+            print("%-26s %-18s %9d %9.2fx %9.2fx  %s" % (result["target"],
+                    result["operation"], result["size"], time_ratio,
+                    memory_ratio, " ".join(flags)))
+    print("%d regression%s" % (regressions, "" if regressions == 1 else "s"))
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--sizes", type=int, nargs="+",
+            default=[10, 100, 1000, 10000, 100000], help="list sizes")
+    run_parser.add_argument("--operations", nargs="+", choices=OPERATIONS,
+            help="operations to measure, all by default")
+    run_parser.add_argument("--backends", nargs="+", default=["node"],
+            help="LinkedList backends, such as node, array or mapped")
+    run_parser.add_argument("--no-baselines", action="store_true",
+            help="don't measure list and deque")
+    run_parser.add_argument("--ops", type=int, default=1000,
+            help="times each operation is run")
+    run_parser.add_argument("--budget", type=int, default=1000000,
+            help="Nodes a linear operation may visit in a measurement")
+    run_parser.add_argument("--repeat", type=int, default=3,
+            help="measurements to take the best of")
+    run_parser.add_argument("-o", "--output", help="file for the JSON")
+    run_parser.add_argument("-q", "--quiet", action="store_true",
+            help="don't print progress")
+
+    compare_parser = commands.add_parser("compare",
+            help="compare two runs")
+    compare_parser.add_argument("before", help="JSON of the earlier run")
+    compare_parser.add_argument("after", help="JSON of the later run")
+    compare_parser.add_argument("--threshold", type=float, default=0.25,
+            help="fraction by which a result may get worse")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.001,
+            help="time below which changes are ignored")
+    compare_parser.add_argument("--min-bytes", type=int, default=4096,
+            help="peak memory below which changes are ignored")
+    compare_parser.add_argument("-v", "--verbose", action="store_true",
+            help="print every result, not only the regressions")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+""" Measures the throughput of a list shared by a number of threads.
+
+In the first workload each thread appends to the tail and pops from the
+head. In the second each thread inserts and removes values after a Node
+of its own, spread out along the list. The ConcurrentLinkedList is
+compared with a LinkedList guarded by one lock.
+
+    python benchmarks/threads.py --ops 20000 --threads 1 2 4 8
+
+On an interpreter with a global interpreter lock only one thread runs at
+a time, so the numbers show the cost of the locking rather than scaling.
+"""
+
+import argparse
+import os
+import sys
+import time
+from threading import Lock
+from threading import Thread
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from amzlist import LinkedList
+from amzlist.threadsafe import ConcurrentLinkedList
+
+
+class LockedLinkedList(object):
+    """ A LinkedList with every method called under one lock. """
+
+    def __init__(self):
+        self._list = LinkedList()
+        self._lock = Lock()
+
+    def __getattr__(self, name):
+        method = getattr(self._list, name)
+
+        def locked(*args):
+            with self._lock:
+                return method(*args)
+        return locked
+
+
+def queue_work(lnkd_list, thread, ops):
+    """ Appends to the tail and pops from the head of `lnkd_list`. """
+    for op in range(ops // 2):
+        lnkd_list.append(op)
+        lnkd_list.pop()
+
+
+def search_work(lnkd_list, thread, ops):
+    """ Inserts and removes values after the Node of `thread`. """
+    mark = lnkd_list.find(("mark", thread))
+    for op in range(ops // 2):
+        lnkd_list.insert((thread, op), mark)
+        lnkd_list.remove((thread, op))
+
+
+def measure(factory, work, threads, ops, prefill):
+    """ Returns the operations per second with `threads` threads. """
+    lnkd_list = factory()
+    for value in range(prefill):
+        lnkd_list.append(value)
+    for thread in range(threads):
+        # Each thread works in a different part of the list.
+        lnkd_list.append(("mark", thread))
+        for value in range(prefill):
+            lnkd_list.append(value)
+    workers = [Thread(target=work, args=(lnkd_list, i, ops))
+            for i in range(threads)]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * ops / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--ops", type=int, default=20000,
+            help="operations per thread")
+    parser.add_argument("--threads", type=int, nargs="+",
+            default=[1, 2, 4, 8], help="thread counts to measure")
+    parser.add_argument("--prefill", type=int, default=100,
+            help="values before the Node of each thread")
+    args = parser.parse_args()
+
+    for work in (queue_work, search_work):
+        print(work.__doc__.strip())
+        print("%8s %14s %14s" % ("threads", "concurrent", "one lock"))
+        for threads in args.threads:
+            concurrent = measure(ConcurrentLinkedList, work, threads,
+                    args.ops, args.prefill)
+            locked = measure(LockedLinkedList, work, threads, args.ops,
+                    args.prefill)
+            print("%8d %12d/s %12d/s" % (threads, concurrent, locked))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,5 +14,5 @@ setup(name='amzlist',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
     ],
-    py_modules=['amzlist']
+    packages=['amzlist']
 )
\ No newline at end of file
@@ -0,0 +1,114 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import asyncio
+from unittest import TestCase
+
+from amzlist.aio import AsyncLinkedList
+
+def run(coroutine):
+    """ Runs `coroutine` on a new event loop and returns its result. """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+class AsyncListTest(TestCase):
+    """ Test the asyncio linked list """
+
+    def test_pop_waits(self):
+        """ Test pop waits until a Node is added. """
+        async def main():
+            lnkd_list = AsyncLinkedList()
+            task = asyncio.ensure_future(lnkd_list.pop())
+            await asyncio.sleep(0)
+            self.assertFalse(task.done())
+            await lnkd_list.append("A")
+            return await task
+        self.assertEqual("A", run(main()).data)
+
+    def test_nowait(self):
+        """ Test the methods that don't wait. """
+        lnkd_list = AsyncLinkedList(maxsize=2)
+        lnkd_list.append_nowait(2)
+        lnkd_list.push_nowait(1)
+        self.assertRaises(asyncio.QueueFull, lnkd_list.append_nowait, 3)
+        self.assertEqual("1->2", str(lnkd_list))
+        self.assertEqual(1, lnkd_list.pop_nowait().data)
+        self.assertEqual(2, lnkd_list.pop_nowait().data)
+        self.assertRaises(asyncio.QueueEmpty, lnkd_list.pop_nowait)
+
+    def test_backpressure(self):
+        """ Test push waits while the list is full. """
+        async def main():
+            lnkd_list = AsyncLinkedList(maxsize=2)
+            sizes = []
+
+            async def produce():
+                for val in range(5):
+                    await lnkd_list.push(val)
+                    sizes.append(len(lnkd_list))
+
+            task = asyncio.ensure_future(produce())
+            await asyncio.sleep(0)
+            self.assertEqual([1, 2], sizes)
+            self.assertEqual(1, (await lnkd_list.pop()).data)
+            await asyncio.sleep(0)
+            self.assertEqual([1, 2, 2], sizes)
+            while not task.done():
+                await lnkd_list.pop()
+                await asyncio.sleep(0)
+            return sizes
+        self.assertEqual([1, 2, 2, 2, 2], run(main()))
+
+    def test_pop_many(self):
+        """ Test a batch of Nodes is popped for one wake up. """
+        async def main():
+            lnkd_list = AsyncLinkedList()
+            task = asyncio.ensure_future(lnkd_list.pop_many(3))
+            await asyncio.sleep(0)
+            for val in range(5):
+                lnkd_list.append_nowait(val)
+            batch = await task
+            rest = await lnkd_list.pop_many(10)
+            return batch, rest
+        batch, rest = run(main())
+        self.assertEqual([0, 1, 2], [node.data for node in batch])
+        self.assertEqual([3, 4], [node.data for node in rest])
+
+    def test_async_for(self):
+        """ Test consuming the list until it is closed. """
+        async def main():
+            lnkd_list = AsyncLinkedList(maxsize=1)
+
+            async def produce():
+                for val in range(4):
+                    await lnkd_list.append(val)
+                lnkd_list.close()
+
+            task = asyncio.ensure_future(produce())
+            values = [value async for value in lnkd_list]
+            await task
+            try:
+                await lnkd_list.append(5)
+            except ValueError:
+                return values
+        self.assertEqual([0, 1, 2, 3], run(main()))
+
+    def test_cancel(self):
+        """ Test a wake up is passed on when a waiter is cancelled. """
+        async def main():
+            lnkd_list = AsyncLinkedList()
+            first = asyncio.ensure_future(lnkd_list.pop())
+            second = asyncio.ensure_future(lnkd_list.pop())
+            await asyncio.sleep(0)
+            lnkd_list.append_nowait("A")
+            first.cancel()
+            node = await second
+            self.assertTrue(first.cancelled())
+            return node
+        self.assertEqual("A", run(main()).data)
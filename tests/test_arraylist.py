@@ -0,0 +1,174 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import pickle
+from io import BytesIO
+from io import StringIO
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import LinkedList
+from amzlist import Node
+from amzlist.arraylist import ArrayLinkedList
+from amzlist.arraylist import ArrayNode
+
+class ArrayListTest(TestCase):
+    """ Test the array backed linked list """
+
+    def setUp(self):
+        self.linked_list = LinkedList(backend="array")
+
+    def test_backend(self):
+        """ Test the backend is selected by LinkedList. """
+        self.assertTrue(isinstance(self.linked_list, ArrayLinkedList))
+        self.assertTrue(isinstance(LinkedList(), LinkedList))
+
+    def test_backend_positional(self):
+        """ Test the backend can be passed by position. """
+        lnkd_list = LinkedList(True, "array")
+        self.assertTrue(isinstance(lnkd_list, ArrayLinkedList))
+        self.assertTrue(lnkd_list.strict)
+        self.assertFalse(isinstance(LinkedList(False, None, True),
+                ArrayLinkedList))
+        self.assertRaises(TypeError, LinkedList, False, "array",
+                backend="array")
+
+    @raises(ValueError)
+    def test_unknown_backend(self):
+        """ Test an unknown backend. """
+        LinkedList(backend="unknown")
+
+    def test_insert(self):
+        """ Test adding values and Nodes. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(10)
+        lnkd_list.prepend(Node("a"))
+        lnkd_list.prepend(20)
+        node_a = lnkd_list.find("a")
+        self.assertTrue(isinstance(node_a, ArrayNode))
+        lnkd_list.insert("b", node_a)
+        lnkd_list.insert(35.5, lnkd_list.last_node)
+        self.assertEqual(5, len(lnkd_list))
+        self.assertEqual("20->a->b->10->35.5", str(lnkd_list))
+        self.assertEqual(35.5, lnkd_list.last_node.data)
+        self.assertEqual("a->b", str(node_a))
+
+    @raises(TypeError)
+    def test_insert_none(self):
+        """ Test inserting after a parameter that is not an ArrayNode. """
+        self.linked_list.insert(35.5, None)
+
+    def test_remove(self):
+        """ Test removal by value and by handle. """
+        lnkd_list = self.linked_list
+        for val in [10, 20, 30]:
+            lnkd_list.append(val)
+
+        lnkd_list.remove(lnkd_list.find(20))
+        self.assertEqual("10->30", str(lnkd_list))
+        lnkd_list.remove(30)
+        self.assertEqual(10, lnkd_list.last_node.data)
+        lnkd_list.remove(10)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertTrue(lnkd_list.last_node is None)
+
+    @raises(ValueError)
+    def test_remove_unknown(self):
+        """ Test removing a value that is not in the list. """
+        self.linked_list.remove("A")
+
+    def test_free_slots(self):
+        """ Test the slots of removed elements are reused. """
+        lnkd_list = self.linked_list
+        for val in range(4):
+            lnkd_list.push(val)
+        node = lnkd_list.first_node
+        self.assertEqual(3, lnkd_list.pop().data)
+        self.assertRaises(ValueError, getattr, node, "data")
+
+        lnkd_list.push("new")
+        self.assertEqual(4, len(lnkd_list._data))
+        self.assertEqual("new->2->1->0", str(lnkd_list))
+        self.assertNotEqual(node, lnkd_list.first_node)
+
+    def test_find(self):
+        """ Test finding an element and the previous one. """
+        lnkd_list = self.linked_list
+        for val in ['A', 1, 2, 'A']:
+            lnkd_list.append(val)
+
+        node, prev = lnkd_list.find('A', inc_prev=True)
+        self.assertEqual(lnkd_list.first_node, node)
+        self.assertTrue(prev is None)
+        node, prev = lnkd_list.find(lnkd_list.last_node, inc_prev=True)
+        self.assertEqual(2, prev.data)
+        self.assertEqual(lnkd_list.last_node, node)
+
+    def test_reverse(self):
+        """ Test reversing the list. """
+        lnkd_list = self.linked_list
+        for val in ['A', 'B', 'C', 'D', 'E']:
+            lnkd_list.append(val)
+
+        self.assertEqual('E->D->C->B->A', str(lnkd_list.reverse_iterative()))
+        self.assertEqual('E->D->C->B->A', str(lnkd_list.reverse_recursive()))
+        self.assertEqual('A->B->C->D->E', str(lnkd_list))
+        self.assertEqual(0, len(LinkedList(backend="array").reverse_recursive()))
+
+    def test_reverse_in_place(self):
+        """ Test reversing the list in place. """
+        lnkd_list = self.linked_list
+        for val in ['A', 'B', 'C']:
+            lnkd_list.append(val)
+        lnkd_list.reverse()
+        self.assertEqual('C->B->A', str(lnkd_list))
+        self.assertEqual('A', lnkd_list.last_node.data)
+        self.assertEqual('A->B->C', str(lnkd_list.reversed_copy()))
+
+    def test_extend(self):
+        """ Test adding values from iterables. """
+        lnkd_list = ArrayLinkedList.from_iterable(['B', 'C'])
+        lnkd_list.extendleft(['A', 'Z'])
+        lnkd_list.insert_many(iter([1, 2]), lnkd_list.last_node)
+        self.assertEqual('Z->A->B->C->1->2', str(lnkd_list))
+        self.assertEqual(2, lnkd_list.last_node.data)
+
+    def test_as_list(self):
+        """ Test the list of handles. """
+        lnkd_list = self.linked_list
+        for val in range(3):
+            lnkd_list.append(val)
+        nodes = lnkd_list.as_list()
+        self.assertEqual([0, 1, 2], [n.data for n in nodes])
+        self.assertEqual(lnkd_list.last_node, nodes[-1])
+
+    def test_text(self):
+        """ Test writing and reading the list as text. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(12))
+        fp = StringIO()
+        lnkd_list.write_to(fp, sep="\n", chunk_size=5)
+        fp.seek(0)
+        copy = ArrayLinkedList.read_from(fp, parse=int)
+        self.assertEqual(list(range(12)), list(copy))
+        self.assertEqual("ArrayLinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...])",
+                repr(copy))
+        self.assertEqual("0->1->2", str(ArrayLinkedList.from_iterable(range(3))))
+
+    def test_pickle(self):
+        """ Test pickling and dumping the list. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(5000))
+        node = lnkd_list.find(10)
+        self.assertEqual(list(range(5000)),
+                list(pickle.loads(pickle.dumps(lnkd_list))))
+        fp = BytesIO()
+        lnkd_list.dump(fp)
+        fp.seek(0)
+        copy = ArrayLinkedList.load(fp)
+        self.assertEqual(list(range(5000)), list(copy))
+        self.assertEqual(11, node.next.data)
@@ -0,0 +1,89 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from unittest import TestCase
+
+from amzlist import LinkedList
+from amzlist import Node
+from amzlist.instrument import OperationStats
+from amzlist.instrument import disable
+from amzlist.instrument import enable
+from amzlist.instrument import is_enabled
+from amzlist.instrument import profile
+
+class InstrumentTest(TestCase):
+    """ Test the operation counters """
+
+    def setUp(self):
+        self.linked_list = LinkedList.from_iterable(range(10))
+
+    def test_counts(self):
+        """ Test the Nodes visited and allocated by each operation. """
+        lnkd_list = self.linked_list
+        with profile() as stats:
+            lnkd_list.find(4)
+            lnkd_list.find(6)
+            lnkd_list.remove(2)
+            lnkd_list.append(10)
+            lnkd_list.last_node
+            lnkd_list.as_list()
+            lnkd_list.reverse_iterative()
+
+        self.assertEqual(OperationStats(2, 10, 0, 0), stats["find"])
+        self.assertEqual(OperationStats(1, 3, 0, 0), stats["remove"])
+        self.assertEqual(OperationStats(1, 0, 1, 0), stats["append"])
+        self.assertEqual(1, stats["last_node"].calls)
+        self.assertEqual(10, stats["as_list"].visited)
+        self.assertEqual(OperationStats(1, 10, 10, 0),
+                stats["reverse_iterative"])
+        self.assertEqual(0, stats["reverse"].calls)
+        self.assertEqual(7, stats.total().calls)
+        self.assertTrue("find" in str(stats))
+
+    def test_checks(self):
+        """ Test the Nodes followed to check a strict list for cycles. """
+        lnkd_list = LinkedList.from_iterable(range(10), strict=True)
+        first = lnkd_list.first_node
+        with profile() as stats:
+            first.next = lnkd_list.find(5)
+            self.assertRaises(ValueError, setattr, lnkd_list.last_node,
+                    "next", first)
+        self.assertEqual(2, stats["Node.__setattr__"].calls)
+        self.assertEqual(5, stats["Node.__setattr__"].checks)
+        self.assertEqual(0, stats["Node.__setattr__"].visited)
+        self.assertEqual("0->5->6->7->8->9", str(lnkd_list))
+
+    def test_callback(self):
+        """ Test the callback is called for each operation. """
+        calls = []
+        with profile(lambda name, counts: calls.append((name,
+                counts.visited))):
+            self.linked_list.find(3)
+            self.assertRaises(ValueError, self.linked_list.remove, "A")
+            self.linked_list.reverse_recursive()
+        self.assertEqual([("find", 3), ("remove", 10),
+                ("reverse_recursive", 10)], calls)
+
+    def test_disabled(self):
+        """ Test the original methods are put back. """
+        next = Node.__dict__["next"]
+        init = Node.__dict__["__init__"]
+        find = LinkedList.__dict__["find"]
+        first = enable()
+        second = enable()
+        self.linked_list.find(5)
+        disable(first)
+        self.assertTrue(is_enabled())
+        self.linked_list.find(5)
+        disable(second)
+        self.assertFalse(is_enabled())
+        self.linked_list.find(5)
+
+        self.assertEqual(5, first["find"].visited)
+        self.assertEqual(10, second["find"].visited)
+        self.assertTrue(Node.__dict__["next"] is next)
+        self.assertTrue(LinkedList.__dict__["find"] is find)
+        self.assertTrue(Node.__dict__["__init__"] is init)
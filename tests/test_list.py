@@ -4,9 +4,13 @@
 # License: http://jkeyes.mit-license.org/
 #
 
+import pickle
+from io import BytesIO
+from io import StringIO
 from unittest import TestCase
 from nose.tools import raises
 
+from amzlist import DoublyNode
 from amzlist import LinkedList
 from amzlist import Node
 
@@ -210,6 +214,49 @@ class ListTest(TestCase):
 
         self.assertEqual(lnkd_list.first_node.data, new_list.last_node.data)
 
+    def test_reverse_unchanged(self):
+        """ Test the reverse methods leave the list unchanged. """
+        lnkd_list = self.linked_list
+        for val in ['A', 'B', 'C']:
+            lnkd_list.append(val)
+
+        self.assertEqual('C->B->A', str(lnkd_list.reverse_iterative()))
+        self.assertEqual('C->B->A', str(lnkd_list.reverse_recursive()))
+        self.assertEqual('C->B', str(lnkd_list.reverse_recursive(
+                lnkd_list.next)))
+        new_list = lnkd_list.reversed_copy()
+        self.assertEqual('C->B->A', str(new_list))
+        self.assertEqual('A->B->C', str(lnkd_list))
+        self.assertEqual(3, len(lnkd_list))
+        self.assertFalse(new_list.last_node is lnkd_list.first_node)
+
+    def test_reverse_in_place(self):
+        """ Test reversing the list in place. """
+        lnkd_list = self.linked_list
+        lnkd_list.reverse()
+        self.assertEqual(0, len(lnkd_list))
+
+        nodes = [Node(val) for val in ['A', 'B', 'C', 'D']]
+        for node in nodes:
+            lnkd_list.append(node)
+        lnkd_list.reverse()
+        self.assertEqual('D->C->B->A', str(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is nodes[-1])
+        self.assertTrue(lnkd_list.last_node is nodes[0])
+        lnkd_list.append('E')
+        self.assertEqual('D->C->B->A->E', str(lnkd_list))
+
+    def test_reverse_long(self):
+        """ Test reversing a list that is longer than the recursion limit. """
+        lnkd_list = self.linked_list
+        for val in range(50000):
+            lnkd_list.prepend(val)
+        self.assertEqual(0, lnkd_list.reverse_recursive().data)
+        self.assertEqual(0, lnkd_list.reverse_iterative().data)
+        lnkd_list.reverse()
+        self.assertEqual(0, lnkd_list.data)
+        self.assertEqual(49999, lnkd_list.last_node.data)
+
     def test_reverse_i_empty(self):
         """ Test reversing an empty list iteratively. """
         lnkd_list = self.linked_list
@@ -234,6 +281,116 @@ class ListTest(TestCase):
         self.assertEqual("Item 2", node.data)
         self.assertEqual(1, len(lnkd_list))
 
+    def test_size_and_tail(self):
+        """ Test the size and tail are tracked through modifications. """
+        lnkd_list = self.linked_list
+
+        lnkd_list.append(2)
+        lnkd_list.prepend(1)
+        node_4 = Node(4)
+        lnkd_list.append(node_4)
+        self.assertEqual(3, len(lnkd_list))
+        self.assertEqual(node_4, lnkd_list.last_node)
+
+        # inserting after the tail moves the tail
+        lnkd_list.insert(5, node_4)
+        self.assertEqual(4, len(lnkd_list))
+        self.assertEqual(5, lnkd_list.last_node.data)
+
+        # removing the tail moves it back
+        lnkd_list.remove(5)
+        self.assertEqual(3, len(lnkd_list))
+        self.assertEqual(node_4, lnkd_list.last_node)
+
+        lnkd_list.pop()
+        lnkd_list.pop()
+        self.assertEqual(node_4, lnkd_list.first_node)
+        self.assertEqual(node_4, lnkd_list.last_node)
+
+        lnkd_list.pop()
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.last_node is None)
+
+        # appending to the emptied list
+        lnkd_list.append(6)
+        self.assertEqual(1, len(lnkd_list))
+        self.assertEqual(6, lnkd_list.last_node.data)
+
+    def test_extend(self):
+        """ Test extending the list from an iterable. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend([])
+        self.assertEqual(0, len(lnkd_list))
+
+        lnkd_list.extend(val for val in ['B', 'C'])
+        node_d = Node('D')
+        lnkd_list.extend([node_d, 'E'])
+        self.assertEqual('B->C->D->E', str(lnkd_list))
+        self.assertEqual(4, len(lnkd_list))
+        self.assertEqual('E', lnkd_list.last_node.data)
+
+        lnkd_list.extendleft(['A', 'Z'])
+        self.assertEqual('Z->A->B->C->D->E', str(lnkd_list))
+        self.assertEqual(6, len(lnkd_list))
+
+        lnkd_list.insert_many(iter([1, 2]), node_d)
+        self.assertEqual('Z->A->B->C->D->1->2->E', str(lnkd_list))
+        lnkd_list.insert_many([3], lnkd_list.last_node)
+        self.assertEqual(3, lnkd_list.last_node.data)
+        self.assertEqual(9, len(lnkd_list))
+
+    def test_extendleft_empty(self):
+        """ Test extending an empty list from the left. """
+        lnkd_list = self.linked_list
+        lnkd_list.extendleft(range(3))
+        self.assertEqual('2->1->0', str(lnkd_list))
+        self.assertEqual(0, lnkd_list.last_node.data)
+
+    def test_from_iterable(self):
+        """ Test creating a list from an iterable. """
+        lnkd_list = LinkedList.from_iterable(range(5), strict=True)
+        self.assertEqual('0->1->2->3->4', str(lnkd_list))
+        self.assertTrue(lnkd_list.strict)
+        self.assertRaises(ValueError, setattr, lnkd_list.last_node, 'next',
+                lnkd_list.first_node)
+
+    def test_iter(self):
+        """ Test iterating over the data and the Nodes. """
+        lnkd_list = self.linked_list
+        self.assertEqual([], list(lnkd_list))
+        self.assertEqual([], list(reversed(lnkd_list)))
+
+        values = list(range(20))
+        for val in values:
+            lnkd_list.append(val)
+
+        self.assertEqual(values, list(lnkd_list))
+        self.assertEqual(values, [n.data for n in lnkd_list.iter_nodes()])
+        self.assertEqual(lnkd_list.as_list(), list(lnkd_list.iter_nodes()))
+        self.assertEqual(list(reversed(values)), list(reversed(lnkd_list)))
+
+        node = lnkd_list.find(15)
+        self.assertEqual([15, 16, 17, 18, 19],
+                [n.data for n in lnkd_list.iter_from(node)])
+
+    def test_slice(self):
+        """ Test slicing the data. """
+        lnkd_list = self.linked_list
+        for val in range(10):
+            lnkd_list.append(val)
+
+        self.assertEqual([3, 4, 5], list(lnkd_list.slice(3, 6)))
+        self.assertEqual([8, 9], list(lnkd_list.slice(8)))
+        self.assertEqual([], list(lnkd_list.slice(12, 15)))
+
+    def test_reversed_sizes(self):
+        """ Test reversed iteration for sizes around the block size. """
+        for size in [1, 2, 3, 4, 5, 8, 9, 10, 17]:
+            lnkd_list = LinkedList()
+            for val in range(size):
+                lnkd_list.append(val)
+            self.assertEqual(list(range(size - 1, -1, -1)),
+                    list(reversed(lnkd_list)))
 
 
 class CycleTest(TestCase):
@@ -269,6 +426,805 @@ class CycleTest(TestCase):
         self.node_james.next = node_jules
         node_jules.next = self.node_john
 
+    def test_insert_after_foreign(self):
+        """ Test inserting after a Node that isn't in the list. """
+        other = Node('Jim')
+        self.assertRaises(ValueError, self.lnkd_list.insert, 'Jules', other)
+        self.assertRaises(ValueError, self.lnkd_list.insert_many, ['Jules'],
+                other)
+        self.assertTrue(other.next is None)
+        self.assertEqual(3, self.lnkd_list.validate())
+        self.assertEqual('John->James->Joe', str(self.lnkd_list))
+
+    def test_insert_other_list(self):
+        """ Test adding a Node that belongs to another strict list. """
+        other = LinkedList(strict=True)
+        other.extend(['Jim', 'Jules'])
+        node_jim = other.first_node
+        self.assertRaises(ValueError, self.lnkd_list.append, node_jim)
+        self.assertRaises(ValueError, LinkedList().append, node_jim)
+        self.assertRaises(ValueError, setattr, self.node_joe, 'next',
+                node_jim)
+        self.assertEqual('Jim->Jules', str(other))
+        self.assertEqual(2, len(other))
+        self.assertEqual('John->James->Joe', str(self.lnkd_list))
+        self.assertEqual(3, len(self.lnkd_list))
+
+    @raises(ValueError)
+    def test_cycle_prepend(self):
+        """ Test prepending a Node that is already in the list. """
+        self.lnkd_list.prepend(self.node_james)
+
+    def test_strict_per_list(self):
+        """ Test creating another LinkedList does not change strict mode. """
+        LinkedList(strict=False)
+        node_jules = Node('Jules')
+        self.node_joe.next = node_jules
+        self.assertRaises(ValueError, setattr, node_jules, 'next',
+                self.node_james)
+
+    def test_relink(self):
+        """ Test the size and tail are updated by direct modifications. """
+        lnkd_list = self.lnkd_list
+
+        # skip over James
+        self.node_john.next = self.node_joe
+        self.assertEqual(2, len(lnkd_list))
+        self.assertEqual('John->Joe', str(lnkd_list))
+
+        # James is no longer in the list so it can be linked back in,
+        # once it no longer refers to Joe
+        self.assertRaises(ValueError, setattr, self.node_joe, 'next',
+                self.node_james)
+        self.node_james.next = None
+        self.node_joe.next = self.node_james
+        self.assertEqual(3, len(lnkd_list))
+        self.assertEqual(self.node_james, lnkd_list.last_node)
+        self.assertEqual('John->Joe->James', str(lnkd_list))
+
+        # a new Node can go between Nodes already in the list
+        node_jules = Node('Jules')
+        node_jules.next = self.node_james
+        self.node_joe.next = node_jules
+        self.assertEqual('John->Joe->Jules->James', str(lnkd_list))
+        self.assertRaises(ValueError, setattr, self.node_james, 'next',
+                node_jules)
+
+    def test_reverse_in_place(self):
+        """ Test cycles are still detected after reversing. """
+        self.lnkd_list.reverse()
+        self.assertEqual('Joe->James->John', str(self.lnkd_list))
+        self.assertRaises(ValueError, setattr, self.node_john, 'next',
+                self.node_james)
+        self.node_james.next = self.node_john
+        self.assertEqual('Joe->James->John', str(self.lnkd_list))
+
+    def test_extend_repeated(self):
+        """ Test extending with a Node that is already in the list. """
+        lnkd_list = self.lnkd_list
+        node_jules = Node('Jules')
+        self.assertRaises(ValueError, lnkd_list.extend,
+                [node_jules, self.node_john])
+        self.assertRaises(ValueError, lnkd_list.extendleft,
+                [node_jules, node_jules])
+        self.assertRaises(ValueError, lnkd_list.insert_many,
+                [node_jules, self.node_joe], self.node_john)
+        self.assertEqual('John->James->Joe', str(lnkd_list))
+
+        # the Node that was rolled back can still be added
+        lnkd_list.insert_many([node_jules, 'Jim'], self.node_john)
+        self.assertEqual('John->Jules->Jim->James->Joe', str(lnkd_list))
+        self.assertRaises(ValueError, setattr, self.node_joe, 'next',
+                node_jules)
+
+    def test_many_inserts(self):
+        """ Test inserting repeatedly at the same position. """
+        lnkd_list = self.lnkd_list
+        for i in range(200):
+            lnkd_list.insert(i, self.node_john)
+        self.assertEqual(203, len(lnkd_list))
+        self.assertEqual(203, lnkd_list.validate())
+        self.assertRaises(ValueError, setattr, self.node_joe, 'next',
+                self.node_james)
+
+
+class ValidateTest(TestCase):
+
+    def test_validate(self):
+        """ Test validating a list with Nodes linked outside the API. """
+        lnkd_list = LinkedList()
+        node_a = Node('A')
+        lnkd_list.append(node_a)
+        node_b = Node('B')
+        node_a.next = node_b
+        self.assertEqual(2, lnkd_list.validate())
+        self.assertEqual(2, len(lnkd_list))
+        self.assertEqual(node_b, lnkd_list.last_node)
+
+    @raises(ValueError)
+    def test_validate_cycle(self):
+        """ Test validating a list with a cycle. """
+        lnkd_list = LinkedList()
+        for val in ['A', 'B', 'C', 'D']:
+            lnkd_list.append(val)
+        lnkd_list.last_node.next = lnkd_list.next
+        lnkd_list.validate()
+
+
+class IndexTest(TestCase):
+
+    def setUp(self):
+        self.lnkd_list = LinkedList(index=True)
+        for val in ['A', 'B', 'C', 'B', 'D']:
+            self.lnkd_list.append(val)
+
+    def test_find(self):
+        """ Test finding Nodes and their previous Node through the index. """
+        lnkd_list = self.lnkd_list
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('C', node.next.data)
+        self.assertEqual('A', prev.data)
+
+        node, prev = lnkd_list.find('A', inc_prev=True)
+        self.assertTrue(prev is None)
+
+        # a Node before the first 'B' moves it along
+        lnkd_list.insert('B', lnkd_list.first_node)
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('A', prev.data)
+        self.assertEqual('B', node.next.data)
+
+        # match the last Node by identity
+        node, prev = lnkd_list.find(lnkd_list.find('C'), inc_prev=True)
+        self.assertEqual('C', node.data)
+        self.assertEqual('B', prev.data)
+
+    @raises(ValueError)
+    def test_find_unknown(self):
+        """ Test finding a value that is not in the list. """
+        self.lnkd_list.find('E')
+
+    def test_remove(self):
+        """ Test removal keeps the index up to date. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.remove('B')
+        lnkd_list.remove('D')
+        self.assertEqual('A->C->B', str(lnkd_list))
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('C', prev.data)
+        self.assertEqual(node, lnkd_list.last_node)
+
+        self.assertEqual('A', lnkd_list.pop().data)
+        node, prev = lnkd_list.find('C', inc_prev=True)
+        self.assertTrue(prev is None)
+
+        lnkd_list.prepend('D')
+        node, prev = lnkd_list.find('C', inc_prev=True)
+        self.assertEqual('D', prev.data)
+
+    def test_reverse(self):
+        """ Test reversing in place keeps the index up to date. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.reverse()
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('D', prev.data)
+        self.assertEqual('C', node.next.data)
+        lnkd_list.remove('B')
+        self.assertEqual('D->C->B->A', str(lnkd_list))
+
+    def test_extend(self):
+        """ Test extending keeps the index up to date. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.extend(['A', 'E'])
+        lnkd_list.extendleft(['E', 'F'])
+        lnkd_list.insert_many(['B', 'G'], lnkd_list.find('D'))
+        self.assertEqual('F->E->A->B->C->B->D->B->G->A->E', str(lnkd_list))
+        node, prev = lnkd_list.find('E', inc_prev=True)
+        self.assertEqual('F', prev.data)
+        node, prev = lnkd_list.find('A', inc_prev=True)
+        self.assertEqual('E', prev.data)
+        lnkd_list.remove('A')
+        lnkd_list.remove('A')
+        node, prev = lnkd_list.find('E', inc_prev=True)
+        lnkd_list.remove(node)
+        lnkd_list.remove('E')
+        self.assertEqual('F->B->C->B->D->B->G', str(lnkd_list))
+        node, prev = lnkd_list.find('G', inc_prev=True)
+        self.assertEqual('B', prev.data)
+
+    def test_duplicates(self):
+        """ Test many Nodes with the same data are kept in list order. """
+        lnkd_list = LinkedList(index=True)
+        for i in range(2000):
+            lnkd_list.prepend('x')
+            lnkd_list.append('x')
+        lnkd_list.extendleft(['x'] * 1000)
+        lnkd_list.splice(LinkedList.from_iterable(['x'] * 1000))
+        lnkd_list.insert('x', lnkd_list.node_at(2500))
+        lnkd_list.prepend('y')
+        nodes = lnkd_list._index['x']
+        self.assertEqual(lnkd_list.as_list()[1:], list(nodes))
+        self.assertEqual('y', lnkd_list.find('x', inc_prev=True)[1].data)
+
+        lnkd_list.pop()
+        lnkd_list.pop()
+        lnkd_list.remove(lnkd_list.node_at(3000))
+        lnkd_list.remove(lnkd_list.last_node)
+        self.assertEqual(lnkd_list.as_list(), list(nodes))
+        self.assertEqual(5998, len(nodes))
+
+    def test_contains(self):
+        """ Test membership of values and Nodes. """
+        lnkd_list = self.lnkd_list
+        self.assertTrue('C' in lnkd_list)
+        self.assertFalse('E' in lnkd_list)
+        node = lnkd_list.find('C')
+        self.assertTrue(node in lnkd_list)
+        lnkd_list.remove(node)
+        self.assertFalse(node in lnkd_list)
+        self.assertFalse('C' in lnkd_list)
+        self.assertFalse('C' in LinkedList())
+
+    def test_unhashable(self):
+        """ Test a list with unhashable data falls back to scanning. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.append(['E'])
+        self.assertTrue(['E'] in lnkd_list)
+        lnkd_list.remove('B')
+        self.assertEqual("A->C->B->D->['E']", str(lnkd_list))
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('C', prev.data)
+
+    def test_relink(self):
+        """ Test the index is updated by direct modifications. """
+        lnkd_list = self.lnkd_list
+        # skip over the first 'B' and 'C'
+        lnkd_list.first_node.next = lnkd_list.node_at(3)
+        self.assertEqual(3, len(lnkd_list))
+        self.assertFalse('C' in lnkd_list)
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual('A', prev.data)
+        self.assertEqual('D', node.next.data)
+
+        lnkd_list.last_node.next = Node('E')
+        self.assertTrue('E' in lnkd_list)
+        self.assertEqual('E', lnkd_list.last_node.data)
+        self.assertEqual('A->B->D->E', str(lnkd_list))
+
+    @raises(ValueError)
+    def test_insert_twice(self):
+        """ Test adding a Node that is already in the list. """
+        self.lnkd_list.append(self.lnkd_list.first_node)
+
+
+class DoublyTest(TestCase):
+
+    def setUp(self):
+        self.lnkd_list = LinkedList(doubly=True)
+        self.lnkd_list.extend(['B', 'C', 'D'])
+
+    def test_prev(self):
+        """ Test the prev attributes are kept up to date. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.prepend('A')
+        lnkd_list.append('E')
+        lnkd_list.insert('C2', lnkd_list.find('C'))
+        self.assertTrue(isinstance(lnkd_list.first_node, DoublyNode))
+        self.assertTrue(lnkd_list.first_node.prev is None)
+
+        values = []
+        node = lnkd_list.last_node
+        while node is not None:
+            values.append(node.data)
+            node = node.prev
+        self.assertEqual(['E', 'D', 'C2', 'C', 'B', 'A'], values)
+        self.assertEqual(values, list(reversed(lnkd_list)))
+
+    def test_pop(self):
+        """ Test popping from both ends. """
+        lnkd_list = self.lnkd_list
+        self.assertEqual('D', lnkd_list.pop_last().data)
+        self.assertEqual('C', lnkd_list.last_node.data)
+        self.assertTrue(lnkd_list.last_node.next is None)
+        self.assertEqual('B', lnkd_list.popleft().data)
+        self.assertTrue(lnkd_list.first_node.prev is None)
+        self.assertEqual('C', lnkd_list.pop_last().data)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertRaises(ValueError, lnkd_list.pop_last)
+
+    def test_unlink(self):
+        """ Test unlinking a Node. """
+        lnkd_list = self.lnkd_list
+        node = lnkd_list.find('C')
+        lnkd_list.unlink(node)
+        self.assertEqual('B->D', str(lnkd_list))
+        self.assertEqual('B', lnkd_list.last_node.prev.data)
+        self.assertRaises(ValueError, lnkd_list.unlink, node)
+
+    def test_insert_before(self):
+        """ Test inserting before a Node. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.insert_before('A', lnkd_list.first_node)
+        lnkd_list.insert_before('C2', lnkd_list.last_node)
+        self.assertEqual('A->B->C->C2->D', str(lnkd_list))
+        self.assertEqual('C2', lnkd_list.last_node.prev.data)
+
+    def test_relink(self):
+        """ Test the prev attributes are updated by direct modifications. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.first_node.next = lnkd_list.last_node
+        self.assertEqual(2, len(lnkd_list))
+        self.assertEqual('B', lnkd_list.last_node.prev.data)
+        self.assertEqual(['D', 'B'], list(reversed(lnkd_list)))
+
+        node = DoublyNode('E')
+        lnkd_list.last_node.next = node
+        self.assertTrue(lnkd_list.last_node is node)
+        self.assertEqual('D', node.prev.data)
+        self.assertEqual(['E', 'D', 'B'], list(reversed(lnkd_list)))
+        self.assertRaises(TypeError, setattr, node, 'next', Node('F'))
+        self.assertTrue(node.next is None)
+
+    @raises(TypeError)
+    def test_singly_node(self):
+        """ Test adding a Node without a prev attribute. """
+        self.lnkd_list.append(Node('E'))
+
+    def test_singly(self):
+        """ Test the same methods on a singly linked list. """
+        lnkd_list = LinkedList.from_iterable(['A', 'B', 'C'])
+        self.assertEqual('C', lnkd_list.pop_last().data)
+        self.assertEqual('B', lnkd_list.last_node.data)
+        lnkd_list.insert_before('A2', lnkd_list.last_node)
+        lnkd_list.unlink(lnkd_list.first_node)
+        self.assertEqual('A2->B', str(lnkd_list))
+
+
+class SortTest(TestCase):
+
+    def test_sort(self):
+        """ Test sorting relinks the same Nodes. """
+        lnkd_list = LinkedList.from_iterable([5, 3, 9, 1, 3, 7])
+        nodes = lnkd_list.as_list()
+        lnkd_list.sort()
+        self.assertEqual([1, 3, 3, 5, 7, 9], list(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is nodes[3])
+        self.assertTrue(lnkd_list.last_node is nodes[2])
+        self.assertEqual(6, len(lnkd_list))
+
+    def test_sort_stable(self):
+        """ Test equal keys keep their order, also when reversed. """
+        values = [(i % 3, i) for i in range(30)]
+        for reverse in (False, True):
+            lnkd_list = LinkedList.from_iterable(values)
+            lnkd_list.sort(key=lambda v: v[0], reverse=reverse)
+            expected = sorted(values, key=lambda v: v[0], reverse=reverse)
+            self.assertEqual(expected, list(lnkd_list))
+
+    def test_sort_sizes(self):
+        """ Test sorting lists of sizes around powers of two. """
+        for size in [0, 1, 2, 3, 7, 8, 9, 100]:
+            values = [(i * 37) % 101 for i in range(size)]
+            lnkd_list = LinkedList.from_iterable(values)
+            lnkd_list.sort()
+            self.assertEqual(sorted(values), list(lnkd_list))
+
+    def test_sort_settings(self):
+        """ Test a sorted list keeps working in each setting. """
+        for kwargs in [{"strict": True}, {"index": True}, {"doubly": True},
+                {"skiplist": True}]:
+            lnkd_list = LinkedList(**kwargs)
+            lnkd_list.extend([4, 2, 8, 6])
+            lnkd_list.sort(reverse=True)
+            self.assertEqual([8, 6, 4, 2], list(lnkd_list))
+            self.assertEqual([2, 4, 6, 8], list(reversed(lnkd_list)))
+            self.assertEqual(6, lnkd_list.find(4, inc_prev=True)[1].data)
+            self.assertEqual(6, lnkd_list[1])
+            lnkd_list.append(1)
+            self.assertEqual(5, len(lnkd_list))
+
+    def test_sort_error(self):
+        """ Test the Nodes stay linked if the key raises an error. """
+        lnkd_list = LinkedList.from_iterable([3, 1, "a", 2, 0], strict=True)
+        self.assertRaises(TypeError, lnkd_list.sort)
+        self.assertEqual([0, 1, 2, 3, "a"], sorted(lnkd_list, key=str))
+        self.assertEqual(5, lnkd_list.validate())
+
+    def test_insert_sorted(self):
+        """ Test inserting into a sorted list. """
+        lnkd_list = LinkedList()
+        for val in [5, 1, 9, 5, 0]:
+            lnkd_list.insert_sorted(val)
+        self.assertEqual([0, 1, 5, 5, 9], list(lnkd_list))
+        node = Node(5)
+        lnkd_list.insert_sorted(node)
+        self.assertTrue(node.next.data == 9)
+
+        lnkd_list = LinkedList()
+        for val in ["bb", "a", "ccc", "dd"]:
+            lnkd_list.insert_sorted(val, key=len, reverse=True)
+        self.assertEqual(["ccc", "bb", "dd", "a"], list(lnkd_list))
+
+    def test_merge(self):
+        """ Test merging the Nodes of another sorted list. """
+        lnkd_list = LinkedList.from_iterable([(1, "a"), (3, "a"), (5, "a")],
+                doubly=True)
+        other = LinkedList.from_iterable([(0, "b"), (3, "b"), (9, "b")],
+                strict=True, doubly=True)
+        node = other.last_node
+        lnkd_list.merge(other, key=lambda v: v[0])
+        self.assertEqual([0, 1, 3, 3, 5, 9], [v[0] for v in lnkd_list])
+        self.assertEqual(["a", "b"], [v[1] for v in lnkd_list][2:4])
+        self.assertTrue(lnkd_list.last_node is node)
+        self.assertEqual(6, len(lnkd_list))
+        self.assertEqual(0, len(other))
+        self.assertTrue(other.first_node is None)
+        self.assertEqual((5, "a"), node.prev.data)
+
+    @raises(TypeError)
+    def test_merge_singly(self):
+        """ Test merging Nodes into a doubly linked list. """
+        LinkedList(doubly=True).merge(LinkedList.from_iterable([1]))
+
+
+class BulkRemoveTest(TestCase):
+
+    def test_remove_if(self):
+        """ Test removing the Nodes that satisfy a predicate. """
+        lnkd_list = LinkedList.from_iterable(range(10))
+        nodes = lnkd_list.as_list()
+        self.assertEqual(5, lnkd_list.remove_if(lambda v: v % 2 == 0))
+        self.assertEqual("1->3->5->7->9", str(lnkd_list))
+        self.assertEqual(5, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is nodes[1])
+        self.assertTrue(lnkd_list.last_node is nodes[9])
+        self.assertEqual(0, lnkd_list.remove_if(lambda v: v > 100))
+        self.assertEqual(5, lnkd_list.remove_if(lambda v: True))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertTrue(lnkd_list.last_node is None)
+
+    def test_remove_all(self):
+        """ Test removing every Node with a value. """
+        lnkd_list = LinkedList.from_iterable(["A", "B", "A", "C", "A"])
+        self.assertEqual(3, lnkd_list.remove_all(Node("A")))
+        self.assertEqual("B->C", str(lnkd_list))
+        self.assertEqual("C", lnkd_list.last_node.data)
+        self.assertEqual(0, lnkd_list.remove_all("A"))
+
+    def test_remove_values(self):
+        """ Test removing the Nodes with any of a number of values. """
+        lnkd_list = LinkedList.from_iterable([1, [2], 3, 4, 1, 5])
+        self.assertEqual(3, lnkd_list.remove_values(iter([1, 4, 6])))
+        self.assertEqual([[2], 3, 5], list(lnkd_list))
+
+    def test_dedupe(self):
+        """ Test removing the Nodes that repeat an earlier value. """
+        lnkd_list = LinkedList.from_iterable([3, 1, 3, 2, 1, 3])
+        self.assertEqual(3, lnkd_list.dedupe())
+        self.assertEqual("3->1->2", str(lnkd_list))
+
+        lnkd_list = LinkedList.from_iterable(["a", "B", "b", [1], [1], "A"])
+        self.assertEqual(3, lnkd_list.dedupe(key=lambda v: v
+                if isinstance(v, list) else v.lower()))
+        self.assertEqual(["a", "B", [1]], list(lnkd_list))
+
+    def test_settings(self):
+        """ Test a list keeps working in each setting after removals. """
+        for kwargs in [{"strict": True}, {"index": True}, {"doubly": True},
+                {"skiplist": True}]:
+            lnkd_list = LinkedList(**kwargs)
+            lnkd_list.extend([1, 2, 3, 2, 4, 2])
+            removed = lnkd_list.find(2)
+            self.assertEqual(3, lnkd_list.remove_all(2))
+            self.assertEqual([4, 3, 1], list(reversed(lnkd_list)))
+            self.assertEqual(3, lnkd_list.find(4, inc_prev=True)[1].data)
+            self.assertEqual(4, lnkd_list[2])
+            lnkd_list.append(removed)
+            self.assertEqual(4, len(lnkd_list))
+            self.assertEqual(4, lnkd_list.validate())
+
+    def test_error(self):
+        """ Test the list stays linked if the predicate raises an error. """
+        lnkd_list = LinkedList.from_iterable([1, 2, "a", 3, 4], doubly=True)
+        self.assertRaises(TypeError, lnkd_list.remove_if, lambda v: v < 3)
+        self.assertEqual(["a", 3, 4], list(lnkd_list))
+        self.assertEqual(3, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node.prev is None)
+
+
+class SpliceTest(TestCase):
+
+    def test_concat(self):
+        """ Test moving the Nodes of another list to the tail. """
+        lnkd_list = LinkedList.from_iterable([1, 2])
+        other = LinkedList.from_iterable([3, 4])
+        last = other.last_node
+        lnkd_list.concat(other)
+        self.assertEqual("1->2->3->4", str(lnkd_list))
+        self.assertEqual(4, len(lnkd_list))
+        self.assertTrue(lnkd_list.last_node is last)
+        self.assertEqual(0, len(other))
+        self.assertTrue(other.first_node is None)
+        self.assertTrue(other.last_node is None)
+
+        lnkd_list += LinkedList.from_iterable([5])
+        lnkd_list += [6, 7]
+        self.assertEqual(list(range(1, 8)), list(lnkd_list))
+        empty = LinkedList()
+        empty.concat(lnkd_list)
+        self.assertEqual(7, len(empty))
+        self.assertEqual(7, empty.last_node.data)
+
+    def test_splice(self):
+        """ Test moving the Nodes of another list to after a Node. """
+        lnkd_list = LinkedList.from_iterable([1, 4])
+        lnkd_list.splice(LinkedList.from_iterable([2, 3]),
+                lnkd_list.first_node)
+        self.assertEqual("1->2->3->4", str(lnkd_list))
+        lnkd_list.splice(LinkedList.from_iterable([-1, 0]))
+        self.assertEqual("-1->0->1->2->3->4", str(lnkd_list))
+        self.assertEqual(4, lnkd_list.last_node.data)
+        lnkd_list.splice(LinkedList())
+        self.assertEqual(6, len(lnkd_list))
+
+    def test_split(self):
+        """ Test moving the Nodes after a Node to a new list. """
+        lnkd_list = LinkedList.from_iterable(range(6))
+        tail = lnkd_list.split_after(lnkd_list.find(2))
+        self.assertEqual("0->1->2", str(lnkd_list))
+        self.assertEqual("3->4->5", str(tail))
+        self.assertEqual(3, len(lnkd_list))
+        self.assertEqual(3, len(tail))
+        self.assertEqual(2, lnkd_list.last_node.data)
+        self.assertEqual(5, tail.last_node.data)
+        self.assertEqual(0, len(lnkd_list.split_after(lnkd_list.last_node)))
+
+        self.assertEqual([1, 2], list(lnkd_list.split_at(1)))
+        self.assertEqual([3, 4, 5], list(tail.split_at(-3)))
+        self.assertEqual(0, len(tail))
+        self.assertEqual(0, len(lnkd_list.split_at(5)))
+
+    def test_settings(self):
+        """ Test the lists keep working in each setting. """
+        for kwargs in [{"strict": True}, {"index": True}, {"doubly": True},
+                {"skiplist": True}]:
+            lnkd_list = LinkedList(**kwargs)
+            lnkd_list.extend([1, 2, 5])
+            other = LinkedList(**kwargs)
+            other.extend([3, 4])
+            lnkd_list.splice(other, lnkd_list.find(2))
+            lnkd_list.splice(LinkedList.from_iterable([0], **kwargs))
+            lnkd_list.concat(LinkedList.from_iterable([6], **kwargs))
+            self.assertEqual(list(range(7)), list(lnkd_list))
+            self.assertEqual(list(range(6, -1, -1)), list(reversed(lnkd_list)))
+            self.assertEqual(7, lnkd_list.validate())
+            self.assertEqual(3, lnkd_list.find(4, inc_prev=True)[1].data)
+            self.assertEqual(0, lnkd_list.find(1, inc_prev=True)[1].data)
+            self.assertEqual(4, lnkd_list[4])
+
+            tail = lnkd_list.split_after(lnkd_list.find(3))
+            self.assertEqual([4, 5, 6], list(tail))
+            self.assertEqual([3, 2, 1, 0], list(reversed(lnkd_list)))
+            self.assertEqual(5, tail[1])
+            self.assertEqual(4, tail.find(5, inc_prev=True)[1].data)
+            self.assertRaises(ValueError, lnkd_list.find, 5)
+            self.assertEqual(4, lnkd_list.validate())
+            self.assertEqual(3, tail.validate())
+            lnkd_list.append(7)
+            tail.append(8)
+            self.assertEqual(7, lnkd_list[4])
+            self.assertEqual(8, tail[3])
+
+    def test_strict_cycle(self):
+        """ Test splicing a list into itself, or after a missing Node. """
+        lnkd_list = LinkedList.from_iterable([1, 2], strict=True)
+        self.assertRaises(ValueError, lnkd_list.concat, lnkd_list)
+        other = LinkedList.from_iterable([3], strict=True)
+        self.assertRaises(ValueError, lnkd_list.splice, other,
+                other.first_node)
+        self.assertRaises(ValueError, lnkd_list.split_after, Node(1))
+        self.assertRaises(TypeError, lnkd_list.concat, [3])
+        self.assertRaises(TypeError, LinkedList(doubly=True).concat,
+                LinkedList.from_iterable([1]))
+        self.assertEqual(2, lnkd_list.validate())
+
+
+class PoolTest(TestCase):
+
+    def test_recycle(self):
+        """ Test popped Nodes are reused for new values. """
+        lnkd_list = LinkedList(pool=2)
+        lnkd_list.extend([1, 2, 3])
+        node = lnkd_list.pop()
+        self.assertEqual(1, node.data)
+        self.assertTrue(node.next is None)
+        lnkd_list.push(4)
+        self.assertTrue(lnkd_list.first_node is node)
+        self.assertEqual("4->2->3", str(lnkd_list))
+
+        kept = lnkd_list.pop(recycle=False)
+        lnkd_list.append(5)
+        self.assertEqual(4, kept.data)
+        self.assertFalse(lnkd_list.last_node is kept)
+
+    def test_delete_at(self):
+        """ Test a Node returned by `delete_at` is never recycled. """
+        lnkd_list = LinkedList.from_iterable([1, 2, 3], pool=2)
+        first = lnkd_list.delete_at(0)
+        last = lnkd_list.delete_at(-1)
+        self.assertEqual([], lnkd_list._pool.nodes)
+        lnkd_list.extend([4, 5])
+        self.assertEqual((1, 3), (first.data, last.data))
+        self.assertEqual("2->4->5", str(lnkd_list))
+
+    def test_size(self):
+        """ Test the pool keeps no more Nodes than its size. """
+        lnkd_list = LinkedList.from_iterable(range(5), pool=2)
+        nodes = [lnkd_list.pop() for i in range(5)]
+        self.assertEqual(nodes[:2], lnkd_list._pool.nodes)
+        lnkd_list.extend("abc")
+        self.assertEqual("a->b->c", str(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is nodes[1])
+        self.assertTrue(lnkd_list.find("b") is nodes[0])
+        self.assertEqual([], lnkd_list._pool.nodes)
+
+    def test_remove(self):
+        """ Test removed Nodes are recycled without their data. """
+        lnkd_list = LinkedList.from_iterable([1, 2, 3, 4], doubly=True,
+                pool=10)
+        node = lnkd_list.find(2)
+        lnkd_list.remove(2)
+        self.assertEqual([node], lnkd_list._pool.nodes)
+        self.assertTrue(node.data is None)
+        self.assertTrue(node.prev is None)
+        self.assertEqual(2, lnkd_list.remove_if(lambda v: v > 2))
+        self.assertEqual(3, len(lnkd_list._pool.nodes))
+        lnkd_list.extend([5, 6])
+        self.assertEqual([6, 5, 1], list(reversed(lnkd_list)))
+        self.assertEqual(3, lnkd_list.validate())
+
+        # A Node that is passed in is not recycled.
+        node = lnkd_list.last_node
+        lnkd_list.remove(node)
+        self.assertEqual(6, node.data)
+        self.assertEqual(1, len(lnkd_list._pool.nodes))
+
+    def test_caller_nodes(self):
+        """ Test Nodes made by the caller are never recycled. """
+        node = Node("a")
+        lnkd_list = LinkedList(pool=4)
+        lnkd_list.append(node)
+        lnkd_list.append("b")
+        lnkd_list.remove("a")
+        self.assertEqual("a", node.data)
+        self.assertEqual(0, len(lnkd_list._pool.nodes))
+        lnkd_list.push("c")
+        self.assertFalse(lnkd_list.first_node is node)
+
+        lnkd_list.append(node)
+        self.assertEqual(1, lnkd_list.remove_if(lambda v: v == "a"))
+        self.assertEqual("a", node.data)
+        lnkd_list.push(node)
+        self.assertTrue(lnkd_list.pop() is node)
+        lnkd_list.extend(["d", "e"])
+        self.assertEqual("a", node.data)
+        self.assertEqual("c->b->d->e", str(lnkd_list))
+
+    def test_relink(self):
+        """ Test a recycled Node that is added again leaves the pool. """
+        for kwargs in [{}, {"strict": True}, {"index": True}]:
+            lnkd_list = LinkedList.from_iterable([1, 2, 3], pool=4, **kwargs)
+            lnkd_list.append(lnkd_list.pop())
+            lnkd_list.append(lnkd_list.pop())
+            other = lnkd_list.pop()
+            lnkd_list.pop()
+            lnkd_list.insert(other, lnkd_list.first_node)
+            self.assertEqual(1, len(lnkd_list._pool.nodes))
+            lnkd_list.extend([4, 5])
+            self.assertEqual([2, 3, 4, 5], list(lnkd_list))
+
+    def test_other_list(self):
+        """ Test a recycled Node linked into another list leaves the pool,
+        in constant time.
+        """
+        lnkd_list = LinkedList.from_iterable(range(3), pool=3)
+        nodes = [lnkd_list.pop() for i in range(3)]
+        other = LinkedList()
+        other.append(nodes[0])
+        self.assertEqual([nodes[2], nodes[1]], lnkd_list._pool.nodes)
+        self.assertEqual(0, nodes[2]._label)
+        lnkd_list.extend([5, 6, 7])
+        self.assertEqual([0], list(other))
+        self.assertFalse(lnkd_list.last_node is nodes[0])
+
+    def test_settings(self):
+        """ Test copies and pickles of a list have a pool. """
+        lnkd_list = LinkedList.from_iterable([1, 2], pool=8)
+        self.assertEqual(8, lnkd_list.reversed_copy()._pool_size)
+        copy = pickle.loads(pickle.dumps(lnkd_list))
+        self.assertEqual(8, copy._pool_size)
+        self.assertEqual([1, 2], list(copy))
+        self.assertTrue(LinkedList()._pool is None)
+
+
+class TextTest(TestCase):
+
+    def test_write_to(self):
+        """ Test writing the values as text in chunks. """
+        lnkd_list = LinkedList.from_iterable(range(10))
+        fp = StringIO()
+        lnkd_list.write_to(fp, chunk_size=3)
+        self.assertEqual(str(lnkd_list), fp.getvalue())
+        self.assertEqual("0->1->2->3->4->5->6->7->8->9", fp.getvalue())
+
+        fp = StringIO()
+        LinkedList.from_iterable(["a", None, 1.5]).write_to(fp, sep=",")
+        self.assertEqual("a,None,1.5", fp.getvalue())
+        fp = StringIO()
+        LinkedList().write_to(fp)
+        self.assertEqual("", fp.getvalue())
+
+    def test_read_from(self):
+        """ Test reading a value from each line. """
+        lnkd_list = LinkedList.read_from(StringIO("1\n\n3\n"))
+        self.assertEqual(["1", "", "3"], list(lnkd_list))
+        self.assertEqual("3", lnkd_list.last_node.data)
+
+        fp = StringIO()
+        LinkedList.from_iterable(range(2500)).write_to(fp, sep="\n")
+        fp.seek(0)
+        lnkd_list = LinkedList.read_from(fp, parse=int, doubly=True)
+        self.assertEqual(list(range(2500)), list(lnkd_list))
+        self.assertEqual(2498, lnkd_list.last_node.prev.data)
+        self.assertEqual(2500, len(lnkd_list))
+
+    def test_repr(self):
+        """ Test the representation shows at most ten values. """
+        self.assertEqual("LinkedList([])", repr(LinkedList()))
+        self.assertEqual("LinkedList(['a', 1])",
+                repr(LinkedList.from_iterable(["a", 1])))
+        self.assertEqual("LinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...])",
+                repr(LinkedList.from_iterable(range(11))))
+        self.assertEqual("LinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9])",
+                repr(LinkedList.from_iterable(range(10))))
+
+
+class PickleTest(TestCase):
+
+    def test_pickle(self):
+        """ Test pickling a list longer than the recursion limit. """
+        lnkd_list = LinkedList(strict=True, doubly=True)
+        lnkd_list.extend(range(20000))
+        copy = pickle.loads(pickle.dumps(lnkd_list))
+        self.assertEqual(list(range(20000)), list(copy))
+        self.assertTrue(copy.strict)
+        self.assertTrue(copy.last_node.prev.data == 19998)
+        self.assertEqual(20000, len(copy))
+
+    def test_dump(self):
+        """ Test dumping and loading the list in chunks. """
+        lnkd_list = LinkedList.from_iterable(["A", 2, (3, 4), None])
+        fp = BytesIO()
+        lnkd_list.dump(fp, chunk_size=3)
+        fp.seek(0)
+        copy = LinkedList.load(fp, index=True)
+        self.assertEqual(["A", 2, (3, 4), None], list(copy))
+        self.assertEqual(2, copy.find((3, 4), inc_prev=True)[1].data)
+
+        fp = BytesIO()
+        LinkedList().dump(fp)
+        fp.seek(0)
+        self.assertEqual(0, len(LinkedList.load(fp)))
+
+    def test_load_invalid(self):
+        """ Test loading a file that isn't a whole dumped list. """
+        fp = BytesIO()
+        LinkedList.from_iterable(range(10)).dump(fp, chunk_size=4)
+        data = fp.getvalue()
+        self.assertRaises(ValueError, LinkedList.load, BytesIO(b"nonsense"))
+        self.assertRaises(ValueError, LinkedList.load, BytesIO(data[:-20]))
+
 class ManyNodesTest(TestCase):
 
     def test_many(self):
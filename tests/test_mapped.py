@@ -0,0 +1,153 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import LinkedList
+from amzlist import Node
+from amzlist.mapped import MappedLinkedList
+from amzlist.mapped import MappedNode
+
+class MappedListTest(TestCase):
+    """ Test the memory mapped linked list """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "list")
+        self.linked_list = LinkedList(backend="mapped", path=self.path)
+
+    def tearDown(self):
+        self.linked_list.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_backend(self):
+        """ Test the backend is selected by LinkedList. """
+        self.assertTrue(isinstance(self.linked_list, MappedLinkedList))
+        self.assertTrue(os.path.exists(self.path + ".heap"))
+
+    def test_insert(self):
+        """ Test adding values and Nodes. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(10)
+        lnkd_list.prepend(Node("a"))
+        lnkd_list.prepend(b"20")
+        node_a = lnkd_list.find("a")
+        self.assertTrue(isinstance(node_a, MappedNode))
+        lnkd_list.insert("b", node_a)
+        lnkd_list.insert(35.5, lnkd_list.last_node)
+        self.assertEqual(5, len(lnkd_list))
+        self.assertEqual("b'20'->a->b->10->35.5", str(lnkd_list))
+        self.assertEqual(35.5, lnkd_list.last_node.data)
+        self.assertEqual("a->b", str(node_a))
+
+    @raises(TypeError)
+    def test_insert_none(self):
+        """ Test inserting after a parameter that is not a MappedNode. """
+        self.linked_list.insert(35.5, None)
+
+    def test_remove(self):
+        """ Test removal by value and by handle. """
+        lnkd_list = self.linked_list
+        for val in [b"10", 20, (30,)]:
+            lnkd_list.append(val)
+
+        lnkd_list.remove(lnkd_list.find(20))
+        self.assertEqual([b"10", (30,)], list(lnkd_list))
+        lnkd_list.remove((30,))
+        self.assertEqual(b"10", lnkd_list.last_node.data)
+        self.assertRaises(ValueError, lnkd_list.remove, b"1")
+        lnkd_list.remove(b"10")
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertTrue(lnkd_list.last_node is None)
+
+    def test_free_records(self):
+        """ Test removed records and their heap space are reused. """
+        lnkd_list = self.linked_list
+        for val in range(4):
+            lnkd_list.push("value %s" % val)
+        node = lnkd_list.first_node
+        self.assertEqual("value 3", lnkd_list.pop().data)
+        self.assertRaises(ValueError, getattr, node, "data")
+
+        heap_end = lnkd_list._heap_end
+        lnkd_list.push("new")
+        self.assertEqual(4, lnkd_list._count)
+        self.assertEqual(heap_end, lnkd_list._heap_end)
+        self.assertEqual("new->value 2->value 1->value 0", str(lnkd_list))
+        self.assertNotEqual(node, lnkd_list.first_node)
+
+    def test_raw(self):
+        """ Test reading a payload without copying it. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(b"abc")
+        node = lnkd_list.first_node
+        view = node.raw
+        self.assertEqual(b"abc", view.tobytes())
+        node.data = b"xyz"
+        self.assertEqual(b"xyz", view.tobytes())
+        self.assertRaises(BufferError, lnkd_list.append, b"x" * 100000)
+        self.assertEqual(1, len(lnkd_list))
+        view.release()
+        lnkd_list.append(b"x" * 100000)
+        self.assertEqual([3, 100000], [len(v) for v in lnkd_list.iter_raw()])
+
+    def test_text(self):
+        """ Test writing and reading the list as text. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(12))
+        fp = StringIO()
+        lnkd_list.write_to(fp, sep="\n", chunk_size=5)
+        fp.seek(0)
+        path = os.path.join(self.tmpdir, "copy")
+        with MappedLinkedList.read_from(fp, parse=int, path=path) as copy:
+            self.assertEqual(list(range(12)), list(copy))
+            self.assertEqual("MappedLinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, "
+                    "9, ...])", repr(copy))
+        self.assertEqual("0->1->2->3", str(lnkd_list)[:10])
+
+    def test_reopen(self):
+        """ Test the list is restored when the file is reopened. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(3000))
+        lnkd_list.remove(1500)
+        lnkd_list.reverse()
+        lnkd_list.sync()
+        lnkd_list.close()
+
+        self.linked_list = MappedLinkedList(self.path)
+        expected = [val for val in range(2999, -1, -1) if val != 1500]
+        self.assertEqual(expected, list(self.linked_list))
+        self.assertEqual(2999, len(self.linked_list))
+        self.assertEqual(0, self.linked_list.last_node.data)
+        self.linked_list.append("more")
+        self.assertEqual("more", self.linked_list.last_node.data)
+
+    @raises(ValueError)
+    def test_open_invalid(self):
+        """ Test opening a file that isn't a MappedLinkedList. """
+        path = os.path.join(self.tmpdir, "other")
+        with open(path, "wb") as fp:
+            fp.write(b"x" * 100)
+        with open(path + ".heap", "wb") as fp:
+            fp.write(b"x" * 100)
+        MappedLinkedList(path)
+
+    def test_open_without_heap(self):
+        """ Test opening a list whose heap file is missing or empty. """
+        self.linked_list.extend(["a", "b"])
+        self.linked_list.close()
+        heap_path = self.path + ".heap"
+        os.remove(heap_path)
+        self.assertRaises(ValueError, MappedLinkedList, self.path)
+        self.assertFalse(os.path.exists(heap_path))
+        open(heap_path, "wb").close()
+        self.assertRaises(ValueError, MappedLinkedList, self.path)
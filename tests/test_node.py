@@ -30,4 +30,11 @@ class NodeTest(TestCase):
         a = Node("A")
         a.next = b
 
-        self.assertEqual("A->B", str(a))
\ No newline at end of file
+        self.assertEqual("A->B", str(a))
+
+    def test_slots(self):
+        """ Test a Node does not have a `__dict__` """
+        a = Node("A")
+        self.assertFalse(hasattr(a, "__dict__"))
+        self.assertTrue(a.next is None)
+        self.assertRaises(AttributeError, setattr, a, "other", 1)
@@ -0,0 +1,178 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from io import StringIO
+from unittest import TestCase
+from unittest import skipIf
+from nose.tools import raises
+
+from amzlist import LinkedList
+from amzlist import Node
+
+try:
+    import numpy
+    from amzlist.numeric import NumericLinkedList
+    from amzlist.numeric import NumericNode
+except ImportError:
+    numpy = None
+
+@skipIf(numpy is None, "NumPy is not installed")
+class NumpyTest(TestCase):
+    """ Test converting a LinkedList to and from NumPy arrays """
+
+    def test_to_numpy(self):
+        """ Test copying the values into an array. """
+        lnkd_list = LinkedList.from_iterable([3, 1.5, 2], doubly=True)
+        values = lnkd_list.to_numpy()
+        self.assertEqual(numpy.float64, values.dtype)
+        self.assertEqual([3.0, 1.5, 2.0], values.tolist())
+        self.assertEqual([3, 1, 2], lnkd_list.to_numpy(int).tolist())
+        self.assertEqual(0, len(LinkedList().to_numpy()))
+
+    def test_from_numpy(self):
+        """ Test creating a list from an array in chunks. """
+        values = numpy.arange(10, dtype=numpy.int32)
+        lnkd_list = LinkedList.from_numpy(values, chunk_size=3, strict=True)
+        self.assertEqual(list(range(10)), list(lnkd_list))
+        self.assertTrue(type(lnkd_list.first_node.data) is int)
+        self.assertTrue(lnkd_list.strict)
+        self.assertEqual(10, len(lnkd_list))
+
+    def test_from_numpy_numeric(self):
+        """ Test creating a numeric list keeps the dtype of the array. """
+        values = numpy.arange(5, dtype=numpy.int16)
+        lnkd_list = LinkedList.from_numpy(values, backend="numeric")
+        self.assertTrue(isinstance(lnkd_list, NumericLinkedList))
+        self.assertEqual(numpy.int16, lnkd_list.dtype)
+        self.assertEqual(list(range(5)), list(lnkd_list))
+
+    @raises(ValueError)
+    def test_from_numpy_2d(self):
+        """ Test creating a list from an array with two dimensions. """
+        LinkedList.from_numpy(numpy.zeros((2, 2)))
+
+@skipIf(numpy is None, "NumPy is not installed")
+class NumericListTest(TestCase):
+    """ Test the NumPy backed linked list """
+
+    def setUp(self):
+        self.linked_list = LinkedList(backend="numeric", dtype=int)
+
+    def test_backend(self):
+        """ Test the backend is selected by LinkedList. """
+        self.assertTrue(isinstance(self.linked_list, NumericLinkedList))
+        self.assertEqual(numpy.dtype(int), self.linked_list.dtype)
+
+    def test_insert(self):
+        """ Test adding values and Nodes. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(10)
+        lnkd_list.prepend(Node(1))
+        lnkd_list.prepend(20)
+        node_1 = lnkd_list.find(1)
+        self.assertTrue(isinstance(node_1, NumericNode))
+        lnkd_list.insert(2, node_1)
+        lnkd_list.insert(35, lnkd_list.last_node)
+        self.assertEqual(5, len(lnkd_list))
+        self.assertEqual("20->1->2->10->35", str(lnkd_list))
+        self.assertEqual(35, lnkd_list.last_node.data)
+        self.assertEqual("1->2", str(node_1))
+
+    @raises(TypeError)
+    def test_insert_none(self):
+        """ Test inserting after a parameter that is not a NumericNode. """
+        self.linked_list.insert(35, None)
+
+    def test_remove(self):
+        """ Test removal by value and by handle. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend([10, 20, 30])
+        node = lnkd_list.find(20)
+        lnkd_list.remove(node)
+        self.assertRaises(ValueError, getattr, node, "data")
+        lnkd_list.remove(30)
+        self.assertEqual(10, lnkd_list.last_node.data)
+        self.assertRaises(ValueError, lnkd_list.remove, 40)
+        self.assertEqual(10, lnkd_list.pop().data)
+        self.assertRaises(AttributeError, lnkd_list.pop)
+
+    def test_vectorized(self):
+        """ Test the operations on all of the values at once. """
+        lnkd_list = NumericLinkedList.from_numpy(numpy.arange(10.0))
+        lnkd_list.prepend(-1)
+        self.assertEqual(44.0, lnkd_list.sum())
+        self.assertEqual(-1.0, lnkd_list.min())
+        self.assertEqual(9.0, lnkd_list.max())
+        node, prev = lnkd_list.find(0.0, inc_prev=True)
+        self.assertEqual(-1.0, prev.data)
+
+        doubled = lnkd_list.map(lambda values: values * 2)
+        self.assertEqual(-2.0, doubled.data)
+        self.assertEqual(18.0, doubled.last_node.data)
+        odd = lnkd_list.filter(lambda values: values % 2 == 1)
+        self.assertEqual("-1.0->1.0->3.0->5.0->7.0->9.0", str(odd))
+        self.assertRaises(ValueError, lnkd_list.map, lambda values: 1)
+
+    def test_unordered(self):
+        """ Test reducing and finding without working out the order. """
+        lnkd_list = NumericLinkedList.from_iterable(range(10), dtype=int)
+        lnkd_list.pop()
+        lnkd_list.prepend(20)
+        lnkd_list.insert(-5, lnkd_list.find(4))
+        lnkd_list.remove(7)
+        self.assertTrue(lnkd_list._order is None)
+        self.assertEqual(53, lnkd_list.sum())
+        self.assertEqual(-5, lnkd_list.min())
+        self.assertEqual(20, lnkd_list.max())
+        node, prev = lnkd_list.find(-5, inc_prev=True)
+        self.assertEqual(4, prev.data)
+        node, prev = lnkd_list.find(20, inc_prev=True)
+        self.assertTrue(prev is None)
+        self.assertTrue(lnkd_list._order is None)
+        lnkd_list.append(20)
+        self.assertEqual(20, lnkd_list.find(20, inc_prev=True)[0].data)
+        self.assertEqual([20, 1, 2, 3, 4, -5, 5, 6, 8, 9, 20],
+                list(lnkd_list))
+
+    def test_remove_if(self):
+        """ Test removing values in one step keeps the list linked. """
+        lnkd_list = NumericLinkedList.from_iterable(range(10), dtype=int)
+        node = lnkd_list.find(9)
+        self.assertEqual(5, lnkd_list.remove_if(lambda values: values < 5))
+        self.assertEqual([5, 6, 7, 8, 9], list(lnkd_list))
+        self.assertEqual(node, lnkd_list.last_node)
+        self.assertEqual(0, lnkd_list.remove_if(lambda values: values > 9))
+        lnkd_list.extend([1, 2])
+        self.assertEqual([5, 6, 7, 8, 9, 1, 2], list(lnkd_list))
+        self.assertEqual(10, len(lnkd_list._next))
+
+    def test_text(self):
+        """ Test writing and reading the list as text. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(numpy.arange(12))
+        fp = StringIO()
+        lnkd_list.write_to(fp, sep="\n", chunk_size=5)
+        fp.seek(0)
+        copy = NumericLinkedList.read_from(fp, parse=int, dtype=int)
+        self.assertEqual(list(range(12)), list(copy))
+        self.assertEqual("NumericLinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, "
+                "...])", repr(copy))
+        self.assertEqual("0->1->2", str(NumericLinkedList.from_iterable(
+                range(3), dtype=int)))
+
+    def test_reverse(self):
+        """ Test reversing the list. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(numpy.arange(10))
+        node = lnkd_list.find(2)
+        expected = list(range(9, -1, -1))
+        self.assertEqual(expected, list(lnkd_list.reverse_iterative()))
+        self.assertEqual(expected, list(lnkd_list.reverse_recursive()))
+        lnkd_list.reverse()
+        self.assertEqual(expected, list(lnkd_list))
+        self.assertEqual(1, node.next.data)
+        self.assertEqual(0, lnkd_list.last_node.data)
+        self.assertEqual(expected, lnkd_list.to_numpy().tolist())
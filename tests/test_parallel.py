@@ -0,0 +1,77 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from concurrent.futures import ThreadPoolExecutor
+from operator import add
+from unittest import TestCase
+
+from amzlist import LinkedList
+from amzlist.parallel import parallel_map
+
+# The functions are defined here so they can be pickled.
+def square(value):
+    return value * value
+
+def is_even(value):
+    return value % 2 == 0
+
+def fail(value):
+    raise KeyError(value)
+
+class ParallelTest(TestCase):
+    """ Test the process pool operations """
+
+    def setUp(self):
+        self.linked_list = LinkedList.from_iterable(range(100))
+
+    def test_map(self):
+        """ Test mapping in chunks keeps the order. """
+        lnkd_list = self.linked_list
+        new_list = lnkd_list.parallel_map(square, workers=2, chunk_size=7,
+                threshold=0)
+        self.assertEqual([v * v for v in range(100)], list(new_list))
+        self.assertEqual(100, len(new_list))
+        self.assertEqual(list(range(100)), list(lnkd_list))
+
+    def test_filter(self):
+        """ Test filtering in chunks keeps the order. """
+        new_list = self.linked_list.parallel_filter(is_even, workers=2,
+                chunk_size=9, threshold=0)
+        self.assertEqual(list(range(0, 100, 2)), list(new_list))
+        self.assertEqual(98, new_list.last_node.data)
+
+    def test_reduce(self):
+        """ Test reducing the chunks and then their results. """
+        lnkd_list = self.linked_list
+        self.assertEqual(4950, lnkd_list.parallel_reduce(add, workers=2,
+                chunk_size=8, threshold=0))
+        self.assertEqual(4960, lnkd_list.parallel_reduce(add, 10, workers=2,
+                threshold=0))
+        self.assertEqual(5, LinkedList().parallel_reduce(add, 5,
+                threshold=0))
+        self.assertRaises(TypeError, LinkedList().parallel_reduce, add)
+
+    def test_serial(self):
+        """ Test short lists are processed in this process. """
+        lnkd_list = LinkedList.from_iterable(["a", "b"], doubly=True)
+        new_list = lnkd_list.parallel_map(lambda v: v.upper())
+        self.assertEqual("A->B", str(new_list))
+        self.assertTrue(new_list.last_node.prev is new_list.first_node)
+        self.assertEqual("a", lnkd_list.parallel_filter(lambda v: v < "b",
+                threshold=10, workers=4).data)
+
+    def test_executor(self):
+        """ Test an executor that is passed in is used, and kept open. """
+        with ThreadPoolExecutor(2) as executor:
+            new_list = parallel_map(self.linked_list, lambda v: -v,
+                    chunk_size=10, threshold=0, executor=executor)
+            self.assertEqual(-99, new_list.last_node.data)
+            self.assertEqual(-1, executor.submit(lambda: -1).result())
+
+    def test_error(self):
+        """ Test an error raised by a worker is raised. """
+        self.assertRaises(KeyError, self.linked_list.parallel_map, fail,
+                workers=2, threshold=0)
@@ -0,0 +1,132 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import pickle
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import LinkedList
+from amzlist import Node
+from amzlist.persistent import PersistentLinkedList
+from amzlist.persistent import PersistentNode
+
+class PersistentListTest(TestCase):
+    """ Test the persistent linked list """
+
+    def setUp(self):
+        self.linked_list = PersistentLinkedList.from_iterable([1, 2, 3])
+
+    def test_prepend(self):
+        """ Test prepending shares the Nodes of the old version. """
+        lnkd_list = self.linked_list
+        new_list = lnkd_list.prepend(Node(0)).push(-1)
+        self.assertEqual("-1->0->1->2->3", str(new_list))
+        self.assertEqual("1->2->3", str(lnkd_list))
+        self.assertTrue(new_list.next.next is lnkd_list.first_node)
+        self.assertTrue(new_list.last_node is lnkd_list.last_node)
+        self.assertEqual(5, len(new_list))
+        self.assertEqual(1, len(PersistentLinkedList().prepend("A")))
+
+    def test_pop(self):
+        """ Test popping returns the rest without copying. """
+        lnkd_list = self.linked_list
+        rest = lnkd_list.pop()
+        self.assertEqual(1, lnkd_list.data)
+        self.assertTrue(rest.first_node is lnkd_list.next)
+        self.assertEqual([2, 3], list(rest))
+        self.assertEqual(0, len(rest.pop().pop()))
+        self.assertTrue(rest.pop().pop().last_node is None)
+        self.assertRaises(AttributeError, PersistentLinkedList().pop)
+
+    @raises(AttributeError)
+    def test_immutable(self):
+        """ Test a PersistentNode can't be modified. """
+        self.linked_list.first_node.next = None
+
+    def test_append(self):
+        """ Test appending copies the old version. """
+        lnkd_list = self.linked_list
+        new_list = lnkd_list.append(4).extend([5, 6])
+        self.assertEqual("1->2->3->4->5->6", str(new_list))
+        self.assertEqual("1->2->3", str(lnkd_list))
+        self.assertEqual(6, new_list.last_node.data)
+        self.assertEqual(3, lnkd_list.last_node.data)
+
+    def test_insert_remove(self):
+        """ Test the Nodes after a change are shared. """
+        lnkd_list = PersistentLinkedList.from_iterable("ABCDE")
+        node_b = lnkd_list.find("B")
+        inserted = lnkd_list.insert("x", node_b)
+        self.assertEqual("A->B->x->C->D->E", str(inserted))
+        self.assertTrue(inserted.find("C") is lnkd_list.find("C"))
+        self.assertFalse(inserted.find("B") is node_b)
+
+        removed = lnkd_list.remove(lnkd_list.find("D"))
+        self.assertEqual("A->B->C->E", str(removed))
+        self.assertTrue(removed.last_node is lnkd_list.last_node)
+        self.assertEqual("A->B->C->D", str(lnkd_list.remove("E")))
+        self.assertEqual("D", lnkd_list.remove("E").last_node.data)
+        self.assertRaises(ValueError, lnkd_list.remove, "Z")
+        self.assertRaises(TypeError, lnkd_list.insert, "x", None)
+        self.assertEqual("A->B->C->D->E", str(lnkd_list))
+
+    def test_find(self):
+        """ Test finding a Node and the previous one. """
+        lnkd_list = self.linked_list
+        node, prev = lnkd_list.find(3, inc_prev=True)
+        self.assertTrue(isinstance(node, PersistentNode))
+        self.assertEqual(2, prev.data)
+        self.assertTrue(lnkd_list.find(node) is node)
+        self.assertTrue(2 in lnkd_list)
+        self.assertFalse(4 in lnkd_list)
+
+    def test_transient(self):
+        """ Test a batch of changes through a transient builder. """
+        lnkd_list = self.linked_list
+        builder = lnkd_list.transient()
+        builder.extend([4, 5])
+        builder.push(0)
+        self.assertEqual(0, builder.pop().data)
+        builder.remove(2)
+        builder.extendleft(["b", "a"])
+        new_list = builder.persistent()
+        self.assertEqual("a->b->1->3->4->5", str(new_list))
+        self.assertEqual(6, len(new_list))
+
+        # Changes after `persistent` don't affect the version returned.
+        builder.append(6)
+        builder.remove("a")
+        self.assertEqual("b->1->3->4->5->6", str(builder.persistent()))
+        self.assertEqual("a->b->1->3->4->5", str(new_list))
+        self.assertEqual("1->2->3", str(lnkd_list))
+
+    def test_reverse(self):
+        """ Test the reversed versions. """
+        lnkd_list = PersistentLinkedList.from_iterable(range(10))
+        expected = list(range(9, -1, -1))
+        self.assertEqual(expected, list(lnkd_list.reverse()))
+        self.assertEqual(expected, list(lnkd_list.reverse_iterative()))
+        self.assertEqual(expected, list(lnkd_list.reverse_recursive()))
+        self.assertEqual(0, lnkd_list.reverse_recursive().last_node.data)
+        self.assertEqual(list(range(10)), list(lnkd_list))
+
+    def test_linked_list(self):
+        """ Test converting to and from a LinkedList. """
+        lnkd_list = LinkedList.from_iterable([1, 2, 3], doubly=True)
+        snapshot = PersistentLinkedList.from_iterable(lnkd_list)
+        lnkd_list.append(4)
+        self.assertEqual([1, 2, 3], list(snapshot))
+        copy = snapshot.to_linked_list(strict=True)
+        self.assertTrue(isinstance(copy, LinkedList))
+        self.assertTrue(copy.strict)
+        self.assertEqual("1->2->3", str(copy))
+
+    def test_pickle(self):
+        """ Test pickling a long list. """
+        lnkd_list = PersistentLinkedList.from_iterable(range(100000))
+        copy = pickle.loads(pickle.dumps(lnkd_list))
+        self.assertEqual(list(range(100000)), list(copy))
+        self.assertEqual(99999, copy.last_node.data)
@@ -0,0 +1,100 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import LinkedList
+
+class PositionTest(TestCase):
+    """ Test positional access, with and without a skip list """
+
+    skiplist = True
+
+    def setUp(self):
+        self.lnkd_list = LinkedList(skiplist=self.skiplist)
+        self.values = list(range(0, 200, 2))
+        for val in self.values:
+            self.lnkd_list.append(val)
+
+    def test_getitem(self):
+        """ Test getting the data at each position. """
+        for i, val in enumerate(self.values):
+            self.assertEqual(val, self.lnkd_list[i])
+        self.assertEqual(198, self.lnkd_list[-1])
+        self.assertEqual(0, self.lnkd_list[-100])
+
+    def test_getitem_types(self):
+        """ Test positions of any integer type, but not bools. """
+        class Position(object):
+            def __index__(self):
+                return 3
+        self.assertEqual(6, self.lnkd_list[Position()])
+        self.lnkd_list[Position()] = 'A'
+        self.assertEqual('A', self.lnkd_list[3])
+        for i in [True, 1.0, '1', slice(1, 2)]:
+            self.assertRaises(TypeError, self.lnkd_list.__getitem__, i)
+            self.assertRaises(TypeError, self.lnkd_list.__setitem__, i, 'B')
+
+    @raises(IndexError)
+    def test_getitem_range(self):
+        """ Test a position past the tail. """
+        self.lnkd_list[100]
+
+    def test_setitem(self):
+        """ Test setting the data at a position. """
+        self.lnkd_list[10] = 'A'
+        self.values[10] = 'A'
+        self.assertEqual(self.values, list(self.lnkd_list))
+
+    def test_insert_delete(self):
+        """ Test inserting and deleting at positions. """
+        lnkd_list = self.lnkd_list
+        values = self.values
+        for i in [0, 5, 50, 101, -1, -300, 300]:
+            lnkd_list.insert_at(i, 'X')
+            values.insert(i, 'X')
+        self.assertEqual(values, list(lnkd_list))
+        self.assertEqual(values, [lnkd_list[i] for i in range(len(values))])
+
+        for i in [0, 7, -1, 60, -20]:
+            self.assertEqual(values.pop(i), lnkd_list.delete_at(i).data)
+        self.assertEqual(values, [lnkd_list[i] for i in range(len(values))])
+        self.assertEqual(len(values), len(lnkd_list))
+
+    def test_index(self):
+        """ Test finding the position of a value. """
+        for i, val in enumerate(self.values):
+            self.assertEqual(i, self.lnkd_list.index(val))
+        self.lnkd_list.prepend(50)
+        self.assertEqual(0, self.lnkd_list.index(50))
+        self.assertRaises(ValueError, self.lnkd_list.index, 1)
+
+    def test_rearranged(self):
+        """ Test positions after the list is rearranged. """
+        lnkd_list = self.lnkd_list
+        lnkd_list.reverse()
+        self.assertEqual(198, lnkd_list[0])
+        lnkd_list.extend(['A', 'B'])
+        lnkd_list.pop()
+        lnkd_list.remove(100)
+        self.assertEqual('B', lnkd_list[-1])
+        self.assertEqual(48, lnkd_list.index(98))
+
+
+class IndexedPositionTest(PositionTest):
+    """ Test positional access in a list with a skip list and an index """
+
+    def setUp(self):
+        self.lnkd_list = LinkedList(skiplist=True, index=True)
+        self.values = list(range(0, 200, 2))
+        self.lnkd_list.extend(self.values)
+
+
+class WalkPositionTest(PositionTest):
+    """ Test positional access in a list without a skip list """
+
+    skiplist = False
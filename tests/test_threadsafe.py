@@ -0,0 +1,164 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+from io import StringIO
+from threading import Thread
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import Node
+from amzlist.threadsafe import ConcurrentLinkedList
+from amzlist.threadsafe import LockedNode
+
+def run_threads(target, count):
+    """ Runs `target(i)` in `count` threads and waits for them. """
+    threads = [Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class ConcurrentListTest(TestCase):
+    """ Test the thread safe linked list """
+
+    def setUp(self):
+        self.linked_list = ConcurrentLinkedList()
+
+    def test_insert(self):
+        """ Test adding values and Nodes. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(10)
+        lnkd_list.prepend(Node("a"))
+        lnkd_list.push(20)
+        node_a = lnkd_list.find("a")
+        self.assertTrue(isinstance(node_a, LockedNode))
+        lnkd_list.insert("b", node_a)
+        lnkd_list.insert(35.5, lnkd_list.last_node)
+        self.assertEqual(5, len(lnkd_list))
+        self.assertEqual("20->a->b->10->35.5", str(lnkd_list))
+        self.assertEqual(35.5, lnkd_list.last_node.data)
+        self.assertTrue("b" in lnkd_list)
+        self.assertFalse("c" in lnkd_list)
+
+    @raises(TypeError)
+    def test_insert_none(self):
+        """ Test inserting after a parameter that is not a LockedNode. """
+        self.linked_list.insert(35.5, None)
+
+    def test_insert_removed(self):
+        """ Test inserting after a Node that has been removed. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend([1, 2])
+        node = lnkd_list.pop()
+        self.assertRaises(ValueError, lnkd_list.insert, 3, node)
+        self.assertEqual("2", str(lnkd_list))
+
+    def test_remove(self):
+        """ Test removal by value and by Node. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend([10, 20, 30])
+
+        lnkd_list.remove(lnkd_list.find(20))
+        self.assertEqual("10->30", str(lnkd_list))
+        lnkd_list.remove(Node(30))
+        self.assertEqual(10, lnkd_list.last_node.data)
+        node, prev = lnkd_list.find(10, inc_prev=True)
+        self.assertTrue(prev is None)
+        lnkd_list.remove(10)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertTrue(lnkd_list.last_node is None)
+        self.assertRaises(ValueError, lnkd_list.remove, 10)
+        self.assertRaises(AttributeError, lnkd_list.pop)
+
+    def test_compare_error(self):
+        """ Test the list is unlocked if comparing a value raises. """
+        class Unequal(object):
+            def __eq__(self, other):
+                raise KeyError(other)
+        lnkd_list = self.linked_list
+        lnkd_list.extend([Unequal(), 2])
+        self.assertRaises(KeyError, lnkd_list.find, 2)
+        self.assertRaises(KeyError, lnkd_list.remove, 2)
+        self.assertFalse(lnkd_list._head._lock.locked())
+        self.assertFalse(lnkd_list.first_node._lock.locked())
+        lnkd_list.push(1)
+        self.assertEqual(1, lnkd_list.pop().data)
+
+    def test_iter_removed(self):
+        """ Test an iterator carries on past a Node that is removed. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(5))
+        values = iter(lnkd_list)
+        self.assertEqual([0, 1], [next(values), next(values)])
+        lnkd_list.remove(1)
+        lnkd_list.remove(2)
+        self.assertEqual([3, 4], list(values))
+
+    def test_text(self):
+        """ Test writing and reading the list as text. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(["a", "b", "c"])
+        fp = StringIO()
+        lnkd_list.write_to(fp, sep="\n")
+        fp.seek(0)
+        copy = ConcurrentLinkedList.read_from(fp, strict=True)
+        self.assertEqual(["a", "b", "c"], list(copy))
+        self.assertEqual("ConcurrentLinkedList(['a', 'b', 'c'])", repr(copy))
+        self.assertEqual("a->b->c", str(copy))
+
+    def test_producers_consumers(self):
+        """ Test values are popped once when threads share the list. """
+        lnkd_list = self.linked_list
+        popped = [[] for _ in range(4)]
+
+        def produce(i):
+            for val in range(i * 1000, (i + 1) * 1000):
+                if val % 2:
+                    lnkd_list.append(val)
+                else:
+                    lnkd_list.push(val)
+
+        def consume(i):
+            while len(popped[i]) < 1000:
+                try:
+                    popped[i].append(lnkd_list.pop().data)
+                except AttributeError:
+                    pass
+
+        consumers = [Thread(target=consume, args=(i,)) for i in range(4)]
+        for thread in consumers:
+            thread.start()
+        run_threads(produce, 4)
+        for thread in consumers:
+            thread.join()
+
+        values = sorted(sum(popped, []))
+        self.assertEqual(list(range(4000)), values)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.last_node is None)
+
+    def test_insert_remove(self):
+        """ Test threads inserting and removing in the same list. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(["start", "end"])
+
+        def work(i):
+            after = lnkd_list.find("start")
+            for val in range(200):
+                lnkd_list.insert((i, val), after)
+                if val % 2:
+                    lnkd_list.remove((i, val - 1))
+            lnkd_list.append((i, "tail"))
+
+        run_threads(work, 4)
+        values = list(lnkd_list)
+        self.assertEqual(4 * 100 + 6, len(values))
+        self.assertEqual(len(values), len(lnkd_list))
+        self.assertEqual("end", values[-5])
+        expected = set((i, val) for i in range(4) for val in range(1, 200, 2))
+        self.assertEqual(expected, set(values[1:-5]))
+        self.assertEqual(values[-1], lnkd_list.last_node.data)
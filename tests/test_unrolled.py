@@ -0,0 +1,188 @@
+#
+# Copyright 2012 keyes.ie
+#
+# License: http://jkeyes.mit-license.org/
+#
+
+import pickle
+from io import BytesIO
+from io import StringIO
+from unittest import TestCase
+from nose.tools import raises
+
+from amzlist import LinkedList
+from amzlist import Node
+from amzlist.unrolled import UnrolledLinkedList
+from amzlist.unrolled import UnrolledNode
+
+class UnrolledListTest(TestCase):
+    """ Test the unrolled linked list """
+
+    def setUp(self):
+        self.linked_list = LinkedList(backend="unrolled", block_size=4)
+
+    def test_backend(self):
+        """ Test the backend is selected by LinkedList. """
+        self.assertTrue(isinstance(self.linked_list, UnrolledLinkedList))
+        self.assertEqual(64, LinkedList(backend="unrolled").block_size)
+
+    @raises(ValueError)
+    def test_block_size(self):
+        """ Test a block size that is too small. """
+        LinkedList(backend="unrolled", block_size=1)
+
+    def test_insert(self):
+        """ Test adding values and Nodes. """
+        lnkd_list = self.linked_list
+        lnkd_list.append(10)
+        lnkd_list.prepend(Node("a"))
+        lnkd_list.prepend(20)
+        node_a = lnkd_list.find("a")
+        self.assertTrue(isinstance(node_a, UnrolledNode))
+        lnkd_list.insert("b", node_a)
+        lnkd_list.insert(35.5, lnkd_list.last_node)
+        self.assertEqual(5, len(lnkd_list))
+        self.assertEqual("20->a->b->10->35.5", str(lnkd_list))
+        self.assertEqual(35.5, lnkd_list.last_node.data)
+        self.assertEqual("a->b", str(node_a))
+
+    @raises(TypeError)
+    def test_insert_none(self):
+        """ Test inserting after a parameter that is not an UnrolledNode. """
+        self.linked_list.insert(35.5, None)
+
+    def test_split(self):
+        """ Test cursors follow their values when a block is split. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(4))
+        nodes = lnkd_list.as_list()
+        lnkd_list.insert("x", nodes[0])
+        self.assertEqual(2, lnkd_list._head.next.values[0])
+        self.assertEqual([0, 1, 2, 3], [n.data for n in nodes])
+        self.assertEqual("x", nodes[0].next.data)
+        self.assertEqual(3, nodes[2].next.data)
+        self.assertEqual(lnkd_list.last_node, nodes[3])
+        self.assertEqual("0->x->1->2->3", str(lnkd_list))
+
+    def test_merge(self):
+        """ Test cursors follow their values when blocks are merged. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(8))
+        nodes = lnkd_list.as_list()
+        for val in [1, 2, 3, 4, 5]:
+            lnkd_list.remove(val)
+        self.assertTrue(lnkd_list._head.next is None)
+        self.assertEqual([0, 6, 7], [n.data for n in nodes[:1] + nodes[6:]])
+        self.assertEqual(6, nodes[0].next.data)
+        self.assertRaises(ValueError, getattr, nodes[1], "data")
+        nodes[7].data = "z"
+        self.assertEqual("0->6->z", str(lnkd_list))
+
+    def test_remove(self):
+        """ Test removal by value and by cursor. """
+        lnkd_list = self.linked_list
+        for val in [10, 20, 30]:
+            lnkd_list.append(val)
+
+        lnkd_list.remove(lnkd_list.find(20))
+        self.assertEqual("10->30", str(lnkd_list))
+        lnkd_list.remove(30)
+        self.assertEqual(10, lnkd_list.last_node.data)
+        lnkd_list.remove(10)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertTrue(lnkd_list.first_node is None)
+        self.assertTrue(lnkd_list.last_node is None)
+
+    @raises(ValueError)
+    def test_remove_unknown(self):
+        """ Test removing a value that is not in the list. """
+        self.linked_list.remove("A")
+
+    def test_pop(self):
+        """ Test pushing and popping across blocks. """
+        lnkd_list = self.linked_list
+        for val in range(10):
+            lnkd_list.push(val)
+        self.assertEqual(list(range(9, -1, -1)), list(lnkd_list))
+        popped = [lnkd_list.pop().data for _ in range(10)]
+        self.assertEqual(list(range(9, -1, -1)), popped)
+        self.assertEqual(0, len(lnkd_list))
+        self.assertRaises(AttributeError, lnkd_list.pop)
+
+    def test_find(self):
+        """ Test finding an element and the previous one. """
+        lnkd_list = self.linked_list
+        for val in ['A', 1, 2, 3, 'B', 'A']:
+            lnkd_list.append(val)
+
+        node, prev = lnkd_list.find('A', inc_prev=True)
+        self.assertEqual(lnkd_list.first_node, node)
+        self.assertTrue(prev is None)
+        node, prev = lnkd_list.find('B', inc_prev=True)
+        self.assertEqual(3, prev.data)
+        node, prev = lnkd_list.find(lnkd_list.last_node, inc_prev=True)
+        self.assertEqual('B', prev.data)
+        self.assertEqual(lnkd_list.last_node, node)
+
+    def test_cursors_released(self):
+        """ Test cursors that are only read don't pile up in the blocks. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(100))
+        kept = lnkd_list.find(2)
+        for i in range(1000):
+            lnkd_list.find(1)
+            lnkd_list.first_node.next
+        self.assertTrue(len(lnkd_list._head.cursors) <= 8)
+        lnkd_list.prepend("a")
+        self.assertEqual(2, kept.data)
+
+    def test_reverse(self):
+        """ Test reversing the list. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(10))
+        node = lnkd_list.find(2)
+
+        expected = list(range(9, -1, -1))
+        self.assertEqual(expected, list(lnkd_list.reverse_iterative()))
+        self.assertEqual(expected, list(lnkd_list.reverse_recursive()))
+        self.assertEqual(0, len(UnrolledLinkedList().reverse_recursive()))
+        lnkd_list.reverse()
+        self.assertEqual(expected, list(lnkd_list))
+        self.assertEqual(1, node.next.data)
+        self.assertEqual(0, lnkd_list.last_node.data)
+        self.assertEqual(list(range(10)), list(lnkd_list.reversed_copy()))
+
+    def test_extend(self):
+        """ Test adding values from iterables. """
+        lnkd_list = UnrolledLinkedList.from_iterable(['B', 'C'], block_size=2)
+        lnkd_list.extendleft(['A', 'Z'])
+        lnkd_list.insert_many(iter([1, 2, 3]), lnkd_list.find('B'))
+        self.assertEqual('Z->A->B->1->2->3->C', str(lnkd_list))
+        self.assertEqual(7, len(lnkd_list))
+
+    def test_text(self):
+        """ Test writing and reading the list as text. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(12))
+        fp = StringIO()
+        lnkd_list.write_to(fp, sep="\n", chunk_size=5)
+        fp.seek(0)
+        copy = UnrolledLinkedList.read_from(fp, parse=int)
+        self.assertEqual(list(range(12)), list(copy))
+        self.assertEqual("UnrolledLinkedList([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...])",
+                repr(copy))
+        self.assertEqual("0->1->2", str(UnrolledLinkedList.from_iterable(range(3))))
+
+    def test_pickle(self):
+        """ Test pickling and dumping the list. """
+        lnkd_list = self.linked_list
+        lnkd_list.extend(range(5000))
+        node = lnkd_list.find(10)
+        self.assertEqual(list(range(5000)),
+                list(pickle.loads(pickle.dumps(lnkd_list))))
+        fp = BytesIO()
+        lnkd_list.dump(fp)
+        fp.seek(0)
+        copy = UnrolledLinkedList.load(fp)
+        self.assertEqual(list(range(5000)), list(copy))
+        self.assertEqual(11, node.next.data)